@@ -20,12 +20,16 @@ from __future__ import annotations
 
 import logging
 import sqlite3
-import uuid
 from datetime import datetime
 from typing import Dict, List, Optional
 
 logger = logging.getLogger(__name__)
 
+# Tables a backfill can grow; their planner statistics are refreshed afterwards
+BACKFILLED_TABLES = (
+    "EventDeduplicationMap", "DeduplicatedEventSources", "DeduplicatedEventEntities",
+)
+
 
 class BackfillReport(dict):
     """Plain dict with a readable summary."""
@@ -40,45 +44,56 @@ class BackfillReport(dict):
         )
 
 
+# A uuid4 in canonical text form, generated per row inside SQLite so
+# INSERT ... SELECT ids look like every other map_id
+_SQL_UUID4 = """lower(
+    hex(randomblob(4)) || '-' || hex(randomblob(2)) || '-4' ||
+    substr(hex(randomblob(2)), 2) || '-' ||
+    substr('89ab', 1 + (abs(random()) % 4), 1) || substr(hex(randomblob(2)), 2) || '-' ||
+    hex(randomblob(6))
+)"""
+
+
+def _insert_select(conn: sqlite3.Connection, sql: str, params: tuple = ()) -> int:
+    """Run one INSERT ... SELECT and return how many rows it actually inserted.
+
+    The rows never leave SQLite. The statements are INSERT OR IGNORE, so a
+    row that would break a constraint is skipped rather than aborting the
+    statement; ``total_changes`` counts only the rows that went in.
+    """
+    before = conn.total_changes
+    conn.execute(sql, params)
+    return conn.total_changes - before
+
+
 def backfill_master_lineage(conn: sqlite3.Connection) -> int:
     """Insert the missing ``master`` row in EventDeduplicationMap.
 
     Every DeduplicatedEvents row names its ``master_enriched_event_id`` but the
     storage layer never recorded that as membership, so singleton events had no
-    lineage at all and merged events omitted their own master.
+    lineage at all and merged events omitted their own master. Masters with no
+    raw event behind them are skipped.
     """
-    rows = conn.execute(
-        """
-        SELECT d.deduplicated_event_id, d.master_enriched_event_id, e.raw_event_id
+    added = _insert_select(
+        conn,
+        f"""
+        INSERT OR IGNORE INTO EventDeduplicationMap (
+            map_id, raw_event_id, enriched_event_id, deduplicated_event_id,
+            contribution_type, similarity_score, data_source_weight
+        )
+        SELECT {_SQL_UUID4}, e.raw_event_id, d.master_enriched_event_id,
+               d.deduplicated_event_id, 'master', 1.0, 1.0
         FROM DeduplicatedEvents d
         JOIN EnrichedEvents e
           ON e.enriched_event_id = d.master_enriched_event_id
-        WHERE NOT EXISTS (
+        WHERE e.raw_event_id IS NOT NULL
+          AND NOT EXISTS (
             SELECT 1 FROM EventDeduplicationMap m
             WHERE m.deduplicated_event_id = d.deduplicated_event_id
               AND m.enriched_event_id = d.master_enriched_event_id
         )
-        """
-    ).fetchall()
-
-    added = 0
-    for dedup_id, enriched_id, raw_id in rows:
-        if raw_id is None:
-            logger.debug("No raw event for %s; skipping lineage row", enriched_id)
-            continue
-        try:
-            conn.execute(
-                """
-                INSERT OR IGNORE INTO EventDeduplicationMap (
-                    map_id, raw_event_id, enriched_event_id, deduplicated_event_id,
-                    contribution_type, similarity_score, data_source_weight
-                ) VALUES (?, ?, ?, ?, 'master', 1.0, 1.0)
-                """,
-                (str(uuid.uuid4()), raw_id, enriched_id, dedup_id),
-            )
-            added += conn.total_changes and 1 or 0
-        except sqlite3.IntegrityError as exc:
-            logger.debug("Lineage insert skipped for %s: %s", dedup_id, exc)
+        """,
+    )
     logger.info("Backfilled %d master lineage row(s)", added)
     return added
 
@@ -89,38 +104,30 @@ def backfill_sources(conn: sqlite3.Connection) -> int:
     One row per distinct source URL contributing to the deduplicated event,
     which is what ``total_data_sources`` is meant to count.
     """
-    rows = conn.execute(
-        """
-        SELECT DISTINCT m.deduplicated_event_id,
-               r.source_url, r.source_type, r.discovered_at,
-               substr(COALESCE(r.raw_description, r.raw_content, ''), 1, 400) AS snippet
-        FROM EventDeduplicationMap m
-        JOIN RawEvents r ON r.raw_event_id = m.raw_event_id
-        WHERE r.source_url IS NOT NULL AND r.source_url != ''
-          AND NOT EXISTS (
-              SELECT 1 FROM DeduplicatedEventSources s
-              WHERE s.deduplicated_event_id = m.deduplicated_event_id
-                AND s.source_url = r.source_url
-          )
+    added = _insert_select(
+        conn,
         """
-    ).fetchall()
-
-    added = 0
-    for dedup_id, url, source_type, discovered_at, snippet in rows:
-        try:
-            conn.execute(
-                """
-                INSERT INTO DeduplicatedEventSources (
-                    deduplicated_event_id, source_url, source_type,
-                    credibility_score, content_snippet, discovered_at
-                ) VALUES (?, ?, ?, ?, ?, ?)
-                """,
-                (dedup_id, url, source_type, None, snippet,
-                 discovered_at or datetime.now()),
-            )
-            added += 1
-        except sqlite3.IntegrityError as exc:
-            logger.debug("Source insert skipped for %s: %s", dedup_id, exc)
+        INSERT OR IGNORE INTO DeduplicatedEventSources (
+            deduplicated_event_id, source_url, source_type,
+            credibility_score, content_snippet, discovered_at
+        )
+        SELECT did, source_url, source_type, NULL, snippet, COALESCE(discovered_at, ?)
+        FROM (
+            SELECT DISTINCT m.deduplicated_event_id AS did,
+                   r.source_url, r.source_type, r.discovered_at,
+                   substr(COALESCE(r.raw_description, r.raw_content, ''), 1, 400) AS snippet
+            FROM EventDeduplicationMap m
+            JOIN RawEvents r ON r.raw_event_id = m.raw_event_id
+            WHERE r.source_url IS NOT NULL AND r.source_url != ''
+              AND NOT EXISTS (
+                  SELECT 1 FROM DeduplicatedEventSources s
+                  WHERE s.deduplicated_event_id = m.deduplicated_event_id
+                    AND s.source_url = r.source_url
+              )
+        )
+        """,
+        (datetime.now().isoformat(" "),),
+    )
     logger.info("Backfilled %d source row(s)", added)
     return added
 
@@ -150,12 +157,17 @@ def backfill_event_entities(conn: sqlite3.Connection) -> int:
             "Entity link tables absent; event-entity provenance not rebuilt.")
         return 0
 
-    rows = conn.execute(
+    added = _insert_select(
+        conn,
         """
-        SELECT m.deduplicated_event_id AS did, ee.entity_id AS eid,
-               ee.relationship_type AS role,
-               MAX(COALESCE(ee.confidence_score, 0.5)) AS conf,
-               COUNT(*) AS n
+        INSERT OR IGNORE INTO DeduplicatedEventEntities (
+            deduplicated_event_id, entity_id, relationship_type,
+            confidence_score, source_count
+        )
+        SELECT m.deduplicated_event_id, ee.entity_id,
+               COALESCE(NULLIF(ee.relationship_type, ''), 'affected'),
+               MAX(COALESCE(ee.confidence_score, 0.5)),
+               COUNT(*)
         FROM EventDeduplicationMap m
         JOIN EnrichedEventEntities ee
              ON ee.enriched_event_id = m.enriched_event_id
@@ -165,24 +177,8 @@ def backfill_event_entities(conn: sqlite3.Connection) -> int:
               AND d.entity_id = ee.entity_id
         )
         GROUP BY m.deduplicated_event_id, ee.entity_id, ee.relationship_type
-        """
-    ).fetchall()
-
-    added = 0
-    for did, eid, role, conf, count in rows:
-        try:
-            conn.execute(
-                """
-                INSERT OR IGNORE INTO DeduplicatedEventEntities (
-                    deduplicated_event_id, entity_id, relationship_type,
-                    confidence_score, source_count
-                ) VALUES (?, ?, ?, ?, ?)
-                """,
-                (did, eid, role or "affected", conf, count),
-            )
-            added += 1
-        except sqlite3.IntegrityError as exc:
-            logger.debug("Event-entity insert skipped for %s: %s", did, exc)
+        """,
+    )
     logger.info("Backfilled %d event-entity link(s)", added)
     return added
 
@@ -210,6 +206,25 @@ def refresh_source_counts(conn: sqlite3.Connection) -> int:
     return updated
 
 
+def refresh_statistics(conn: sqlite3.Connection) -> None:
+    """ANALYZE the backfilled tables, then let PRAGMA optimize catch the rest.
+
+    A backfill can take a table from empty to thousands of rows, leaving the
+    planner's sqlite_stat1 figures (or the lack of them) far from the truth.
+    Statistics only steer the planner, so a failure is logged, not raised.
+    """
+    tables = {r[0] for r in conn.execute(
+        "SELECT name FROM sqlite_master WHERE type='table'")}
+    try:
+        for table in BACKFILLED_TABLES:
+            if table in tables:
+                conn.execute(f"ANALYZE {table}")
+        conn.execute("PRAGMA optimize")
+        conn.commit()
+    except sqlite3.Error as exc:
+        logger.warning("Could not refresh planner statistics: %s", exc)
+
+
 def count_events_without_lineage(conn: sqlite3.Connection) -> int:
     return conn.execute(
         """
@@ -223,7 +238,14 @@ def count_events_without_lineage(conn: sqlite3.Connection) -> int:
 
 
 def run_backfill(conn: sqlite3.Connection, dry_run: bool = False) -> BackfillReport:
-    """Repair lineage, sources and counts. Idempotent."""
+    """Repair lineage, sources and counts. Idempotent.
+
+    Everything runs in one transaction, begun IMMEDIATE so the write lock is
+    held from the start, and is committed once at the end.
+    """
+    if not conn.in_transaction:
+        conn.execute("BEGIN IMMEDIATE")
+
     report = BackfillReport()
     report["events_without_lineage_before"] = count_events_without_lineage(conn)
     report["sources_before"] = conn.execute(
@@ -241,4 +263,5 @@ def run_backfill(conn: sqlite3.Connection, dry_run: bool = False) -> BackfillRep
         logger.info("Dry run - rolled back")
     else:
         conn.commit()
+        refresh_statistics(conn)
     return report
@@ -32,14 +32,37 @@ from typing import Dict, List, Optional, Sequence
 logger = logging.getLogger(__name__)
 
 
+# Prefix on BLAKE2b signatures; unprefixed stored values are legacy SHA-256
+SIGNATURE_PREFIX = "b2:"
+
+
+def _joined_members(enriched_event_ids: Sequence[str]) -> bytes:
+    return "|".join(sorted(str(i) for i in enriched_event_ids if i)).encode("utf-8")
+
+
 def signature_for_members(enriched_event_ids: Sequence[str]) -> str:
     """Stable signature for a set of member records.
 
     Order-independent, so re-storing the same members in a different order does
-    not look like a change.
+    not look like a change. The signature only has to detect change, not resist
+    attack, so it uses BLAKE2b rather than SHA-256.
+    """
+    digest = hashlib.blake2b(_joined_members(enriched_event_ids), digest_size=16)
+    return SIGNATURE_PREFIX + digest.hexdigest()
+
+
+def signature_matches(stored: Optional[str], enriched_event_ids: Sequence[str]) -> bool:
+    """Whether a stored signature still describes these members.
+
+    Signatures written before the BLAKE2b switch are checked against the old
+    SHA-256 form, so existing classifications stay current instead of all
+    turning stale at once.
     """
-    joined = "|".join(sorted(str(i) for i in enriched_event_ids if i))
-    return hashlib.sha256(joined.encode("utf-8")).hexdigest()[:32]
+    if not stored:
+        return False
+    if stored.startswith(SIGNATURE_PREFIX):
+        return stored == signature_for_members(enriched_event_ids)
+    return stored == hashlib.sha256(_joined_members(enriched_event_ids)).hexdigest()[:32]
 
 
 def member_signature(conn: sqlite3.Connection, deduplicated_event_id: str) -> str:
@@ -93,13 +116,12 @@ def stale_event_ids(
     stale: List[str] = []
     for row in rows:
         members = (row["members"] or "").split(",") if row["members"] else []
-        current = signature_for_members(members)
         stored = row["stored"]
         if stored is None or not str(stored).strip():
             if include_unclassified:
                 stale.append(row["id"])
             continue
-        if stored != current:
+        if not signature_matches(str(stored), members):
             stale.append(row["id"])
     return stale
 
@@ -121,11 +143,10 @@ def staleness_report(conn: sqlite3.Connection) -> Dict[str, int]:
     report = {"active": len(rows), "current": 0, "outdated": 0, "never_classified": 0}
     for row in rows:
         members = (row["members"] or "").split(",") if row["members"] else []
-        current = signature_for_members(members)
         stored = row["stored"]
         if stored is None or not str(stored).strip():
             report["never_classified"] += 1
-        elif stored != current:
+        elif not signature_matches(str(stored), members):
             report["outdated"] += 1
         else:
             report["current"] += 1
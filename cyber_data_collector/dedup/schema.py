@@ -17,6 +17,12 @@ Design notes:
   lost. Enriched ids are stable, so overrides survive.
 * ``EntityAliases`` is the fix for variant under-merging ("Optus Pty Limited"
   vs "Singtel Optus Pty Limited"): all variants resolve to one canonical key.
+* Indexes are declared next to their tables rather than after a load phase.
+  Nothing here bulk-loads a new table: the v3 tables fill row by row as
+  decisions are made, and an index added to an already populated table is
+  built by CREATE INDEX in one sorted pass anyway. The rebuild in
+  ``storage/deduplication_storage.py`` relies on the unique identity index
+  while it inserts, so dropping indexes around it is not an option either.
 """
 
 from __future__ import annotations
@@ -14,6 +14,7 @@ import re
 import warnings
 import pandas as pd
 import numpy as np
+from scipy import sparse
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 from dataclasses import dataclass
@@ -243,6 +244,70 @@ class RfEventFilter:
         
         return features
     
+    def _prepare_features_batch(self, events: pd.DataFrame) -> sparse.csr_matrix:
+        """
+        Prepare the feature matrix for many events at once.
+
+        Rows are built exactly as ``_prepare_features`` builds one, but the
+        source types are encoded through a lookup and the text is vectorized
+        in a single ``transform`` call. The matrix stays sparse: densifying a
+        large batch of TF-IDF rows costs far more memory than the forest
+        needs, and it accepts CSR input directly.
+
+        Args:
+            events: DataFrame of raw events
+
+        Returns:
+            Sparse feature matrix with one row per event
+        """
+        if not self.is_loaded:
+            raise RuntimeError("Models not loaded")
+
+        def column(name: str) -> List[Any]:
+            return events[name].tolist() if name in events else [""] * len(events)
+
+        combined_texts = [
+            self.preprocess_text(title) + ' ' +
+            self.preprocess_text(description) + ' ' +
+            self.preprocess_text(content) + ' ' +
+            self.preprocess_text(self.preprocess_url(url))
+            for title, description, content, url in zip(
+                column('raw_title'), column('raw_description'),
+                column('raw_content'), column('source_url'),
+            )
+        ]
+
+        # Unknown source types fall back to the first category, as in _prepare_features
+        codes = {label: code for code, label in enumerate(self.source_type_encoder.classes_)}
+        source_types_encoded = np.array(
+            [[codes.get(source_type, 0)] for source_type in column('source_type')]
+        )
+
+        text_features = self.text_vectorizer.transform(combined_texts)
+
+        return sparse.hstack([sparse.csr_matrix(source_types_encoded), text_features]).tocsr()
+
+    def predict_batch(self, events: pd.DataFrame) -> np.ndarray:
+        """
+        Score many events with one vectorizer call and one model call.
+
+        Use this for offline scoring (training-data checks, threshold
+        sweeps) instead of calling ``should_keep_event`` row by row. Filtering
+        statistics are not updated.
+
+        Args:
+            events: DataFrame with ``source_type``, ``raw_title``,
+                ``raw_description``, ``raw_content`` and ``source_url``
+                columns; missing columns and values count as empty
+
+        Returns:
+            ``predict_proba`` output, shape ``(len(events), n_classes)``;
+            column 1 is the probability that the event should be kept
+        """
+        if len(events) == 0:
+            return np.empty((0, len(self.model.classes_)))
+        return self.model.predict_proba(self._prepare_features_batch(events))
+
     def should_keep_event(self, source_type: str, title: str, description: str = "",
                          content: str = "", url: str = "", metadata: Dict = None) -> FilterResult:
         """
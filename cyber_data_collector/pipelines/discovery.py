@@ -26,6 +26,7 @@ if sys.platform == "win32" and sys.stdout.encoding != "utf-8":
     import codecs
     sys.stdout = codecs.getwriter("utf-8")(sys.stdout.buffer)
 
+from cyber_data_collector.storage import fulltext
 from cyber_data_collector.storage.cyber_event_data_v2 import CyberEventDataV2
 from cyber_data_collector.utils.entity_scraper import PlaywrightScraper, is_blocked_domain
 from cyber_data_collector.utils.llm_extractor import extract_event_details_with_llm
@@ -191,6 +192,8 @@ class EventDiscoveryEnrichmentPipeline:
     """Main pipeline for discovering and enriching cyber events"""
 
     def __init__(self, db_path: str = "instance/cyber_events.db"):
+        # Builds the index behind the Australian text filter on first run
+        fulltext.migrate(db_path)
         self.db = CyberEventDataV2(db_path)
         self.config_manager = ConfigManager()
         self.env_config = self.config_manager.load()
@@ -447,13 +450,10 @@ class EventDiscoveryEnrichmentPipeline:
             raw_events_to_mark = successful_raw_event_ids | filtered_raw_event_ids
 
             logger.info(f"[PIPELINE] Marking {len(raw_events_to_mark)} raw events as processed for {year}-{month:02d}")
-            for i, raw_event_id in enumerate(sorted(raw_events_to_mark)):
-                if i % 20 == 0:  # Log every 20th event
-                    logger.info(f"[PIPELINE] Marking raw event {i+1}/{len(raw_events_to_mark)} as processed for {year}-{month:02d}")
-                error_message = None
-                if raw_event_id in filtered_raw_event_ids:
-                    error_message = "Filtered out during processing"
-                self.db.mark_raw_event_processed(raw_event_id, error_message=error_message)
+            self.db.mark_raw_events_processed(
+                sorted(raw_events_to_mark),
+                dict.fromkeys(filtered_raw_event_ids, "Filtered out during processing"),
+            )
             logger.info(f"[PIPELINE] Completed marking processed raw events for {year}-{month:02d}")
 
             if failed_raw_event_ids:
@@ -935,6 +935,7 @@ class EventDiscoveryEnrichmentPipeline:
 
             # Insert new entity
             logger.debug(f"[ENTITY] Inserting new entity: {entity_name}")
+            now_iso = datetime.now().isoformat()
             cursor.execute("""
                 INSERT INTO EntitiesV2 (
                     entity_name, entity_type, is_australian, confidence_score,
@@ -947,8 +948,8 @@ class EventDiscoveryEnrichmentPipeline:
                 getattr(entity, 'confidence_score', 0.8),
                 getattr(entity, 'industry', None),
                 getattr(entity, 'location', None),
-                datetime.now().isoformat(),
-                datetime.now().isoformat()
+                now_iso,
+                now_iso
             ))
 
             entity_id = cursor.lastrowid
@@ -1157,24 +1158,20 @@ class EventDiscoveryEnrichmentPipeline:
     async def _store_entities_for_deduplicated_events(self, deduplicated_events, deduplicated_event_ids):
         """Store entities for deduplicated events"""
         try:
-            for i, event in enumerate(deduplicated_events):
-                if i < len(deduplicated_event_ids) and hasattr(event, 'affected_entities') and event.affected_entities:
-                    deduplicated_event_id = deduplicated_event_ids[i]
-
-                    with self.db._lock:
-                        cursor = self.db._conn.cursor()
+            # One transaction: a failure rolls back the entities inserted so far
+            # instead of leaving them pending on the shared connection
+            with self.db.transaction():
+                # Entities are resolved one by one; the links go in as one batch
+                links = []
+                for i, event in enumerate(deduplicated_events):
+                    if i < len(deduplicated_event_ids) and hasattr(event, 'affected_entities') and event.affected_entities:
+                        deduplicated_event_id = deduplicated_event_ids[i]
 
                         for entity in event.affected_entities:
                             # Get or create entity
                             entity_id = self._store_entity(entity)
                             if entity_id:
-                                # Link to deduplicated event
-                                cursor.execute("""
-                                    INSERT OR IGNORE INTO DeduplicatedEventEntities (
-                                        deduplicated_event_id, entity_id, relationship_type,
-                                        confidence_score, source_count
-                                    ) VALUES (?, ?, ?, ?, ?)
-                                """, (
+                                links.append((
                                     deduplicated_event_id,
                                     entity_id,
                                     'affected',
@@ -1182,7 +1179,13 @@ class EventDiscoveryEnrichmentPipeline:
                                     1  # source_count
                                 ))
 
-                        self.db._conn.commit()
+                if links:
+                    self.db._conn.executemany("""
+                        INSERT OR IGNORE INTO DeduplicatedEventEntities (
+                            deduplicated_event_id, entity_id, relationship_type,
+                            confidence_score, source_count
+                        ) VALUES (?, ?, ?, ?, ?)
+                    """, links)
 
         except Exception as e:
             logger.warning(f"[WARNING] Failed to store entities for deduplicated events: {e}")
@@ -1612,36 +1615,27 @@ class EventDiscoveryEnrichmentPipeline:
     def _update_raw_event_confidence(self, raw_event_id: str, filter_result):
         """Update raw event with confidence score and filtering metadata."""
         try:
-            # Update the raw event with confidence information
+            # Merge the filtering fields into the stored metadata in SQLite
+            # itself; malformed or missing metadata starts from an empty object
             with self.db._lock:
-                cursor = self.db._conn.cursor()
-
-                # Get existing metadata
-                cursor.execute("""
-                    SELECT source_metadata FROM RawEvents WHERE raw_event_id = ?
-                """, (raw_event_id,))
-                result = cursor.fetchone()
-
-                existing_metadata = {}
-                if result and result[0]:
-                    try:
-                        existing_metadata = json.loads(result[0])
-                    except (json.JSONDecodeError, TypeError):
-                        existing_metadata = {}
-
-                # Add filtering information
-                existing_metadata.update({
-                    'content_filter_confidence': filter_result.confidence_score,
-                    'content_filter_reasoning': filter_result.reasoning,
-                    'content_filter_stage': filter_result.stage,
-                    'content_filter_risk_level': filter_result.risk_level
-                })
-
-                # Update the metadata
-                cursor.execute("""
-                    UPDATE RawEvents SET source_metadata = ? WHERE raw_event_id = ?
-                """, (safe_json_dumps(existing_metadata, "existing metadata payload"), raw_event_id))
-
+                self.db._conn.execute("""
+                    UPDATE RawEvents
+                    SET source_metadata = json_set(
+                        CASE WHEN json_valid(source_metadata)
+                             THEN source_metadata ELSE '{}' END,
+                        '$.content_filter_confidence', ?,
+                        '$.content_filter_reasoning', ?,
+                        '$.content_filter_stage', ?,
+                        '$.content_filter_risk_level', ?
+                    )
+                    WHERE raw_event_id = ?
+                """, (
+                    filter_result.confidence_score,
+                    filter_result.reasoning,
+                    filter_result.stage,
+                    filter_result.risk_level,
+                    raw_event_id,
+                ))
                 self.db._conn.commit()
 
         except Exception as e:
@@ -2006,40 +2000,43 @@ class EventDiscoveryEnrichmentPipeline:
                     "final filter reasoning",
                 )
 
-                enriched_event_id = self.db.create_enriched_event(raw_event_id, enriched_event_data)
-
-                # Log successful final filtering
-                self.db.log_processing_attempt(
-                    raw_event_id, 'final_filtering', 'success',
-                    result_data={
-                        'final_confidence': final_filter_result.confidence_score,
-                        'reasoning': final_filter_result.reasoning,
-                        'risk_level': final_filter_result.risk_level
-                    },
-                    processing_time_ms=processing_time_ms
-                )
+                # One commit for the enriched event, its log entry and the processed flag
+                with self.db.transaction():
+                    enriched_event_id = self.db.create_enriched_event(raw_event_id, enriched_event_data)
+
+                    # Log successful final filtering
+                    self.db.log_processing_attempt(
+                        raw_event_id, 'final_filtering', 'success',
+                        result_data={
+                            'final_confidence': final_filter_result.confidence_score,
+                            'reasoning': final_filter_result.reasoning,
+                            'risk_level': final_filter_result.risk_level
+                        },
+                        processing_time_ms=processing_time_ms
+                    )
 
-                # Mark raw event as processed
-                self.db.mark_raw_event_processed(raw_event_id)
+                    # Mark raw event as processed
+                    self.db.mark_raw_event_processed(raw_event_id)
                 return True
             else:
                 # Event filtered out in final stage
                 reasons = final_filter_result.reasoning
 
-                self.db.log_processing_attempt(
-                    raw_event_id, 'final_filtering', 'filtered_out',
-                    result_data={
-                        'final_confidence': final_filter_result.confidence_score,
-                        'reasons': reasons,
-                        'risk_level': final_filter_result.risk_level,
-                        'llm_australian': enriched_data.is_australian_event,
-                        'llm_specific': enriched_data.is_specific_event
-                    },
-                    processing_time_ms=processing_time_ms
-                )
+                with self.db.transaction():
+                    self.db.log_processing_attempt(
+                        raw_event_id, 'final_filtering', 'filtered_out',
+                        result_data={
+                            'final_confidence': final_filter_result.confidence_score,
+                            'reasons': reasons,
+                            'risk_level': final_filter_result.risk_level,
+                            'llm_australian': enriched_data.is_australian_event,
+                            'llm_specific': enriched_data.is_specific_event
+                        },
+                        processing_time_ms=processing_time_ms
+                    )
 
-                # Mark as processed but don't create enriched event
-                self.db.mark_raw_event_processed(raw_event_id)
+                    # Mark as processed but don't create enriched event
+                    self.db.mark_raw_event_processed(raw_event_id)
                 return False
 
         except Exception as e:
@@ -2196,7 +2193,7 @@ class EventDiscoveryEnrichmentPipeline:
             print(f"[LLM] Events ready for analysis: {queue_stats.get('needs_analysis', 0)}")
 
         except Exception as e:
-            print(f"[WARNING] Could not retrieve database statistics: {e}")
+            logger.warning("Could not retrieve database statistics: %s", e)
 
         print("="*60)
 
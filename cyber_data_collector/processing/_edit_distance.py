@@ -0,0 +1,103 @@
+"""Fallback backends for the Indel (LCS) string similarity used in deduplication.
+
+RapidFuzz is the preferred backend for ``deduplication_v2._sequence_ratio``.
+When it is not installed but Numba is, the single-row dynamic programme below
+is JIT-compiled instead; without either, the bit-parallel LCS in pure Python
+is used.
+"""
+
+from __future__ import annotations
+
+import functools
+
+import numpy as np
+
+try:  # pragma: no cover - optional dependency
+    import numba
+except ImportError:  # pragma: no cover
+    numba = None
+
+
+def _lcs_length_py(a: np.ndarray, b: np.ndarray) -> int:
+    """Length of the longest common subsequence of two code-point arrays.
+
+    Wagner-Fischer style DP kept to one row of ``len(b) + 1`` cells: ``diag``
+    carries the previous row's value at ``j`` before it is overwritten.
+    """
+    row = np.zeros(len(b) + 1, np.int32)
+    for i in range(len(a)):
+        diag = 0
+        ai = a[i]
+        for j in range(len(b)):
+            up = row[j + 1]
+            if ai == b[j]:
+                row[j + 1] = diag + 1
+            elif row[j] > up:
+                row[j + 1] = row[j]
+            diag = up
+    return int(row[len(b)])
+
+
+if numba is not None:  # pragma: no cover - exercised only with numba installed
+    lcs_length = numba.njit(cache=True)(_lcs_length_py)
+else:
+    lcs_length = None
+
+
+@functools.lru_cache(maxsize=65536)
+def encode(text: str) -> np.ndarray:
+    """Code points of ``text`` as a uint32 array, cached per distinct string.
+
+    UTF-32 rather than UTF-8 so one array element is one character, matching
+    the character-level ratio RapidFuzz and difflib compute.
+    """
+    return np.frombuffer(text.encode('utf-32-le'), dtype=np.uint32)
+
+
+def indel_similarity(a: str, b: str) -> float:
+    """``2 * LCS / (len(a) + len(b))`` via the compiled kernel.
+
+    Only valid when ``lcs_length`` is available.
+    """
+    total = len(a) + len(b)
+    if total == 0:
+        return 1.0
+    return 2.0 * lcs_length(encode(a), encode(b)) / total
+
+
+def lcs_length_bitparallel(a: str, b: str) -> int:
+    """Length of the longest common subsequence using bit-vector arithmetic.
+
+    The Allison-Dix/Hyyro formulation of the Myers bit-parallel scheme: the
+    longer string is packed into per-character match masks and every
+    character of the shorter one updates the whole DP column with a handful
+    of integer operations. Python integers are unbounded, so there is no
+    64-character word limit and no blocked variant is needed.
+    """
+    if len(a) < len(b):
+        a, b = b, a
+    if not b:
+        return 0
+    peq: dict = {}
+    for k, ch in enumerate(a):
+        peq[ch] = peq.get(ch, 0) | (1 << k)
+    mask = (1 << len(a)) - 1
+    v = mask
+    for ch in b:
+        u = v & peq.get(ch, 0)
+        v = ((v + u) | (v - u)) & mask
+    return len(a) - bin(v).count('1')
+
+
+def indel_similarity_bitparallel(a: str, b: str) -> float:
+    """``2 * LCS / (len(a) + len(b))`` without any compiled dependency."""
+    total = len(a) + len(b)
+    if total == 0:
+        return 1.0
+    return 2.0 * lcs_length_bitparallel(a, b) / total
+
+
+def warm_up() -> None:
+    """Trigger JIT compilation up front so the first real comparison is not slow."""
+    if lcs_length is not None:
+        indel_similarity('warm', 'up')
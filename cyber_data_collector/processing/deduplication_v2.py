@@ -48,13 +48,25 @@ This module provides a complete deduplication solution that:
 
 import logging
 import re
+import sys
 import unicodedata
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from datetime import date, datetime, timedelta
-from typing import Any, Dict, List, Optional, Set, Tuple
-import difflib
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Set, Tuple
+import functools
 import hashlib
 
+import numpy as np
+
+try:  # pragma: no cover - optional dependency
+    from rapidfuzz.distance import Indel as _Indel
+except ImportError:  # pragma: no cover
+    _Indel = None
+
+from . import _edit_distance
+
 # Legal entity suffixes commonly trailing organisation names. We strip these
 # during canonicalisation so "Latitude Financial Services Pty Ltd" matches
 # "Latitude Financial Services Limited" and "Latitude Financial Services Holdings".
@@ -97,7 +109,92 @@ _INNER_AND_RE = re.compile(r'^(.+?)\s+(?:and|&)\s+(.+)$', flags=re.IGNORECASE)
 
 from tqdm import tqdm
 
-@dataclass
+# Slotted dataclasses drop the per-instance __dict__, which matters when the
+# pairwise pass builds one SimilarityScore per compared pair. ``slots=`` only
+# exists from Python 3.10; older interpreters keep regular dataclasses.
+_SLOTS: Dict[str, bool] = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+
+def _sequence_ratio(a: str, b: str) -> float:
+    """Normalised similarity of two strings in [0, 1].
+
+    Uses RapidFuzz's compiled Indel similarity when it is installed - the same
+    2*M/T measure as ``difflib.SequenceMatcher.ratio``, but computed on the
+    true longest common subsequence in C++. Without it, a Numba-compiled LCS
+    kernel is used if available, and the bit-parallel pure-Python LCS
+    otherwise, so every backend yields the same score.
+    """
+    if _Indel is not None:
+        return _Indel.normalized_similarity(a, b)
+    if _edit_distance.lcs_length is not None:
+        return _edit_distance.indel_similarity(a, b)
+    return _edit_distance.indel_similarity_bitparallel(a, b)
+
+
+def _sequence_ratio_upper_bound(a: str, b: str) -> float:
+    """Cheap upper bound on ``_sequence_ratio(a, b)`` from lengths alone.
+
+    At most ``min(len)`` characters can match, so the ratio can never exceed
+    ``2 * min / (len_a + len_b)``. Callers use this to skip the O(m*n) match
+    when the result could not change their decision.
+    """
+    total = len(a) + len(b)
+    return 2 * min(len(a), len(b)) / total if total else 1.0
+
+
+# Generic incident words that are never the entity being compared.
+_ENTITY_STOPWORDS = frozenset({
+    "Data", "Breach", "Incident", "Security", "Attack", "Cyber",
+    "Cybersecurity", "Ransomware", "Malware", "Hack", "Hackers",
+    "Outage", "Leak", "Exposure", "Network",
+})
+_CAPITALISED_PHRASE_RE = re.compile(r'\b[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*\b')
+
+
+@functools.lru_cache(maxsize=65536)
+def _title_entities(title: str) -> frozenset:
+    """Candidate entity tokens for a title (capitalised phrases + words).
+
+    A pure function of the title, so it is memoised: the O(n^2) pair loop
+    then tokenises each distinct title once instead of once per comparison.
+    """
+    title_words = _CAPITALISED_PHRASE_RE.findall(title)
+    entities = set(title_words)
+    for phrase in title_words:
+        entities.update(token for token in phrase.split() if token not in _ENTITY_STOPWORDS)
+    return frozenset(entities)
+
+
+_PUNCTUATION_RE = re.compile(r'[^\w\s]')
+# The ASCII members of _PUNCTUATION_RE's class, deleted by str.translate in C.
+# Derived from the regex so "_" (a word character) is kept, as the regex does.
+_ASCII_PUNCTUATION_TABLE = str.maketrans(
+    '', '', ''.join(c for c in map(chr, range(128)) if _PUNCTUATION_RE.match(c))
+)
+
+
+@functools.lru_cache(maxsize=65536)
+def _normalized_text(text: str) -> str:
+    """Lowercased, whitespace-collapsed, punctuation-free form of ``text``.
+
+    Keyed on the string itself rather than stored on the event, so a title
+    edited during a merge can never be compared in its stale form.
+    """
+    # split()/join collapses the same Unicode whitespace that \s+ matches
+    normalized = ' '.join(text.lower().split())
+    if normalized.isascii():
+        return normalized.translate(_ASCII_PUNCTUATION_TABLE)
+    return _PUNCTUATION_RE.sub('', normalized)
+
+
+@functools.lru_cache(maxsize=65536)
+def _lowered_words(text: str) -> Tuple[str, frozenset]:
+    """``text`` lowercased and stripped, with its whitespace-separated word set."""
+    lowered = text.lower().strip()
+    return lowered, frozenset(lowered.split())
+
+
+@dataclass(**_SLOTS)
 class CyberEvent:
     """Simplified cyber event model for deduplication"""
     event_id: str
@@ -126,7 +223,7 @@ from ..utils.validation import llm_validate_records_affected, validate_records_a
 logger = logging.getLogger(__name__)
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, **_SLOTS)
 class ValidationError:
     """Represents a validation error with context"""
     error_type: str
@@ -134,7 +231,7 @@ class ValidationError:
     context: Dict[str, Any] = field(default_factory=dict)
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, **_SLOTS)
 class SimilarityScore:
     """Comprehensive similarity score between two events"""
     overall_score: float
@@ -146,7 +243,7 @@ class SimilarityScore:
     reasoning: str
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, **_SLOTS)
 class ArbiterDecision:
     """LLM arbiter decision for uncertain similarity cases"""
     is_similar: bool
@@ -155,7 +252,7 @@ class ArbiterDecision:
     original_score: float
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, **_SLOTS)
 class MergeGroup:
     """Represents a group of events merged into one"""
     master_event: CyberEvent
@@ -166,7 +263,7 @@ class MergeGroup:
     merge_timestamp: datetime = field(default_factory=datetime.now)
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, **_SLOTS)
 class DeduplicationStats:
     """Statistics about the deduplication process"""
     input_events: int
@@ -177,7 +274,7 @@ class DeduplicationStats:
     processing_time_seconds: float
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, **_SLOTS)
 class DeduplicationResult:
     """Immutable result of deduplication operation"""
     unique_events: List[CyberEvent]
@@ -208,7 +305,8 @@ class DeduplicationValidator:
         # Check for duplicate IDs
         event_ids = [e.event_id for e in events if e.event_id]
         if len(event_ids) != len(set(event_ids)):
-            duplicates = [id for id in event_ids if event_ids.count(id) > 1]
+            id_counts = Counter(event_ids)
+            duplicates = [id for id in event_ids if id_counts[id] > 1]
             errors.append(ValidationError(
                 error_type="DUPLICATE_EVENT_IDS",
                 message=f"Found duplicate event IDs: {duplicates}",
@@ -234,7 +332,7 @@ class DeduplicationValidator:
         # Check for exact title+date duplicates
         seen_combinations = set()
         for event in events:
-            key = (event.title.lower().strip(), event.event_date)
+            key = (_lowered_words(event.title)[0], event.event_date)
             if key in seen_combinations:
                 errors.append(ValidationError(
                     error_type="DUPLICATE_EVENT",
@@ -292,10 +390,11 @@ class DeduplicationValidator:
     def validate_data_integrity(self, events: List[CyberEvent]) -> List[ValidationError]:
         """Validate data integrity of events"""
         errors = []
+        today = datetime.now().date()
         
         for event in events:
             # Check for reasonable dates
-            if event.event_date and event.event_date > datetime.now().date():
+            if event.event_date and event.event_date > today:
                 errors.append(ValidationError(
                     error_type="FUTURE_DATE",
                     message=f"Event has future date: {event.event_date}",
@@ -323,7 +422,7 @@ class DeduplicationValidator:
         norm2 = re.sub(r'\s+', ' ', title2.lower().strip())
         
         # Check for very high similarity
-        similarity = difflib.SequenceMatcher(None, norm1, norm2).ratio()
+        similarity = _sequence_ratio(norm1, norm2)
         return similarity > 0.9
 
 
@@ -376,8 +475,8 @@ class SimilarityCalculator:
             return 0.0
         
         # Normalize titles
-        title1 = self._normalize_text(event1.title)
-        title2 = self._normalize_text(event2.title)
+        title1 = _normalized_text(event1.title)
+        title2 = _normalized_text(event2.title)
         
         # Exact match
         if title1 == title2:
@@ -387,21 +486,22 @@ class SimilarityCalculator:
         if self._are_titles_very_similar(title1, title2):
             return 0.95
         
-        # Sequence similarity
-        seq_sim = difflib.SequenceMatcher(None, title1, title2).ratio()
-        
-        # Check for substring matches
+        # Cheap signals first: substring matches and common keywords
+        best = 0.0
         if title1 in title2 or title2 in title1:
-            seq_sim = max(seq_sim, 0.8)
+            best = 0.8
         
-        # Check for common keywords
-        words1 = set(title1.split())
-        words2 = set(title2.split())
+        words1 = _lowered_words(title1)[1]
+        words2 = _lowered_words(title2)[1]
         if words1 and words2:
-            word_overlap = len(words1.intersection(words2)) / len(words1.union(words2))
-            seq_sim = max(seq_sim, word_overlap)
+            common = len(words1 & words2)
+            best = max(best, common / (len(words1) + len(words2) - common))
         
-        return seq_sim
+        # Sequence similarity, only when its length bound could still win
+        if _sequence_ratio_upper_bound(title1, title2) > best:
+            best = max(best, _sequence_ratio(title1, title2))
+        
+        return best
     
     def _are_titles_very_similar(self, title1: str, title2: str) -> bool:
         """Check if titles are very similar (likely duplicates)"""
@@ -425,26 +525,25 @@ class SimilarityCalculator:
         if norm1 == norm2:
             return True
         
+        # Titles whose lengths differ this much can never reach 0.9
+        if _sequence_ratio_upper_bound(norm1, norm2) <= 0.9:
+            return False
+        
         # Check for high similarity
-        similarity = difflib.SequenceMatcher(None, norm1, norm2).ratio()
+        similarity = _sequence_ratio(norm1, norm2)
         return similarity > 0.9
     
     def _entity_similarity(self, event1: CyberEvent, event2: CyberEvent) -> float:
         """Calculate entity similarity between events"""
-        entities1 = self._extract_entities(event1)
-        entities2 = self._extract_entities(event2)
-        
-        if not entities1 and not entities2:
-            return 0.0
+        set1 = self._entity_set(event1)
+        set2 = self._entity_set(event2)
         
-        if not entities1 or not entities2:
+        if not set1 or not set2:
             return 0.0
         
         # Calculate Jaccard similarity
-        set1 = set(entities1)
-        set2 = set(entities2)
-        intersection = len(set1.intersection(set2))
-        union = len(set1.union(set2))
+        intersection = len(set1 & set2)
+        union = len(set1) + len(set2) - intersection
         
         return intersection / union if union > 0 else 0.0
     
@@ -461,7 +560,7 @@ class SimilarityCalculator:
         norm2 = self._normalize_text(content2)
         
         # Use sequence similarity
-        return difflib.SequenceMatcher(None, norm1, norm2).ratio()
+        return _sequence_ratio(norm1, norm2)
     
     def _temporal_similarity(self, event1: CyberEvent, event2: CyberEvent) -> float:
         """Calculate temporal similarity based on event dates"""
@@ -492,8 +591,10 @@ class SimilarityCalculator:
         so external entity_extractor instances are not supported here.  The regex
         fallback is always used instead.
         """
-        entities = []
+        return list(self._entity_set(event))
 
+    def _entity_set(self, event: CyberEvent) -> frozenset:
+        """Entity tokens for *event*, shared across every pair it appears in."""
         if self.entity_extractor is not None:
             self.logger.warning(
                 "External entity_extractor is not supported in SimilarityCalculator; "
@@ -501,35 +602,9 @@ class SimilarityCalculator:
             )
 
         # Always use the regex fallback
-        if event.title:
-            # Extract potential company names (simple heuristic)
-            # Look for capitalized words that might be company names
-            title_words = re.findall(r'\b[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*\b', event.title)
-            entities.extend(title_words)
-
-            stopwords = {
-                "Data",
-                "Breach",
-                "Incident",
-                "Security",
-                "Attack",
-                "Cyber",
-                "Cybersecurity",
-                "Ransomware",
-                "Malware",
-                "Hack",
-                "Hackers",
-                "Outage",
-                "Leak",
-                "Exposure",
-                "Network",
-            }
-            for phrase in title_words:
-                for token in phrase.split():
-                    if token not in stopwords:
-                        entities.append(token)
-        
-        return list(set(entities))  # Remove duplicates
+        if not event.title:
+            return frozenset()
+        return _title_entities(event.title)
     
     def _get_content_text(self, event: CyberEvent) -> str:
         """Get content text from event (summary or description)"""
@@ -543,14 +618,7 @@ class SimilarityCalculator:
         """Normalize text for comparison"""
         if not text:
             return ""
-        
-        # Convert to lowercase and remove extra whitespace
-        normalized = re.sub(r'\s+', ' ', text.lower().strip())
-        
-        # Remove common punctuation that might vary
-        normalized = re.sub(r'[^\w\s]', '', normalized)
-        
-        return normalized
+        return _normalized_text(text)
     
     def _generate_reasoning(self, event1: CyberEvent, event2: CyberEvent, scores: Dict[str, float]) -> str:
         """Generate human-readable reasoning for similarity score"""
@@ -578,9 +646,14 @@ class SimilarityCalculator:
 class LLMArbiter:
     """LLM-based decision maker for uncertain similarity cases"""
     
-    def __init__(self, api_key: Optional[str] = None, model: str = "gpt-4o-mini"):
+    def __init__(self, api_key: Optional[str] = None, model: str = "gpt-4o-mini",
+                 batch_size: int = 10, max_concurrent_batches: int = 4):
         self.api_key = api_key
         self.model = model
+        # Uncertain pairs per LLM request, and requests in flight at once, for
+        # decide_similarity_batch.
+        self.batch_size = batch_size
+        self.max_concurrent_batches = max_concurrent_batches
         self.logger = logging.getLogger(f"{__name__}.LLMArbiter")
     
     def decide_similarity(self, event1: CyberEvent, event2: CyberEvent, algo_score: float) -> ArbiterDecision:
@@ -615,6 +688,59 @@ class LLMArbiter:
                 original_score=algo_score
             )
     
+    def decide_similarity_batch(
+        self, pairs: List[Tuple[CyberEvent, CyberEvent, float]]
+    ) -> List[ArbiterDecision]:
+        """Decide several pairs, sending uncertain ones to the LLM in batches.
+
+        Returns one decision per ``(event1, event2, algo_score)`` in input
+        order. Up to ``batch_size`` uncertain pairs share one request and up to
+        ``max_concurrent_batches`` requests run at once, so the arbiter costs
+        one round trip per batch instead of one per pair.
+        """
+        decisions: List[Optional[ArbiterDecision]] = [None] * len(pairs)
+        uncertain: List[int] = []
+        for index, (event1, event2, algo_score) in enumerate(pairs):
+            if self.api_key and self._should_use_arbiter(algo_score):
+                uncertain.append(index)
+            else:
+                decisions[index] = self.decide_similarity(event1, event2, algo_score)
+
+        if len(uncertain) == 1:
+            index = uncertain[0]
+            decisions[index] = self.decide_similarity(*pairs[index])
+        elif uncertain:
+            size = max(1, self.batch_size)
+            chunks = [uncertain[k:k + size] for k in range(0, len(uncertain), size)]
+            workers = max(1, min(len(chunks), self.max_concurrent_batches))
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                chunk_decisions = list(pool.map(
+                    lambda chunk: self._decide_chunk([pairs[k] for k in chunk]), chunks
+                ))
+            for chunk, results in zip(chunks, chunk_decisions):
+                for index, decision in zip(chunk, results):
+                    decisions[index] = decision
+
+        return decisions
+
+    def _decide_chunk(self, chunk: List[Tuple[CyberEvent, CyberEvent, float]]) -> List[ArbiterDecision]:
+        """One LLM request for a chunk of uncertain pairs."""
+        try:
+            prompt = self._format_batch_prompt(chunk)
+            response = self._call_llm(prompt, max_tokens=120 * len(chunk) + 50)
+            return self._parse_batch_response(response, [score for _, _, score in chunk])
+        except Exception as e:
+            self.logger.error(f"LLM arbiter batch failed: {e}, falling back to algorithmic scores")
+            return [
+                ArbiterDecision(
+                    is_similar=score > 0.5,
+                    confidence=0.5,
+                    reasoning=f"LLM failed ({e}), using algorithmic score",
+                    original_score=score
+                )
+                for _, _, score in chunk
+            ]
+
     def _should_use_arbiter(self, algo_score: float) -> bool:
         """Determine if LLM arbiter should be used"""
         # Use LLM when algorithmic score is uncertain (0.3-0.7 range)
@@ -653,7 +779,43 @@ Respond with JSON:
 }}
 """
     
-    def _call_llm(self, prompt: str) -> str:
+    def _format_batch_prompt(self, chunk: List[Tuple[CyberEvent, CyberEvent, float]]) -> str:
+        """Format one prompt covering several numbered event pairs"""
+        sections = []
+        for number, (event1, event2, algo_score) in enumerate(chunk, 1):
+            sections.append(f"""
+Pair {number}:
+Event A:
+- Title: {event1.title}
+- Date: {event1.event_date}
+- Summary: {event1.summary or 'No summary available'}
+- Type: {event1.event_type or 'Unknown'}
+Event B:
+- Title: {event2.title}
+- Date: {event2.event_date}
+- Summary: {event2.summary or 'No summary available'}
+- Type: {event2.event_type or 'Unknown'}
+Algorithmic similarity score: {algo_score:.2f}
+""")
+        return f"""
+You are analyzing pairs of cybersecurity events to determine, for each pair, whether
+the two events are duplicates or different incidents.
+{''.join(sections)}
+For each pair, are these the same cybersecurity incident? Consider:
+1. Are they about the same breach/attack?
+2. Do they involve the same organization?
+3. Are the dates consistent with the same incident?
+4. Are the details describing the same event?
+
+Respond with JSON containing one decision per pair, in pair order:
+{{
+    "decisions": [
+        {{"pair": 1, "is_similar": true/false, "confidence": 0.0-1.0, "reasoning": "Brief explanation"}}
+    ]
+}}
+"""
+
+    def _call_llm(self, prompt: str, max_tokens: int = 200) -> str:
         """Call OpenAI API to evaluate event similarity."""
         from openai import OpenAI
 
@@ -665,7 +827,7 @@ Respond with JSON:
                 {"role": "user", "content": prompt},
             ],
             temperature=0.1,
-            max_tokens=200,
+            max_tokens=max_tokens,
         )
         # Track token usage
         from ..utils.token_tracker import tracker
@@ -696,6 +858,105 @@ Respond with JSON:
                 original_score=original_score
             )
 
+    def _parse_batch_response(self, response: str, original_scores: List[float]) -> List[ArbiterDecision]:
+        """Parse a batched LLM response; raises ValueError unless every pair is answered"""
+        import json
+        data = json.loads(response)
+        items = data.get("decisions", []) if isinstance(data, dict) else data
+        by_pair = {}
+        for position, item in enumerate(items, 1):
+            if isinstance(item, dict):
+                by_pair[item.get("pair", position)] = item
+        missing = [n for n in range(1, len(original_scores) + 1) if n not in by_pair]
+        if missing:
+            raise ValueError(f"LLM response has no decision for pairs {missing}")
+        return [
+            ArbiterDecision(
+                is_similar=by_pair[n].get("is_similar", False),
+                confidence=by_pair[n].get("confidence", 0.5),
+                reasoning=by_pair[n].get("reasoning", "LLM decision"),
+                original_score=score
+            )
+            for n, score in enumerate(original_scores, 1)
+        ]
+
+
+# Blocking only pays for itself once the pairwise pass is non-trivial; below
+# this size every pair is compared even when a block_key_fn is configured.
+BLOCKING_MIN_EVENTS = 50
+
+# Below this batch size the grouping pass scores pairs serially; a thread pool
+# costs more to start than it saves on small inputs.
+PARALLEL_MIN_EVENTS = 100
+
+_TITLE_TOKEN_RE = re.compile(r'[a-z0-9]+')
+
+
+def title_token_block_keys(event: CyberEvent) -> List[Hashable]:
+    """Block keys from the first two alphanumeric tokens of the title.
+
+    Suitable as ``DeduplicationEngine(block_key_fn=...)``. The engine always
+    adds the event's canonical entity components as extra keys, so same-entity
+    pairs with unrelated headlines still meet in a shared block.
+    """
+    tokens = _TITLE_TOKEN_RE.findall((event.title or '').lower())
+    return [('title', token) for token in tokens[:2]]
+
+
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+
+
+def _lsh_bands(threshold: float, num_perm: int) -> Tuple[int, int]:
+    """Pick (bands, rows) with bands*rows <= num_perm whose S-curve knee,
+    (1/bands) ** (1/rows), is closest to *threshold*."""
+    best = (num_perm, 1)
+    best_error = float('inf')
+    for rows in range(1, num_perm + 1):
+        bands = num_perm // rows
+        error = abs((1.0 / bands) ** (1.0 / rows) - threshold)
+        if error < best_error:
+            best, best_error = (bands, rows), error
+    return best
+
+
+def minhash_lsh_block_keys(
+    threshold: float = 0.5,
+    num_perm: int = 128,
+    shingle_size: int = 4,
+    seed: int = 1,
+) -> Callable[[CyberEvent], List[Hashable]]:
+    """Build a MinHash-LSH ``block_key_fn`` for ``DeduplicationEngine``.
+
+    Each event's ``title + summary`` is shingled into character n-grams and
+    MinHashed with ``num_perm`` permutations; the signature is cut into LSH
+    bands and every band becomes a block key. Two events share a block with
+    high probability once the Jaccard similarity of their shingle sets
+    exceeds roughly *threshold*, so candidate generation is near-linear
+    instead of all-pairs. Exact scoring still runs on every candidate pair.
+    """
+    bands, rows = _lsh_bands(threshold, num_perm)
+    rng = np.random.RandomState(seed)
+    perm_a = rng.randint(1, 1 << 31, size=num_perm, dtype=np.int64).astype(np.uint64)
+    perm_b = rng.randint(0, 1 << 31, size=num_perm, dtype=np.int64).astype(np.uint64)
+
+    def block_keys(event: CyberEvent) -> List[Hashable]:
+        text = re.sub(r'\s+', ' ', f"{event.title or ''} {event.summary or ''}".lower()).strip()
+        if not text:
+            return []
+        shingles = {text[k:k + shingle_size] for k in range(max(1, len(text) - shingle_size + 1))}
+        hashes = np.fromiter(
+            (int.from_bytes(hashlib.blake2b(sh.encode('utf-8'), digest_size=4).digest(), 'little')
+             for sh in shingles),
+            dtype=np.uint64, count=len(shingles),
+        )
+        signature = ((perm_a[:, None] * hashes[None, :] + perm_b[:, None]) % _MERSENNE_PRIME).min(axis=1)
+        return [
+            ('lsh', band, signature[band * rows:(band + 1) * rows].tobytes())
+            for band in range(bands)
+        ]
+
+    return block_keys
+
 
 class DeduplicationEngine:
     """Main deduplication orchestrator with comprehensive validation"""
@@ -704,7 +965,9 @@ class DeduplicationEngine:
                  similarity_threshold: float = 0.75,
                  llm_arbiter: Optional[LLMArbiter] = None,
                  validators: Optional[List[DeduplicationValidator]] = None,
-                 entity_mappings: Optional[Dict[str, str]] = None):
+                 entity_mappings: Optional[Dict[str, str]] = None,
+                 block_key_fn: Optional[Callable[[CyberEvent], Iterable[Hashable]]] = None,
+                 n_workers: int = 1):
         self.similarity_threshold = similarity_threshold
         self.llm_arbiter = llm_arbiter
         self.validators = validators or [DeduplicationValidator()]
@@ -712,9 +975,32 @@ class DeduplicationEngine:
         self.similarity_calculator = SimilarityCalculator()  # Reuse calculator instance
         # Entity mappings: source_entity (lowercase) -> canonical_entity
         self.entity_mappings = {k.lower(): v for k, v in (entity_mappings or {}).items()}
+        # Optional blocking: when set, only events sharing at least one block
+        # key are compared. None keeps the exhaustive pairwise pass.
+        self.block_key_fn = block_key_fn
+        # Threads used to score an anchor's surviving candidates in batches of
+        # PARALLEL_MIN_EVENTS or more events. Opt-in: calculate_similarity
+        # holds the GIL, and uncertain pairs already go to the LLM arbiter
+        # through decide_similarity_batch's own pool, so the default is serial.
+        self.n_workers = n_workers
+        # Pair scores memoised for the duration of one deduplicate() call,
+        # keyed on the sorted event-id pair. None outside a run, because ids
+        # only identify event content within a single input batch.
+        self._similarity_cache: Optional[Dict[Tuple[str, str], SimilarityScore]] = None
+        if _Indel is None:
+            # Compile the fallback kernel now rather than inside the first pair.
+            _edit_distance.warm_up()
     
     def deduplicate(self, events: List[CyberEvent]) -> DeduplicationResult:
         """Perform comprehensive deduplication with validation"""
+        self._similarity_cache = {}
+        try:
+            return self._deduplicate(events)
+        finally:
+            self._similarity_cache = None
+
+    def _deduplicate(self, events: List[CyberEvent]) -> DeduplicationResult:
+        """Body of deduplicate(), run with the per-call similarity cache active."""
         start_time = datetime.now()
         
         # Validate inputs
@@ -787,103 +1073,201 @@ class DeduplicationEngine:
 
         self.logger.info(f"Grouping {total_events} events by similarity...")
 
-        for i, event1 in tqdm(enumerate(events), total=total_events,
-                              desc="Deduplicating events", unit="event", smoothing=0):
-            if i in processed:
-                continue
+        block_keys, blocks = self._build_blocks(events)
 
-            # Start a new group with this event
-            group = [event1]
-            processed.add(i)
+        executor = None
+        if self.n_workers > 1 and total_events >= PARALLEL_MIN_EVENTS:
+            executor = ThreadPoolExecutor(max_workers=self.n_workers)
 
-            # Find similar events
-            for j, event2 in enumerate(events[i+1:], i+1):
-                if j in processed:
-                    continue
+        # Day ordinals for every event, so each row's date gaps come from one
+        # vectorised subtraction instead of a date subtraction per pair.
+        has_date = np.array([e.event_date is not None for e in events], dtype=bool)
+        ordinals = np.array(
+            [e.event_date.toordinal() if e.event_date is not None else 0 for e in events],
+            dtype=np.int64,
+        )
 
-                # RULE 1: Same entity + same date → ALWAYS merge (regardless of title)
-                same_entity = self._same_entity(event1, event2)
-                same_date = event1.event_date and event2.event_date and event1.event_date == event2.event_date
+        # Events sharing a normalised title and date always merge (RULE 1 or the
+        # exact-duplicate check), so they are looked up in one bucket instead
+        # of being rediscovered pair by pair.
+        exact_buckets: Dict[Tuple[str, Optional[date]], List[int]] = {}
+        for index, event in enumerate(events):
+            exact_buckets.setdefault(self._exact_key(event), []).append(index)
 
-                if same_entity and same_date:
-                    group.append(event2)
-                    processed.add(j)
-                    self.logger.debug(f"RULE 1: Merged same entity+date: {event1.victim_organization_name} on {event1.event_date}")
+        try:
+            for i, event1 in tqdm(enumerate(events), total=total_events,
+                                  desc="Deduplicating events", unit="event", smoothing=0):
+                if i in processed:
                     continue
+                processed.add(i)
+                exact = [j for j in exact_buckets[self._exact_key(event1)]
+                         if j > i and j not in processed]
+                members = self._collect_group_members(
+                    i, events, processed, block_keys, blocks, has_date, ordinals, executor,
+                    exact,
+                )
+                processed.update(members)
+                groups.append([event1] + [events[j] for j in members])
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+        self.logger.info(f"Grouping complete: {total_events} events -> {len(groups)} groups")
+        return groups
+
+    def _collect_group_members(
+        self,
+        i: int,
+        events: List[CyberEvent],
+        processed: Set[int],
+        block_keys: List[Set[Hashable]],
+        blocks: Optional[Dict[Hashable, List[int]]],
+        has_date: np.ndarray,
+        ordinals: np.ndarray,
+        executor: Optional[ThreadPoolExecutor],
+        exact: List[int],
+    ) -> List[int]:
+        """Indices of unprocessed events after ``i`` that join its group, ascending.
+
+        Each candidate's decision depends only on the pair (i, j), so the rule
+        checks run inline and the pairs that need a full similarity score are
+        collected and scored together, on ``executor`` when one is given.
+        ``exact`` holds the candidates already known to share i's title and
+        date; they join without further checks.
+        """
+        event1 = events[i]
+        total_events = len(events)
+        members: List[int] = list(exact)
+        skip = set(exact)
+        to_score: List[int] = []
+
+        if blocks is None:
+            candidates = np.arange(i + 1, total_events)
+        else:
+            candidates = np.array(sorted({
+                j for key in block_keys[i] for j in blocks[key] if j > i
+            }), dtype=np.int64)
+
+        # Gaps for the candidates only, so blocking keeps each anchor's cost
+        # proportional to its block. day_gaps[position] is only meaningful
+        # where both events are dated
+        day_gaps = np.abs(ordinals[candidates] - ordinals[i]).tolist() if has_date[i] else None
+
+        # Find similar events
+        for position, j in enumerate(candidates.tolist()):
+            if j in processed or j in skip:
+                continue
+            event2 = events[j]
 
-                # Check for exact duplicates (same title and date - case insensitive)
-                if (event1.title.lower().strip() == event2.title.lower().strip() and
-                    event1.event_date == event2.event_date):
-                    group.append(event2)
-                    processed.add(j)
+            # RULE 1: Same entity + same date → ALWAYS merge (regardless of title)
+            same_entity = self._same_entity(event1, event2)
+            same_date = event1.event_date and event2.event_date and event1.event_date == event2.event_date
+
+            if same_entity and same_date:
+                members.append(j)
+                self.logger.debug(f"RULE 1: Merged same entity+date: {event1.victim_organization_name} on {event1.event_date}")
+                continue
+
+            # Check for exact duplicates (same title and date - case insensitive)
+            if (_lowered_words(event1.title)[0] == _lowered_words(event2.title)[0] and
+                event1.event_date == event2.event_date):
+                members.append(j)
+                continue
+
+            # RULE 2: Same entity + similar descriptions → MERGE (even if dates differ)
+            if same_entity:
+                # For same entity, be MORE aggressive about merging (lower threshold)
+                # Check title/description similarity
+                title_sim = self._quick_title_similarity(event1.title, event2.title)
+
+                # If titles have any reasonable overlap for same entity, likely same incident
+                # Use very low threshold (0.15) since we're already confident it's the same organization
+                if title_sim >= 0.15:  # Very low threshold for same entity
+                    members.append(j)
+                    self.logger.debug(f"RULE 2: Merged same entity+similar desc: {event1.victim_organization_name or event2.victim_organization_name or 'via title'} (title_sim={title_sim:.2f})")
                     continue
 
-                # RULE 2: Same entity + similar descriptions → MERGE (even if dates differ)
-                if same_entity:
-                    # For same entity, be MORE aggressive about merging (lower threshold)
-                    # Check title/description similarity
-                    title_sim = self._quick_title_similarity(event1.title, event2.title)
-
-                    # If titles have any reasonable overlap for same entity, likely same incident
-                    # Use very low threshold (0.15) since we're already confident it's the same organization
-                    if title_sim >= 0.15:  # Very low threshold for same entity
-                        group.append(event2)
-                        processed.add(j)
-                        self.logger.debug(f"RULE 2: Merged same entity+similar desc: {event1.victim_organization_name or event2.victim_organization_name or 'via title'} (title_sim={title_sim:.2f})")
+                # RULE 2b: Same entity + low title similarity but high description similarity → MERGE
+                # This catches cases like Ticketmaster where titles are completely different
+                # but the scraped text clearly describes the same incident
+                if event1.description and event2.description:
+                    desc_sim = self._quick_title_similarity(event1.description, event2.description)
+                    # Use threshold of 0.20 for description similarity when same entity
+                    if desc_sim >= 0.20:
+                        members.append(j)
+                        self.logger.debug(f"RULE 2b: Merged same entity+similar content: {event1.victim_organization_name or event2.victim_organization_name or 'via title'} (title_sim={title_sim:.2f}, desc_sim={desc_sim:.2f})")
                         continue
 
-                    # RULE 2b: Same entity + low title similarity but high description similarity → MERGE
-                    # This catches cases like Ticketmaster where titles are completely different
-                    # but the scraped text clearly describes the same incident
-                    if event1.description and event2.description:
-                        desc_sim = self._quick_title_similarity(event1.description, event2.description)
-                        # Use threshold of 0.20 for description similarity when same entity
-                        if desc_sim >= 0.20:
-                            group.append(event2)
-                            processed.add(j)
-                            self.logger.debug(f"RULE 2b: Merged same entity+similar content: {event1.victim_organization_name or event2.victim_organization_name or 'via title'} (title_sim={title_sim:.2f}, desc_sim={desc_sim:.2f})")
+            # RULE 3: Description-based similarity fallback (even when entity names missing/don't match)
+            # This catches cases where entity extraction failed but the actual scraped content
+            # clearly describes the same incident (e.g., one event has NULL organization name)
+            if event1.description and event2.description:
+                desc_sim = self._quick_title_similarity(event1.description, event2.description)
+                # Use HIGHER threshold (0.35) when entities don't match to avoid false positives
+                # Also check that dates are reasonably close (within 90 days)
+                if desc_sim >= 0.35:
+                    if day_gaps is not None and has_date[j]:
+                        date_diff = day_gaps[position]
+                        if date_diff <= 90:  # Events within 3 months
+                            members.append(j)
+                            entity_info = event1.victim_organization_name or event2.victim_organization_name or "unknown entity"
+                            self.logger.debug(f"RULE 3: Merged via high description similarity: {entity_info} (desc_sim={desc_sim:.2f}, date_diff={date_diff}d)")
                             continue
 
-                # RULE 3: Description-based similarity fallback (even when entity names missing/don't match)
-                # This catches cases where entity extraction failed but the actual scraped content
-                # clearly describes the same incident (e.g., one event has NULL organization name)
-                if event1.description and event2.description:
-                    desc_sim = self._quick_title_similarity(event1.description, event2.description)
-                    # Use HIGHER threshold (0.35) when entities don't match to avoid false positives
-                    # Also check that dates are reasonably close (within 90 days)
-                    if desc_sim >= 0.35:
-                        if event1.event_date and event2.event_date:
-                            date_diff = abs((event1.event_date - event2.event_date).days)
-                            if date_diff <= 90:  # Events within 3 months
-                                group.append(event2)
-                                processed.add(j)
-                                entity_info = event1.victim_organization_name or event2.victim_organization_name or "unknown entity"
-                                self.logger.debug(f"RULE 3: Merged via high description similarity: {entity_info} (desc_sim={desc_sim:.2f}, date_diff={date_diff}d)")
-                                continue
-
-                # Quick pre-filter: skip events with very different dates (>365 days apart)
-                # BUT only if they're different entities
-                if not same_entity and event1.event_date and event2.event_date:
-                    date_diff = abs((event1.event_date - event2.event_date).days)
-                    if date_diff > 365:
-                        continue  # Skip detailed comparison
-
-                # Quick pre-filter: check title similarity first (cheap operation)
-                title_sim = self._quick_title_similarity(event1.title, event2.title)
-                if title_sim < 0.3:  # Very different titles
+            # Quick pre-filter: skip events with very different dates (>365 days apart)
+            # BUT only if they're different entities
+            if not same_entity and day_gaps is not None and has_date[j]:
+                date_diff = day_gaps[position]
+                if date_diff > 365:
                     continue  # Skip detailed comparison
 
-                # Calculate full similarity for potentially similar events
-                similarity = self._calculate_event_similarity(event1, event2)
+            # Quick pre-filter: check title similarity first (cheap operation)
+            title_sim = self._quick_title_similarity(event1.title, event2.title)
+            if title_sim < 0.3:  # Very different titles
+                continue  # Skip detailed comparison
 
-                if similarity.overall_score >= self.similarity_threshold:
-                    group.append(event2)
-                    processed.add(j)
+            # Full similarity for potentially similar events, scored below
+            to_score.append(j)
 
-            groups.append(group)
+        if to_score:
+            scores = self._score_pairs(event1, [events[j] for j in to_score], executor)
+            members.extend(
+                j for j, similarity in zip(to_score, scores)
+                if similarity.overall_score >= self.similarity_threshold
+            )
 
-        self.logger.info(f"Grouping complete: {total_events} events -> {len(groups)} groups")
-        return groups
+        members.sort()
+        return members
+
+    @staticmethod
+    def _exact_key(event: CyberEvent) -> Tuple[str, Optional[date]]:
+        """Key under which two events are exact duplicates of each other."""
+        return _lowered_words(event.title)[0], event.event_date
+
+    def _build_blocks(
+        self, events: List[CyberEvent]
+    ) -> Tuple[List[Set[Hashable]], Optional[Dict[Hashable, List[int]]]]:
+        """Index events by block key for the grouping pass.
+
+        Returns ``(block_keys, blocks)`` where ``block_keys[i]`` is the key set
+        of ``events[i]`` and ``blocks`` maps each key to the ascending indices
+        sharing it. ``blocks`` is None when blocking is disabled or the batch
+        is below ``BLOCKING_MIN_EVENTS``, meaning every pair is compared.
+        """
+        if self.block_key_fn is None or len(events) < BLOCKING_MIN_EVENTS:
+            return [], None
+
+        block_keys: List[Set[Hashable]] = []
+        blocks: Dict[Hashable, List[int]] = {}
+        for index, event in enumerate(events):
+            keys = set(self.block_key_fn(event))
+            keys.update(('entity', c) for c in self._entity_components(event.victim_organization_name))
+            block_keys.append(keys)
+            for key in keys:
+                blocks.setdefault(key, []).append(index)
+
+        self.logger.info(f"Blocking: {len(events)} events in {len(blocks)} blocks")
+        return block_keys, blocks
 
     def _normalize_entity_name(self, entity_name: Optional[str]) -> Optional[str]:
         """
@@ -1158,59 +1542,121 @@ class DeduplicationEngine:
         if not title1 or not title2:
             return 0.0
 
-        # Normalize
-        t1 = title1.lower().strip()
-        t2 = title2.lower().strip()
+        # Normalize (cached per distinct string; descriptions repeat across pairs)
+        t1, words1 = _lowered_words(title1)
+        t2, words2 = _lowered_words(title2)
 
         # Exact match
         if t1 == t2:
             return 1.0
 
         # Quick word overlap check (faster than sequence matching)
-        words1 = set(t1.split())
-        words2 = set(t2.split())
-
         if not words1 or not words2:
             return 0.0
 
         # Jaccard similarity
         intersection = len(words1 & words2)
-        union = len(words1 | words2)
+        union = len(words1) + len(words2) - intersection
 
         return intersection / union if union > 0 else 0.0
 
     def _calculate_event_similarity(self, event1: CyberEvent, event2: CyberEvent) -> SimilarityScore:
-        """Calculate similarity between two events"""
+        """Calculate similarity between two events, memoised within a run.
+
+        The grouping pass and _merge_group score many of the same pairs; the
+        cache also stops an uncertain pair being sent to the LLM arbiter twice.
+        """
+        cache = self._similarity_cache
+        if cache is None or not event1.event_id or not event2.event_id:
+            return self._score_event_pair(event1, event2)
+
+        key = tuple(sorted((event1.event_id, event2.event_id)))
+        similarity = cache.get(key)
+        if similarity is None:
+            similarity = self._score_event_pair(event1, event2)
+            cache[key] = similarity
+        return similarity
+
+    def _score_pairs(
+        self,
+        event1: CyberEvent,
+        others: List[CyberEvent],
+        executor: Optional[ThreadPoolExecutor] = None,
+    ) -> List[SimilarityScore]:
+        """Score ``event1`` against each of ``others``, in order.
+
+        Same result as calling _calculate_event_similarity per pair, but the
+        algorithmic scores are computed first (on ``executor`` when given) and
+        every uncertain pair then goes to the LLM arbiter in one batched call.
+        """
+        cache = self._similarity_cache
+        keys: List[Optional[Tuple[str, ...]]] = []
+        results: List[Optional[SimilarityScore]] = []
+        pending: List[int] = []
+        for index, event2 in enumerate(others):
+            key = None
+            if cache is not None and event1.event_id and event2.event_id:
+                key = tuple(sorted((event1.event_id, event2.event_id)))
+            keys.append(key)
+            cached = cache.get(key) if key is not None else None
+            results.append(cached)
+            if cached is None:
+                pending.append(index)
+
+        calculate = self.similarity_calculator.calculate_similarity
+        if executor is not None and len(pending) > 1:
+            algorithmic = list(executor.map(lambda k: calculate(event1, others[k]), pending))
+        else:
+            algorithmic = [calculate(event1, others[k]) for k in pending]
+
+        uncertain = [
+            (k, similarity) for k, similarity in zip(pending, algorithmic)
+            if self.llm_arbiter and 0.3 <= similarity.overall_score <= 0.7
+        ]
+        decisions: Dict[int, ArbiterDecision] = {}
+        if uncertain:
+            batch = self.llm_arbiter.decide_similarity_batch(
+                [(event1, others[k], similarity.overall_score) for k, similarity in uncertain]
+            )
+            decisions = {k: decision for (k, _), decision in zip(uncertain, batch)}
+
+        for k, similarity in zip(pending, algorithmic):
+            if k in decisions:
+                similarity = self._apply_arbiter_decision(similarity, decisions[k])
+            results[k] = similarity
+            if keys[k] is not None:
+                cache[keys[k]] = similarity
+        return results
+
+    def _score_event_pair(self, event1: CyberEvent, event2: CyberEvent) -> SimilarityScore:
+        """Score one pair, deferring to the LLM arbiter for uncertain scores."""
         # Use shared similarity calculator instance
         similarity = self.similarity_calculator.calculate_similarity(event1, event2)
         
         # Use LLM arbiter if available and score is uncertain
         if self.llm_arbiter and 0.3 <= similarity.overall_score <= 0.7:
             arbiter_decision = self.llm_arbiter.decide_similarity(event1, event2, similarity.overall_score)
-            
-            # Adjust score based on arbiter decision
-            if arbiter_decision.is_similar:
-                similarity = SimilarityScore(
-                    overall_score=max(similarity.overall_score, 0.8),
-                    title_similarity=similarity.title_similarity,
-                    entity_similarity=similarity.entity_similarity,
-                    content_similarity=similarity.content_similarity,
-                    temporal_similarity=similarity.temporal_similarity,
-                    confidence=arbiter_decision.confidence,
-                    reasoning=f"LLM arbiter: {arbiter_decision.reasoning}"
-                )
-            else:
-                similarity = SimilarityScore(
-                    overall_score=min(similarity.overall_score, 0.3),
-                    title_similarity=similarity.title_similarity,
-                    entity_similarity=similarity.entity_similarity,
-                    content_similarity=similarity.content_similarity,
-                    temporal_similarity=similarity.temporal_similarity,
-                    confidence=arbiter_decision.confidence,
-                    reasoning=f"LLM arbiter: {arbiter_decision.reasoning}"
-                )
+            similarity = self._apply_arbiter_decision(similarity, arbiter_decision)
         
         return similarity
+
+    @staticmethod
+    def _apply_arbiter_decision(similarity: SimilarityScore,
+                                arbiter_decision: ArbiterDecision) -> SimilarityScore:
+        """Adjust an algorithmic score by the arbiter's verdict."""
+        if arbiter_decision.is_similar:
+            overall_score = max(similarity.overall_score, 0.8)
+        else:
+            overall_score = min(similarity.overall_score, 0.3)
+        return SimilarityScore(
+            overall_score=overall_score,
+            title_similarity=similarity.title_similarity,
+            entity_similarity=similarity.entity_similarity,
+            content_similarity=similarity.content_similarity,
+            temporal_similarity=similarity.temporal_similarity,
+            confidence=arbiter_decision.confidence,
+            reasoning=f"LLM arbiter: {arbiter_decision.reasoning}"
+        )
     
     def _merge_group(self, events: List[CyberEvent]) -> Tuple[CyberEvent, MergeGroup]:
         """Merge a group of similar events into one master event"""
@@ -1231,10 +1677,10 @@ class DeduplicationEngine:
         merged_event = self._merge_event_data(events)
         
         # Calculate similarity scores
-        similarity_scores = {}
-        for event in merged_events:
-            similarity = self._calculate_event_similarity(master_event, event)
-            similarity_scores[event.event_id] = similarity.overall_score
+        similarity_scores = {
+            event.event_id: similarity.overall_score
+            for event, similarity in zip(merged_events, self._score_pairs(master_event, merged_events))
+        }
         
         # Calculate average confidence
         avg_confidence = sum(similarity_scores.values()) / len(similarity_scores) if similarity_scores else 1.0
@@ -1253,6 +1699,7 @@ class DeduplicationEngine:
         """Select the best event to be the master"""
         # Score each event based on completeness and quality
         scored_events = []
+        today = datetime.now().date()
         
         for event in events:
             score = 0
@@ -1269,14 +1716,14 @@ class DeduplicationEngine:
             
             # Prefer more recent events
             if event.event_date:
-                days_ago = (datetime.now().date() - event.event_date).days
+                days_ago = (today - event.event_date).days
                 score += max(0, 1 - (days_ago / 365))  # Decay over time
             
             scored_events.append((score, event))
         
-        # Return highest scoring event
-        scored_events.sort(key=lambda x: x[0], reverse=True)
-        return scored_events[0][1]
+        # Return highest scoring event; max() keeps the first of any tie, as the
+        # stable descending sort it replaces did, without ordering the rest
+        return max(scored_events, key=lambda x: x[0])[1]
     
     def _merge_event_data(self, events: List[CyberEvent]) -> CyberEvent:
         """
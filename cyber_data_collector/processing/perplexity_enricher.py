@@ -16,7 +16,7 @@ from datetime import datetime, timedelta
 from typing import Dict, List, Any, Optional, Tuple
 import requests
 from cyber_data_collector.models.vulnerability_taxonomy import VULNERABILITY_CATEGORIES, validate_vulnerability_category
-from cyber_data_collector.utils.validation import validate_records_affected, validate_and_correct_enrichment_data
+from cyber_data_collector.utils.validation import validate_records_affected, validate_and_correct_enrichment_data_inplace
 
 
 class PerplexityEventEnricher:
@@ -251,7 +251,7 @@ class PerplexityEventEnricher:
                 enriched_data['records_affected'] = records
 
         # Apply validation to all extracted data
-        enriched_data = validate_and_correct_enrichment_data(enriched_data, event_title)
+        validate_and_correct_enrichment_data_inplace(enriched_data, event_title)
 
         return enriched_data
     
@@ -7,47 +7,186 @@ with separated raw and enriched events.
 
 from __future__ import annotations
 
+import copy
 import hashlib
-import json
 import logging
 import sqlite3
+import queue
 import threading
 import uuid
+from contextlib import contextmanager
 from datetime import datetime, date
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Set, Tuple
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+from . import fulltext
+from ..utils.validation import safe_json_dumps
+
+# Compact, so safe_json_dumps can use orjson for plain metadata and results
+_JSON_SEPARATORS = (",", ":")
+
+# INSERT ... RETURNING arrived in SQLite 3.35
+SQLITE_SUPPORTS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+
+# Read-only connections kept alongside the writer; WAL lets them read concurrently
+DEFAULT_READER_POOL_SIZE = 4
+
+# Upper bound on remembered entity name -> entity_id pairs
+ENTITY_ID_CACHE_SIZE = 50_000
+
+# Rows pulled from SQLite per step when streaming results
+FETCH_BATCH_SIZE = 1000
+
+# Per-connection prepared statement cache, sized so the hot statements are not
+# evicted by the schema setup and reporting queries sharing the connection
+STATEMENT_CACHE_SIZE = 256
+
+# Hot-path statements. sqlite3 keys its statement cache on the SQL text, so
+# keeping one copy of each string guarantees the prepared statement is reused
+_SQL_INSERT_RAW = """
+    INSERT INTO RawEvents (
+        raw_event_id, source_type, source_event_id, raw_title,
+        raw_description, raw_content, event_date, source_url,
+        source_metadata, discovered_at, is_processed
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+_SQL_FIND_EXISTING_RAW = """
+    SELECT raw_event_id FROM RawEvents
+    WHERE source_type = ? AND source_url = ? AND raw_title = ?
+    LIMIT 1
+"""
+
+_SQL_MARK_PROCESSED = """
+    UPDATE RawEvents
+    SET is_processed = TRUE, processing_attempted_at = ?, processing_error = ?
+    WHERE raw_event_id = ?
+"""
+
+_SQL_INSERT_PROCLOG = """
+    INSERT INTO ProcessingLog (
+        log_id, raw_event_id, processing_stage, status,
+        result_data, error_message, processing_time_ms, created_at
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+_SQL_IS_MONTH_PROCESSED = """
+    SELECT is_processed FROM MonthProcessed
+    WHERE year = ? AND month = ?
+"""
+
+# Columns the scrape and enrichment queues hand to the pipeline. The
+# bookkeeping columns are left out: is_processed is pinned by the queue filter
+# and processing_attempted_at/processing_error are only ever written there
+_RAW_EVENT_QUEUE_COLUMNS = (
+    "raw_event_id", "source_type", "source_event_id", "raw_title",
+    "raw_description", "raw_content", "event_date", "source_url",
+    "source_metadata", "discovered_at",
+)
 
 
 class CyberEventDataV2:
     """
     Thread-safe library for managing cyber event data with separated raw and enriched schemas.
+
+    Event and log ids stay 36-character uuid4 strings in TEXT columns. Other
+    scripts, the dashboards and the JSON exports read and compare them as
+    strings, and existing databases already hold them in that form, so a
+    BLOB or integer-key layout would need a full migration.
     """
 
-    def __init__(self, db_path: str | Path = "instance/cyber_events.db"):
+    def __init__(self, db_path: str | Path = "instance/cyber_events.db",
+                 reader_pool_size: int = DEFAULT_READER_POOL_SIZE):
         self._db_path = Path(db_path)
         self._db_path.parent.mkdir(exist_ok=True)
         self._conn: Optional[sqlite3.Connection] = None
-        self._lock = threading.Lock()
+        # Re-entrant so transaction() can hold it across the write methods it wraps
+        self._lock = threading.RLock()
+        self._in_transaction = False
+        self._transaction_thread: Optional[int] = None
+        # Set when a write inside transaction() fails; the block then rolls back
+        self._rollback_only = False
+        self._readers: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._reader_slots = threading.BoundedSemaphore(max(1, reader_pool_size))
+        self._stats_cache: Optional[Tuple[int, Dict[str, Any]]] = None
+        # Read-only connection that only answers PRAGMA data_version
+        self._version_conn: Optional[sqlite3.Connection] = None
+        self._version_lock = threading.Lock()
+        self._fulltext = False
+        # entity_name -> entity_id for committed rows; ids from uncommitted
+        # inserts wait in _pending_entity_ids until their commit succeeds
+        self._entity_ids: Dict[str, int] = {}
+        self._pending_entity_ids: Dict[str, int] = {}
+        self._entity_ids_version: Optional[int] = None
         self._logger = logging.getLogger(self.__class__.__name__)
         self._connect()
         self._ensure_v2_schema()
 
+    def _open_connection(self, read_only: bool = False) -> sqlite3.Connection:
+        """Open a connection with the store's PRAGMAs applied.
+
+        WAL with synchronous=NORMAL skips the fsync on every commit. After a
+        power loss the most recent commits may be rolled back, but the
+        database is never corrupted. The writer checkpoints the WAL back into
+        the main file every 1000 pages so it cannot grow without bound.
+        """
+        conn = sqlite3.connect(
+            self._db_path,
+            check_same_thread=False,
+            timeout=30,
+            cached_statements=STATEMENT_CACHE_SIZE,
+            detect_types=sqlite3.PARSE_DECLTYPES | sqlite3.PARSE_COLNAMES,
+        )
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA foreign_keys = ON;")
+        if read_only:
+            conn.execute("PRAGMA query_only = 1;")
+        else:
+            conn.execute("PRAGMA journal_mode = WAL;")
+            conn.execute("PRAGMA wal_autocheckpoint = 1000;")
+        conn.execute("PRAGMA busy_timeout = 30000;")
+        conn.execute("PRAGMA synchronous = NORMAL;")
+        conn.execute("PRAGMA temp_store = MEMORY;")
+        conn.execute("PRAGMA mmap_size = 268435456;")
+        conn.execute("PRAGMA cache_size = -65536;")
+        return conn
+
     def _connect(self):
         try:
-            self._conn = sqlite3.connect(
-                self._db_path,
-                check_same_thread=False,
-                timeout=30,
-                detect_types=sqlite3.PARSE_DECLTYPES | sqlite3.PARSE_COLNAMES,
-            )
-            self._conn.row_factory = sqlite3.Row
-            self._conn.execute("PRAGMA foreign_keys = ON;")
-            self._conn.execute("PRAGMA journal_mode = WAL;")
-            self._conn.execute("PRAGMA busy_timeout = 30000;")
+            self._conn = self._open_connection()
         except sqlite3.Error as e:
             self._logger.error("Database connection error: %s", e)
             raise
 
+    @contextmanager
+    def _reader(self) -> Iterator[sqlite3.Connection]:
+        """Check out a read-only connection; reads never wait on the writer lock.
+
+        Connections are opened lazily up to the pool size and returned to the
+        pool afterwards. Reads see the latest committed state only, except
+        from the thread inside transaction(), which reads through the writer
+        so it sees its own uncommitted writes.
+        """
+        if not self._conn:
+            raise ConnectionError("Database not connected")
+
+        if self._transaction_thread == threading.get_ident():
+            yield self._conn
+            return
+
+        with self._reader_slots:
+            try:
+                conn = self._readers.get_nowait()
+            except queue.Empty:
+                conn = self._open_connection(read_only=True)
+            try:
+                yield conn
+            finally:
+                if self._conn is None:
+                    conn.close()
+                else:
+                    self._readers.put(conn)
+
     def _ensure_v2_schema(self):
         """Ensure V2 schema tables exist"""
         with self._lock:
@@ -57,11 +196,208 @@ class CyberEventDataV2:
             if not cursor.fetchone():
                 self._logger.error("V2 schema not found. Please run database_migration_v2.py first.")
                 raise RuntimeError("Database schema V2 not found. Run migration script first.")
+            self._ensure_indexes(cursor)
+            self._ensure_views(cursor)
+            # Built by storage.fulltext.migrate; without it, text filters use LIKE
+            self._fulltext = fulltext.is_installed(self._conn)
+            self._ensure_statistics(cursor)
+
+    def _ensure_indexes(self, cursor: sqlite3.Cursor):
+        """Create the indexes behind the hot queries if they are missing.
+
+        Partial indexes cover only the pending work set (unprocessed raw
+        events), so their size tracks the backlog rather than the corpus; the
+        unprocessed one also orders ties so keyset pages can seek into it, and
+        the work-queue one serves the same scan restricted by source. The
+        RawEvents lookup index matches find_existing_raw_event column for
+        column and covers get_known_source_urls outright.
+        """
+        try:
+            cursor.executescript("""
+                -- Superseded by idx_raw_events_unprocessed_seek
+                DROP INDEX IF EXISTS idx_raw_events_unprocessed;
+                CREATE INDEX IF NOT EXISTS idx_raw_events_unprocessed_seek
+                    ON RawEvents(discovered_at, raw_event_id) WHERE is_processed = FALSE;
+                CREATE INDEX IF NOT EXISTS idx_raw_events_work_queue
+                    ON RawEvents(source_type, discovered_at, raw_event_id) WHERE is_processed = FALSE;
+                -- Superseded by idx_raw_events_lookup
+                DROP INDEX IF EXISTS idx_raw_events_source_url;
+                CREATE INDEX IF NOT EXISTS idx_raw_events_lookup
+                    ON RawEvents(source_type, source_url, raw_title);
+                CREATE INDEX IF NOT EXISTS idx_processing_log_event_stage
+                    ON ProcessingLog(raw_event_id, processing_stage, status);
+                CREATE INDEX IF NOT EXISTS idx_enriched_events_active
+                    ON EnrichedEvents(status, is_australian_event, is_specific_event, event_date DESC);
+            """)
+        except sqlite3.Error as e:
+            # Indexes only speed queries up; an older schema still works without them
+            self._logger.warning("Could not create V2 indexes: %s", e)
+
+    def _ensure_views(self, cursor: sqlite3.Cursor):
+        """Create v_enriched_full, the enriched event + source + entity join.
+
+        Dashboards, exports and the RF training-data scripts all want an
+        enriched event alongside its raw source and linked entities; the view
+        keeps that four-table join in one place. It is a plain view rather
+        than a trigger-maintained table, so every reader sees current data
+        and enrichment writes carry no extra cost. One row per linked
+        entity; events without entities appear once with NULL entity columns.
+        """
+        try:
+            cursor.executescript("""
+                CREATE VIEW IF NOT EXISTS v_enriched_full AS
+                SELECT e.enriched_event_id, e.raw_event_id, e.title, e.description,
+                       e.event_date, e.is_australian_event, e.is_specific_event,
+                       e.event_type, e.severity, e.status,
+                       r.source_type, r.source_url,
+                       ee.entity_id, ee.relationship_type,
+                       en.entity_name, en.industry
+                FROM EnrichedEvents e
+                JOIN RawEvents r ON r.raw_event_id = e.raw_event_id
+                LEFT JOIN EnrichedEventEntities ee ON ee.enriched_event_id = e.enriched_event_id
+                LEFT JOIN EntitiesV2 en ON en.entity_id = ee.entity_id;
+            """)
+            # SQLite only resolves a view's columns when it is read
+            cursor.execute("SELECT 1 FROM v_enriched_full LIMIT 0")
+        except sqlite3.Error as e:
+            self._logger.warning("Could not create v_enriched_full view: %s", e)
+            cursor.execute("DROP VIEW IF EXISTS v_enriched_full")
+
+    def _ensure_statistics(self, cursor: sqlite3.Cursor):
+        """Make sure the planner has current statistics.
+
+        Without sqlite_stat1 rows the planner guesses at index selectivity and
+        can ignore the partial indexes, so a database that has never been
+        analyzed gets a full ANALYZE. Otherwise PRAGMA optimize=0x10002
+        re-analyzes only the tables that have changed a lot since their last
+        ANALYZE, checking every table rather than only those queried on this
+        connection. Close runs a plain PRAGMA optimize as well.
+        """
+        try:
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'sqlite_stat1'")
+            if cursor.fetchone():
+                cursor.execute("SELECT 1 FROM sqlite_stat1 WHERE tbl = 'RawEvents' LIMIT 1")
+                if cursor.fetchone():
+                    cursor.execute("PRAGMA optimize=0x10002")
+                    self._conn.commit()
+                    return
+            cursor.execute("ANALYZE")
+            self._conn.commit()
+        except sqlite3.Error as e:
+            self._logger.warning("Could not analyze V2 database: %s", e)
+
+    def analyze(self, tables: Optional[List[str]] = None):
+        """
+        Refresh planner statistics after a large backfill or purge.
+
+        Args:
+            tables: Tables to analyze, or None for the raw, log and enriched tables
+        """
+        if not self._conn:
+            raise ConnectionError("Database not connected")
+
+        with self._lock:
+            try:
+                for table in tables or ('RawEvents', 'ProcessingLog', 'EnrichedEvents'):
+                    # Table names cannot be bound; quote them as identifiers
+                    self._conn.execute('ANALYZE "%s"' % table.replace('"', '""'))
+                self._commit()
+            except sqlite3.Error as e:
+                self._logger.warning("ANALYZE failed: %s", e)
+                self._rollback()
+
+    # =========================================================================
+    # TRANSACTIONS
+    # =========================================================================
+
+    @contextmanager
+    def transaction(self) -> Iterator["CyberEventDataV2"]:
+        """
+        Group many write calls into one transaction with a single commit.
+
+        Write methods called inside the block skip their own commit and
+        rollback; the block commits once on exit, or rolls everything back if
+        it raises. Other threads' writes wait until the block ends, and their
+        reads do not see the block's writes until then. Reads made inside the
+        block do, so duplicate checks such as find_existing_raw_event stay
+        correct. Nested blocks join the outer transaction.
+
+        A write method that fails inside the block marks it rollback-only,
+        even when the method itself swallows the error and returns 0/False;
+        the block then rolls back on exit and raises sqlite3.DatabaseError
+        rather than committing the partial work.
+
+            with db.transaction():
+                for raw_event_id, enriched_data in batch:
+                    db.create_enriched_event(raw_event_id, enriched_data)
+                    db.log_processing_attempt(raw_event_id, 'llm_analysis', 'success')
+        """
+        if not self._conn:
+            raise ConnectionError("Database not connected")
+
+        with self._lock:
+            if self._in_transaction:
+                yield self
+                return
+
+            self._conn.execute("BEGIN IMMEDIATE")
+            self._in_transaction = True
+            self._transaction_thread = threading.get_ident()
+            self._rollback_only = False
+            try:
+                yield self
+            except BaseException:
+                self._conn.rollback()
+                self._pending_entity_ids.clear()
+                raise
+            else:
+                if self._rollback_only:
+                    self._conn.rollback()
+                    self._pending_entity_ids.clear()
+                    raise sqlite3.DatabaseError("Transaction rolled back: a write inside it failed")
+                self._conn.commit()
+                self._publish_entity_ids()
+            finally:
+                self._in_transaction = False
+                self._transaction_thread = None
+                self._rollback_only = False
+
+    def _commit(self):
+        if not self._in_transaction:
+            self._conn.commit()
+            self._publish_entity_ids()
+
+    def _rollback(self):
+        # Inside transaction() the block settles it: mark it rollback-only so
+        # an error the caller swallowed cannot be committed with the rest
+        if self._in_transaction:
+            self._rollback_only = True
+        else:
+            self._conn.rollback()
+            self._pending_entity_ids.clear()
 
     # =========================================================================
     # RAW EVENT OPERATIONS
     # =========================================================================
 
+    def _raw_event_row(self, raw_event_id: str, source_type: str, raw_data: Dict[str, Any],
+                       discovered_at: str) -> tuple:
+        """Build the RawEvents parameter tuple for one event."""
+        return (
+            raw_event_id,
+            source_type,
+            raw_data.get('source_event_id'),
+            raw_data.get('title'),
+            raw_data.get('description'),
+            raw_data.get('content'),
+            raw_data.get('event_date'),
+            raw_data.get('source_url'),
+            safe_json_dumps(raw_data.get('metadata', {}), "raw event metadata",
+                            separators=_JSON_SEPARATORS, default=self._json_default),
+            discovered_at,
+            False
+        )
+
     def add_raw_event(self, source_type: str, raw_data: Dict[str, Any]) -> str:
         """
         Add a new raw event to the database.
@@ -73,38 +409,44 @@ class CyberEventDataV2:
         Returns:
             The raw_event_id of the created event
         """
+        return self.add_raw_events_bulk([(source_type, raw_data)])[0]
+
+    def add_raw_events_bulk(self, raw_events: List[Tuple[str, Dict[str, Any]]]) -> List[str]:
+        """
+        Add many raw events in a single transaction.
+
+        The rows are built before the write lock is taken, share one
+        discovered_at timestamp, and go to SQLite in one executemany under
+        BEGIN IMMEDIATE, so the whole batch costs a single commit.
+
+        Args:
+            raw_events: (source_type, raw_data) pairs, as passed to add_raw_event
+
+        Returns:
+            The raw_event_ids of the created events, in input order
+        """
         if not self._conn:
             raise ConnectionError("Database not connected")
 
-        raw_event_id = str(uuid.uuid4())
+        raw_event_ids = [str(uuid.uuid4()) for _ in raw_events]
+        discovered_at = datetime.now().isoformat()
+        rows = [
+            self._raw_event_row(raw_event_id, source_type, raw_data, discovered_at)
+            for raw_event_id, (source_type, raw_data) in zip(raw_event_ids, raw_events)
+        ]
 
         with self._lock:
             cursor = self._conn.cursor()
             try:
-                cursor.execute("""
-                    INSERT INTO RawEvents (
-                        raw_event_id, source_type, source_event_id, raw_title,
-                        raw_description, raw_content, event_date, source_url,
-                        source_metadata, discovered_at, is_processed
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    raw_event_id,
-                    source_type,
-                    raw_data.get('source_event_id'),
-                    raw_data.get('title'),
-                    raw_data.get('description'),
-                    raw_data.get('content'),
-                    raw_data.get('event_date'),
-                    raw_data.get('source_url'),
-                    json.dumps(raw_data.get('metadata', {}), default=self._json_default),
-                    datetime.now().isoformat(),
-                    False
-                ))
-                self._conn.commit()
-                return raw_event_id
+                if not self._conn.in_transaction:
+                    # Take the write lock up front rather than upgrading mid-batch
+                    cursor.execute("BEGIN IMMEDIATE")
+                cursor.executemany(_SQL_INSERT_RAW, rows)
+                self._commit()
+                return raw_event_ids
             except sqlite3.Error as e:
-                self._logger.error("Error adding raw event: %s", e)
-                self._conn.rollback()
+                self._logger.error("Error adding %d raw event(s): %s", len(rows), e)
+                self._rollback()
                 raise
 
     def find_existing_raw_event(self, source_type: str, source_url: str, title: str) -> Optional[str]:
@@ -122,14 +464,10 @@ class CyberEventDataV2:
         if not self._conn:
             raise ConnectionError("Database not connected")
 
-        with self._lock:
-            cursor = self._conn.cursor()
+        with self._reader() as conn:
+            cursor = conn.cursor()
             try:
-                cursor.execute("""
-                    SELECT raw_event_id FROM RawEvents
-                    WHERE source_type = ? AND source_url = ? AND raw_title = ?
-                    LIMIT 1
-                """, (source_type, source_url, title))
+                cursor.execute(_SQL_FIND_EXISTING_RAW, (source_type, source_url, title))
 
                 result = cursor.fetchone()
                 return result['raw_event_id'] if result else None
@@ -142,60 +480,70 @@ class CyberEventDataV2:
         if not self._conn:
             raise ConnectionError("Database not connected")
 
-        with self._lock:
-            cursor = self._conn.cursor()
+        with self._reader() as conn:
+            cursor = conn.cursor()
             try:
                 cursor.execute(
                     "SELECT source_url FROM RawEvents WHERE source_type = ? AND source_url IS NOT NULL",
                     (source_type,),
                 )
-                return {row["source_url"] for row in cursor.fetchall()}
+                # Streamed from the cursor: this set can span the whole corpus
+                return {url for (url,) in cursor}
             except sqlite3.Error as e:
                 self._logger.error("Error fetching known source URLs: %s", e)
                 return set()
 
-    def get_unprocessed_raw_events(self, source_types: List[str] = None, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+    def get_unprocessed_raw_events(self, source_types: List[str] = None, limit: Optional[int] = None,
+                                   after: Optional[Tuple[str, str]] = None) -> List[Dict[str, Any]]:
         """
         Get raw events that haven't been processed yet.
 
         Args:
             source_types: List of source types to filter by, or None for all
             limit: Maximum number of events to return
+            after: (discovered_at, raw_event_id) of the last event of the
+                previous page; only later events are returned. Paging this
+                way seeks straight to the next page instead of re-reading
+                the earlier ones.
 
         Returns:
-            List of raw event dictionaries
+            List of raw event dictionaries, ordered by discovered_at then raw_event_id
         """
+        return list(self.iter_unprocessed_raw_events(source_types, limit, after))
+
+    def iter_unprocessed_raw_events(self, source_types: List[str] = None, limit: Optional[int] = None,
+                                    after: Optional[Tuple[str, str]] = None) -> Iterator[Dict[str, Any]]:
+        """Yield unprocessed raw events one at a time; see get_unprocessed_raw_events."""
         if not self._conn:
             raise ConnectionError("Database not connected")
 
         if limit is not None and limit <= 0:
             limit = None
 
-        with self._lock:
-            cursor = self._conn.cursor()
+        with self._reader() as conn:
+            cursor = conn.cursor()
+
+            query = (f"SELECT {', '.join(_RAW_EVENT_QUEUE_COLUMNS)} FROM RawEvents"
+                     " WHERE is_processed = FALSE")
+            params: List[Any] = []
 
             if source_types:
                 placeholders = ','.join('?' * len(source_types))
-                query = f"""
-                    SELECT * FROM RawEvents
-                    WHERE is_processed = FALSE AND source_type IN ({placeholders})
-                    ORDER BY discovered_at ASC
-                """
-                params = list(source_types)
-            else:
-                query = """
-                    SELECT * FROM RawEvents
-                    WHERE is_processed = FALSE
-                    ORDER BY discovered_at ASC
-                """
-                params = []
+                query += f" AND source_type IN ({placeholders})"
+                params.extend(source_types)
+
+            if after is not None:
+                # Bulk inserts share one discovered_at, so the id breaks ties
+                query += " AND (discovered_at, raw_event_id) > (?, ?)"
+                params.extend(after)
+
+            query += " ORDER BY discovered_at ASC, raw_event_id ASC"
 
             if limit is not None:
                 query += " LIMIT ?"
                 params.append(limit)
 
-            cursor.execute(query, params)
-            return [dict(row) for row in cursor.fetchall()]
+            yield from self._iter_dicts(cursor, query, params)
 
     def get_raw_events_for_processing(self, australian_only: bool = True, limit: Optional[int] = None) -> List[Dict[str, Any]]:
         """
@@ -209,39 +557,64 @@ class CyberEventDataV2:
         Returns:
             List of raw event dictionaries suitable for enrichment
         """
+        return list(self.iter_raw_events_for_processing(australian_only, limit))
+
+    def iter_raw_events_for_processing(self, australian_only: bool = True,
+                                       limit: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """Yield raw events awaiting enrichment; see get_raw_events_for_processing."""
         if not self._conn:
             raise ConnectionError("Database not connected")
 
         if limit is not None and limit <= 0:
             limit = None
 
-        with self._lock:
-            cursor = self._conn.cursor()
+        with self._reader() as conn:
+            cursor = conn.cursor()
 
             # Build query to find events likely to be Australian cyber events
-            query = """
-                SELECT re.* FROM RawEvents re
-                LEFT JOIN ProcessingLog pl ON re.raw_event_id = pl.raw_event_id
-                    AND pl.processing_stage = 'llm_analysis' AND pl.status = 'success'
+            # NOT EXISTS stops at the first matching log row instead of
+            # joining every log row for the event
+            columns = ', '.join(f're.{column}' for column in _RAW_EVENT_QUEUE_COLUMNS)
+            query = f"""
+                SELECT {columns} FROM RawEvents re
                 WHERE re.is_processed = FALSE
-                    AND pl.log_id IS NULL  -- Not already analyzed
                     AND re.source_url IS NOT NULL  -- Has URL for scraping
+                    AND NOT EXISTS (  -- Not already analyzed
+                        SELECT 1 FROM ProcessingLog pl
+                        WHERE pl.raw_event_id = re.raw_event_id
+                            AND pl.processing_stage = 'llm_analysis'
+                            AND pl.status = 'success'
+                    )
             """
 
             params = []
 
             if australian_only:
+                if self._fulltext:
+                    # Prefix match covers australia, australian(s), australia's
+                    text_match = """
+                        re.raw_event_id IN (
+                            SELECT k.raw_event_id FROM RawEvents_fts f
+                            JOIN RawEventsFtsKeys k ON k.fts_rowid = f.rowid
+                            WHERE RawEvents_fts MATCH 'australia*'
+                        ) OR"""
+                else:
+                    # LIKE already folds ASCII case, and a NULL description
+                    # simply fails to match, so no per-row LOWER()/COALESCE()
+                    text_match = """
+                        re.raw_title LIKE '%australia%' OR
+                        re.raw_description LIKE '%australia%' OR"""
+                # Most URLs are not Australian, so one '.au' scan settles them
+                # before the five second-level domain patterns are tried
                 query += """
-                    AND (
-                        LOWER(re.raw_title) LIKE '%australia%' OR
-                        LOWER(re.raw_title) LIKE '%australian%' OR
-                        LOWER(COALESCE(re.raw_description,'')) LIKE '%australia%' OR
-                        LOWER(COALESCE(re.raw_description,'')) LIKE '%australian%' OR
-                        re.source_url LIKE '%.com.au%' OR
-                        re.source_url LIKE '%.gov.au%' OR
-                        re.source_url LIKE '%.edu.au%' OR
-                        re.source_url LIKE '%.org.au%' OR
-                        re.source_url LIKE '%.net.au%' OR
+                    AND (""" + text_match + """
+                        (re.source_url LIKE '%.au%' AND (
+                            re.source_url LIKE '%.com.au%' OR
+                            re.source_url LIKE '%.gov.au%' OR
+                            re.source_url LIKE '%.edu.au%' OR
+                            re.source_url LIKE '%.org.au%' OR
+                            re.source_url LIKE '%.net.au%'
+                        )) OR
                         re.source_url LIKE '%/au/%'
                     )
                 """
@@ -251,26 +624,83 @@ class CyberEventDataV2:
                 query += " LIMIT ?"
                 params.append(limit)
 
-            cursor.execute(query, params)
-            return [dict(row) for row in cursor.fetchall()]
+            yield from self._iter_dicts(cursor, query, params)
+
+    def find_raw_events_by_metadata(self, key: str, value: Any,
+                                    limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Get raw events whose source_metadata has ``key`` set to ``value``.
+
+        The comparison runs inside SQLite through json_extract, so rows are
+        not pulled into Python and decoded one by one. Rows holding malformed
+        JSON are skipped.
+
+        Args:
+            key: Top-level metadata key
+            value: Value to match; booleans compare as 1/0 as in SQLite's JSON
+            limit: Maximum number of events to return
+
+        Returns:
+            List of raw event dictionaries, oldest first
+        """
+        if not self._conn:
+            raise ConnectionError("Database not connected")
+
+        path = '$."' + key.replace('"', '""') + '"'
+        query = """
+            SELECT * FROM RawEvents
+            WHERE CASE WHEN json_valid(source_metadata)
+                       THEN json_extract(source_metadata, ?) END = ?
+            ORDER BY discovered_at ASC
+        """
+        params: List[Any] = [path, value]
+        if limit is not None and limit > 0:
+            query += " LIMIT ?"
+            params.append(limit)
+
+        with self._reader() as conn:
+            return self._fetch_dicts(conn.cursor(), query, params)
 
     def mark_raw_event_processed(self, raw_event_id: str, error_message: str = None):
         """Mark a raw event as processed"""
+        self.mark_raw_events_processed(
+            [raw_event_id], {raw_event_id: error_message} if error_message else None
+        )
+
+    def mark_raw_events_processed(self, raw_event_ids: List[str],
+                                  error_messages: Optional[Dict[str, str]] = None) -> int:
+        """
+        Mark many raw events as processed with one statement and one commit.
+
+        Args:
+            raw_event_ids: IDs of the raw events to mark
+            error_messages: Optional processing_error per raw_event_id
+
+        Returns:
+            The number of raw events updated, or 0 if the update failed
+        """
         if not self._conn:
             raise ConnectionError("Database not connected")
 
+        attempted_at = datetime.now().isoformat()
+        error_messages = error_messages or {}
+        rows = [
+            (attempted_at, error_messages.get(raw_event_id), raw_event_id)
+            for raw_event_id in raw_event_ids
+        ]
+        if not rows:
+            return 0
+
         with self._lock:
             cursor = self._conn.cursor()
             try:
-                cursor.execute("""
-                    UPDATE RawEvents
-                    SET is_processed = TRUE, processing_attempted_at = ?, processing_error = ?
-                    WHERE raw_event_id = ?
-                """, (datetime.now().isoformat(), error_message, raw_event_id))
-                self._conn.commit()
+                cursor.executemany(_SQL_MARK_PROCESSED, rows)
+                self._commit()
+                return cursor.rowcount
             except sqlite3.Error as e:
-                self._logger.error("Error marking raw event as processed: %s", e)
-                self._conn.rollback()
+                self._logger.error("Error marking raw events as processed: %s", e)
+                self._rollback()
+                return 0
 
     # =========================================================================
     # ENRICHED EVENT OPERATIONS
@@ -310,6 +740,7 @@ class CyberEventDataV2:
                 pass  # Fall through to insert
 
         enriched_event_id = str(uuid.uuid4())
+        now_iso = datetime.now().isoformat()
 
         with self._lock:
             cursor = self._conn.cursor()
@@ -336,57 +767,129 @@ class CyberEventDataV2:
                     enriched_data.get('confidence_score', 0.0),
                     enriched_data.get('australian_relevance_score', 0.0),
                     enriched_data.get('status', 'Active'),
-                    datetime.now().isoformat(),
-                    datetime.now().isoformat()
+                    now_iso,
+                    now_iso
                 ))
 
                 # Add entities if provided
                 if enriched_data.get('entities'):
-                    self._link_entities_to_enriched_event(enriched_event_id, enriched_data['entities'])
+                    self._link_entities_to_enriched_event(
+                        enriched_event_id, enriched_data['entities'], now_iso
+                    )
 
-                self._conn.commit()
+                self._commit()
                 return enriched_event_id
             except sqlite3.Error as e:
                 self._logger.error("Error creating enriched event: %s", e)
-                self._conn.rollback()
+                self._rollback()
                 raise
 
-    def _link_entities_to_enriched_event(self, enriched_event_id: str, entities: List[Dict[str, Any]]):
+    def _link_entities_to_enriched_event(self, enriched_event_id: str, entities: List[Dict[str, Any]],
+                                         created_at: Optional[str] = None):
         """Link entities to an enriched event"""
         cursor = self._conn.cursor()
 
+        # The first entry for a name wins, as both inserts are OR IGNORE
+        by_name = {}
         for entity_data in entities:
-            entity_name = entity_data.get('name')
-            if not entity_name:
-                continue
-
-            # Insert or get entity
-            cursor.execute("""
-                INSERT OR IGNORE INTO EntitiesV2 (entity_name, entity_type, is_australian, confidence_score, created_at)
-                VALUES (?, ?, ?, ?, ?)
-            """, (
-                entity_name,
+            if entity_data.get('name'):
+                by_name.setdefault(entity_data['name'], entity_data)
+        if not by_name:
+            return
+
+        created_at = created_at or datetime.now().isoformat()
+        entity_rows = [
+            (
+                name,
                 entity_data.get('type'),
                 entity_data.get('is_australian', False),
                 entity_data.get('confidence_score', 0.0),
-                datetime.now().isoformat()
-            ))
-
-            # Get entity ID
-            cursor.execute("SELECT entity_id FROM EntitiesV2 WHERE entity_name = ?", (entity_name,))
-            entity_id = cursor.fetchone()['entity_id']
-
-            # Link to enriched event
-            cursor.execute("""
-                INSERT OR IGNORE INTO EnrichedEventEntities
-                (enriched_event_id, entity_id, relationship_type, confidence_score)
-                VALUES (?, ?, ?, ?)
-            """, (
+                created_at
+            )
+            for name, entity_data in by_name.items()
+        ]
+
+        # Misses seek the UNIQUE(entity_name) index by exact name, which the
+        # ON CONFLICT(entity_name) upsert below also depends on. Names that
+        # differ only in case stay distinct rows; entity_merge folds those
+        self._check_entity_id_cache()
+        entity_ids = {name: self._entity_ids[name] for name in by_name if name in self._entity_ids}
+        entity_rows = [row for row in entity_rows if row[0] not in entity_ids]
+
+        if not entity_rows:
+            pass
+        elif SQLITE_SUPPORTS_RETURNING:
+            # One multi-row upsert per chunk; the no-op update makes existing
+            # rows return their id too. RETURNING order is unspecified, so
+            # the name comes back alongside the id
+            rows_per_chunk = self._MAX_SQL_VARIABLES // len(entity_rows[0])
+            for start in range(0, len(entity_rows), rows_per_chunk):
+                chunk = entity_rows[start:start + rows_per_chunk]
+                cursor.execute(f"""
+                    INSERT INTO EntitiesV2 (entity_name, entity_type, is_australian, confidence_score, created_at)
+                    VALUES {','.join(['(?, ?, ?, ?, ?)'] * len(chunk))}
+                    ON CONFLICT(entity_name) DO UPDATE SET entity_name = entity_name
+                    RETURNING entity_name, entity_id
+                """, [value for row in chunk for value in row])
+                entity_ids.update((row['entity_name'], row['entity_id']) for row in cursor)
+        else:
+            cursor.executemany("""
+                INSERT OR IGNORE INTO EntitiesV2 (entity_name, entity_type, is_australian, confidence_score, created_at)
+                VALUES (?, ?, ?, ?, ?)
+            """, entity_rows)
+            entity_ids.update(self._entity_ids_by_name(cursor, [row[0] for row in entity_rows]))
+
+        for row in entity_rows:
+            self._pending_entity_ids[row[0]] = entity_ids[row[0]]
+
+        cursor.executemany("""
+            INSERT OR IGNORE INTO EnrichedEventEntities
+            (enriched_event_id, entity_id, relationship_type, confidence_score)
+            VALUES (?, ?, ?, ?)
+        """, [
+            (
                 enriched_event_id,
-                entity_id,
+                entity_ids[name],
                 entity_data.get('relationship_type', 'affected'),
                 entity_data.get('confidence_score', 0.0)
-            ))
+            )
+            for name, entity_data in by_name.items()
+        ])
+
+    def _check_entity_id_cache(self):
+        """Forget cached entity ids once another connection has committed.
+
+        Entity merges elsewhere delete EntitiesV2 rows, so the cache is only
+        trusted while PRAGMA data_version, which moves on every commit by
+        another connection or process, stays put.
+        """
+        version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+        if version != self._entity_ids_version:
+            self._entity_ids.clear()
+            self._entity_ids_version = version
+
+    def _publish_entity_ids(self):
+        """Move ids from a just-committed transaction into the cache."""
+        if self._pending_entity_ids:
+            if len(self._entity_ids) + len(self._pending_entity_ids) > ENTITY_ID_CACHE_SIZE:
+                self._entity_ids.clear()
+            self._entity_ids.update(self._pending_entity_ids)
+            self._pending_entity_ids.clear()
+
+    # SQLite's default SQLITE_MAX_VARIABLE_NUMBER before 3.32
+    _MAX_SQL_VARIABLES = 999
+
+    def _entity_ids_by_name(self, cursor: sqlite3.Cursor, names: List[str]) -> Dict[str, int]:
+        """Look up EntitiesV2 ids for ``names`` with as few queries as possible."""
+        entity_ids = {}
+        for start in range(0, len(names), self._MAX_SQL_VARIABLES):
+            chunk = names[start:start + self._MAX_SQL_VARIABLES]
+            cursor.execute(
+                f"SELECT entity_name, entity_id FROM EntitiesV2 WHERE entity_name IN ({','.join('?' * len(chunk))})",
+                chunk,
+            )
+            entity_ids.update((row['entity_name'], row['entity_id']) for row in cursor)
+        return entity_ids
 
     def get_enriched_events(self, australian_only: bool = True, specific_only: bool = True, limit: int = 100) -> List[Dict[str, Any]]:
         """
@@ -400,11 +903,16 @@ class CyberEventDataV2:
         Returns:
             List of enriched event dictionaries
         """
+        return list(self.iter_enriched_events(australian_only, specific_only, limit))
+
+    def iter_enriched_events(self, australian_only: bool = True, specific_only: bool = True,
+                             limit: int = 100) -> Iterator[Dict[str, Any]]:
+        """Yield active enriched events one at a time; see get_enriched_events."""
         if not self._conn:
             raise ConnectionError("Database not connected")
 
-        with self._lock:
-            cursor = self._conn.cursor()
+        with self._reader() as conn:
+            cursor = conn.cursor()
 
             query = "SELECT * FROM EnrichedEvents WHERE status = 'Active'"
             params = []
@@ -418,8 +926,7 @@ class CyberEventDataV2:
             query += " ORDER BY event_date DESC, created_at DESC LIMIT ?"
             params.append(limit)
 
-            cursor.execute(query, params)
-            return [dict(row) for row in cursor.fetchall()]
+            yield from self._iter_dicts(cursor, query, params)
 
     # =========================================================================
     # PROCESSING LOG OPERATIONS
@@ -450,31 +957,61 @@ class CyberEventDataV2:
         with self._lock:
             cursor = self._conn.cursor()
             try:
-                cursor.execute("""
-                    INSERT INTO ProcessingLog (
-                        log_id, raw_event_id, processing_stage, status,
-                        result_data, error_message, processing_time_ms, created_at
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
+                cursor.execute(_SQL_INSERT_PROCLOG, (
                     log_id,
                     raw_event_id,
                     stage,
                     status,
-                    json.dumps(result_data, default=self._json_default) if result_data else None,
+                    safe_json_dumps(result_data, "processing result",
+                                    separators=_JSON_SEPARATORS, default=self._json_default)
+                    if result_data else None,
                     error_message,
                     processing_time_ms,
                     datetime.now().isoformat()
                 ))
-                self._conn.commit()
+                self._commit()
                 return log_id
             except sqlite3.Error as e:
                 self._logger.error("Error logging processing attempt: %s", e)
-                self._conn.rollback()
+                self._rollback()
                 raise
 
+    @staticmethod
+    def _fetch_dicts(cursor: sqlite3.Cursor, query: str, params=()) -> List[Dict[str, Any]]:
+        """Run ``query`` and build plain dicts straight from the row tuples.
+
+        Skips the intermediate sqlite3.Row object per row and the fetchall()
+        list that ``[dict(row) for row in cursor.fetchall()]`` creates.
+        """
+        cursor.row_factory = None
+        cursor.execute(query, params)
+        keys = [column[0] for column in cursor.description]
+        return [dict(zip(keys, row)) for row in cursor]
+
+    @staticmethod
+    def _iter_dicts(cursor: sqlite3.Cursor, query: str, params=()) -> Iterator[Dict[str, Any]]:
+        """Streaming form of _fetch_dicts, pulling FETCH_BATCH_SIZE rows at a time.
+
+        The iter_* methods hold their pooled reader until the generator is
+        exhausted or closed, so callers should not leave one half-consumed.
+        """
+        cursor.row_factory = None
+        cursor.execute(query, params)
+        keys = [column[0] for column in cursor.description]
+        while True:
+            batch = cursor.fetchmany(FETCH_BATCH_SIZE)
+            if not batch:
+                break
+            for row in batch:
+                yield dict(zip(keys, row))
+
     @staticmethod
     def _json_default(obj: Any) -> Any:
-        """JSON serializer for objects not serializable by default json code"""
+        """JSON serializer for objects not serializable by default json code.
+
+        Only json.dumps calls this: safe_json_dumps hands anything beyond
+        plain JSON types, datetimes and sets included, to json.dumps.
+        """
         if isinstance(obj, (datetime, date)):
             return obj.isoformat()
         if isinstance(obj, set):
@@ -485,50 +1022,94 @@ class CyberEventDataV2:
     # STATISTICS AND REPORTING
     # =========================================================================
 
+    def _write_generation(self) -> int:
+        """A value that changes whenever a write has been committed.
+
+        ``data_version`` moves whenever any other connection commits, which
+        from a connection that never writes means every commit, the store's
+        own writer included. It has its own lock so the check never waits
+        behind a long write transaction.
+        """
+        with self._version_lock:
+            if self._version_conn is None:
+                self._version_conn = self._open_connection(read_only=True)
+            return self._version_conn.execute("PRAGMA data_version").fetchone()[0]
+
     def get_summary_statistics(self) -> Dict[str, Any]:
         """Get comprehensive database statistics"""
         if not self._conn:
             raise ConnectionError("Database not connected")
 
-        with self._lock:
-            cursor = self._conn.cursor()
-
-            stats = {}
+        # Inside transaction() the writer sees uncommitted rows that a
+        # rollback would not bump data_version for, so never cache those
+        if self._in_transaction or self._transaction_thread == threading.get_ident():
+            return self._compute_summary_statistics()
 
-            # Raw events stats
-            cursor.execute("SELECT COUNT(*) as total FROM RawEvents")
-            stats['raw_events_total'] = cursor.fetchone()['total']
+        # The aggregates are only recomputed after a committed write
+        generation = self._write_generation()
+        cached = self._stats_cache
+        if cached is not None and cached[0] == generation:
+            return copy.deepcopy(cached[1])
 
-            cursor.execute("SELECT COUNT(*) as processed FROM RawEvents WHERE is_processed = TRUE")
-            stats['raw_events_processed'] = cursor.fetchone()['processed']
+        stats = self._compute_summary_statistics()
+        self._stats_cache = (generation, stats)
+        return copy.deepcopy(stats)
 
-            cursor.execute("SELECT source_type, COUNT(*) as count FROM RawEvents GROUP BY source_type")
-            stats['raw_events_by_source'] = {row['source_type']: row['count'] for row in cursor.fetchall()}
+    def _compute_summary_statistics(self) -> Dict[str, Any]:
+        """One grouped scan per table; totals are summed from the groups."""
+        with self._reader() as conn:
+            cursor = conn.cursor()
 
-            # Enriched events stats
-            cursor.execute("SELECT COUNT(*) as total FROM EnrichedEvents WHERE status = 'Active'")
-            stats['enriched_events_total'] = cursor.fetchone()['total']
-
-            cursor.execute("SELECT COUNT(*) as australian FROM EnrichedEvents WHERE is_australian_event = TRUE AND status = 'Active'")
-            stats['enriched_events_australian'] = cursor.fetchone()['australian']
+            stats = {}
 
-            cursor.execute("SELECT COUNT(*) as specific FROM EnrichedEvents WHERE is_specific_event = TRUE AND status = 'Active'")
-            stats['enriched_events_specific'] = cursor.fetchone()['specific']
+            # Raw events stats
+            cursor.execute("""
+                SELECT source_type, COUNT(*) as count,
+                       SUM(CASE WHEN is_processed = TRUE THEN 1 ELSE 0 END) as processed
+                FROM RawEvents
+                GROUP BY source_type
+            """)
+            by_source = {}
+            raw_total = raw_processed = 0
+            for row in cursor:
+                by_source[row['source_type']] = row['count']
+                raw_total += row['count']
+                raw_processed += row['processed']
+            stats['raw_events_total'] = raw_total
+            stats['raw_events_processed'] = raw_processed
+            stats['raw_events_by_source'] = by_source
 
+            # Enriched events stats
             cursor.execute("""
-                SELECT event_type, COUNT(*) as count
+                SELECT event_type, COUNT(*) as count,
+                       SUM(CASE WHEN is_australian_event = TRUE THEN 1 ELSE 0 END) as australian,
+                       SUM(CASE WHEN is_specific_event = TRUE THEN 1 ELSE 0 END) as specific
                 FROM EnrichedEvents
-                WHERE status = 'Active' AND event_type IS NOT NULL
+                WHERE status = 'Active'
                 GROUP BY event_type
             """)
-            stats['events_by_type'] = {row['event_type']: row['count'] for row in cursor.fetchall()}
+            by_type = {}
+            enriched_total = enriched_australian = enriched_specific = 0
+            for row in cursor:
+                if row['event_type'] is not None:
+                    by_type[row['event_type']] = row['count']
+                enriched_total += row['count']
+                enriched_australian += row['australian']
+                enriched_specific += row['specific']
+            stats['enriched_events_total'] = enriched_total
+            stats['enriched_events_australian'] = enriched_australian
+            stats['enriched_events_specific'] = enriched_specific
+            stats['events_by_type'] = by_type
 
             # Entity stats
-            cursor.execute("SELECT COUNT(*) as total FROM EntitiesV2")
-            stats['entities_total'] = cursor.fetchone()['total']
-
-            cursor.execute("SELECT COUNT(*) as australian FROM EntitiesV2 WHERE is_australian = TRUE")
-            stats['entities_australian'] = cursor.fetchone()['australian']
+            cursor.execute("""
+                SELECT COUNT(*) as total,
+                       COALESCE(SUM(CASE WHEN is_australian = TRUE THEN 1 ELSE 0 END), 0) as australian
+                FROM EntitiesV2
+            """)
+            row = cursor.fetchone()
+            stats['entities_total'] = row['total']
+            stats['entities_australian'] = row['australian']
 
             # Processing stats
             cursor.execute("""
@@ -537,7 +1118,7 @@ class CyberEventDataV2:
                 GROUP BY processing_stage, status
             """)
             processing_stats = {}
-            for row in cursor.fetchall():
+            for row in cursor:
                 stage = row['processing_stage']
                 if stage not in processing_stats:
                     processing_stats[stage] = {}
@@ -551,43 +1132,38 @@ class CyberEventDataV2:
         if not self._conn:
             raise ConnectionError("Database not connected")
 
-        with self._lock:
-            cursor = self._conn.cursor()
-
-            # Count events ready for different processing stages
-            cursor.execute("SELECT COUNT(*) as count FROM RawEvents WHERE is_processed = FALSE")
-            unprocessed = cursor.fetchone()['count']
-
-            cursor.execute("""
-                SELECT COUNT(*) as count FROM RawEvents re
-                WHERE re.is_processed = FALSE
-                    AND re.source_url IS NOT NULL
-                    AND NOT EXISTS (
-                        SELECT 1 FROM ProcessingLog pl
-                        WHERE pl.raw_event_id = re.raw_event_id
-                            AND pl.processing_stage = 'url_scraping'
-                            AND pl.status = 'success'
-                    )
-            """)
-            needs_scraping = cursor.fetchone()['count']
+        with self._reader() as conn:
+            cursor = conn.cursor()
 
+            # One pass over the unprocessed events (partial index) with two
+            # index probes each, rather than three separate scans. Grouping
+            # the whole ProcessingLog would also read every processed event's log
             cursor.execute("""
-                SELECT COUNT(*) as count FROM RawEvents re
-                WHERE re.is_processed = FALSE
-                    AND EXISTS (
-                        SELECT 1 FROM ProcessingLog pl
-                        WHERE pl.raw_event_id = re.raw_event_id
-                            AND pl.processing_stage = 'url_scraping'
-                            AND pl.status = 'success'
-                    )
-                    AND NOT EXISTS (
-                        SELECT 1 FROM ProcessingLog pl2
-                        WHERE pl2.raw_event_id = re.raw_event_id
-                            AND pl2.processing_stage = 'llm_analysis'
-                            AND pl2.status = 'success'
-                    )
+                WITH queue AS (
+                    SELECT
+                        re.source_url IS NOT NULL AS has_url,
+                        EXISTS (
+                            SELECT 1 FROM ProcessingLog pl
+                            WHERE pl.raw_event_id = re.raw_event_id
+                                AND pl.processing_stage = 'url_scraping'
+                                AND pl.status = 'success'
+                        ) AS scraped,
+                        EXISTS (
+                            SELECT 1 FROM ProcessingLog pl
+                            WHERE pl.raw_event_id = re.raw_event_id
+                                AND pl.processing_stage = 'llm_analysis'
+                                AND pl.status = 'success'
+                        ) AS analyzed
+                    FROM RawEvents re
+                    WHERE re.is_processed = FALSE
+                )
+                SELECT
+                    COUNT(*) AS unprocessed,
+                    COALESCE(SUM(has_url AND NOT scraped), 0) AS needs_scraping,
+                    COALESCE(SUM(scraped AND NOT analyzed), 0) AS needs_analysis
+                FROM queue
             """)
-            needs_analysis = cursor.fetchone()['count']
+            unprocessed, needs_scraping, needs_analysis = cursor.fetchone()
 
             return {
                 'unprocessed_total': unprocessed,
@@ -605,12 +1181,9 @@ class CyberEventDataV2:
         if not self._conn:
             raise ConnectionError("Database not connected")
 
-        with self._lock:
-            cursor = self._conn.cursor()
-            cursor.execute("""
-                SELECT is_processed FROM MonthProcessed
-                WHERE year = ? AND month = ?
-            """, (year, month))
+        with self._reader() as conn:
+            cursor = conn.cursor()
+            cursor.execute(_SQL_IS_MONTH_PROCESSED, (year, month))
             result = cursor.fetchone()
             return result['is_processed'] if result else False
 
@@ -632,11 +1205,11 @@ class CyberEventDataV2:
                     VALUES (?, ?, TRUE, ?, ?, ?, ?)
                 """, (year, month, datetime.now().isoformat(),
                      total_raw_events, total_enriched_events, processing_notes))
-                self._conn.commit()
+                self._commit()
                 return True
             except sqlite3.Error as e:
                 self._logger.error("Error marking month as processed: %s", e)
-                self._conn.rollback()
+                self._rollback()
                 return False
 
     def get_unprocessed_months(self, start_year: int = 2020, start_month: int = 1,
@@ -656,28 +1229,25 @@ class CyberEventDataV2:
                 current_month = 1
                 current_year += 1
 
-        # Check which ones are processed
-        unprocessed = []
-        with self._lock:
-            cursor = self._conn.cursor()
-            for year, month in all_months:
-                cursor.execute("""
-                    SELECT is_processed FROM MonthProcessed
-                    WHERE year = ? AND month = ?
-                """, (year, month))
-                result = cursor.fetchone()
-                if not result or not result['is_processed']:
-                    unprocessed.append((year, month))
+        # One query for every processed month in range, rather than one per month
+        with self._reader() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT year, month FROM MonthProcessed
+                WHERE is_processed = TRUE
+                    AND (year, month) >= (?, ?) AND (year, month) <= (?, ?)
+            """, (start_year, start_month, end_year, end_month))
+            processed = {(row['year'], row['month']) for row in cursor}
 
-        return unprocessed
+        return [month for month in all_months if month not in processed]
 
     def get_month_processing_stats(self) -> Dict[str, Any]:
         """Get statistics about month processing"""
         if not self._conn:
             raise ConnectionError("Database not connected")
 
-        with self._lock:
-            cursor = self._conn.cursor()
+        with self._reader() as conn:
+            cursor = conn.cursor()
 
             # Count processed months
             cursor.execute("SELECT COUNT(*) as count FROM MonthProcessed WHERE is_processed = TRUE")
@@ -687,7 +1257,7 @@ class CyberEventDataV2:
             total_months = ((2025 - 2020) * 12) + 8 - 1 + 1  # 68 months total
 
             # Get processing stats by year
-            cursor.execute("""
+            by_year = self._fetch_dicts(cursor, """
                 SELECT year, COUNT(*) as processed_months,
                        SUM(total_raw_events) as total_raw,
                        SUM(total_enriched_events) as total_enriched
@@ -696,7 +1266,6 @@ class CyberEventDataV2:
                 GROUP BY year
                 ORDER BY year
             """)
-            by_year = [dict(row) for row in cursor.fetchall()]
 
             return {
                 'processed_months': processed_count,
@@ -716,11 +1285,25 @@ class CyberEventDataV2:
         return self._conn
 
     def close(self):
-        """Close database connection"""
+        """Close the writer and every pooled reader connection"""
         if self._conn:
             with self._lock:
+                try:
+                    # Refreshes statistics only for tables whose shape has drifted
+                    self._conn.execute("PRAGMA optimize")
+                except sqlite3.Error as e:
+                    self._logger.warning("PRAGMA optimize failed: %s", e)
                 self._conn.close()
                 self._conn = None
+        with self._version_lock:
+            if self._version_conn is not None:
+                self._version_conn.close()
+                self._version_conn = None
+        while True:
+            try:
+                self._readers.get_nowait().close()
+            except queue.Empty:
+                break
 
     def __enter__(self):
         return self
@@ -20,8 +20,9 @@ class DatabaseManager:
     def save_events(self, events: Iterable[CyberEvent]) -> None:
         """Persist events to the configured database."""
 
-        saved = 0
         skipped = 0
+        pending = []
+        pending_keys = set()
 
         for event in events:
             try:
@@ -31,10 +32,11 @@ class DatabaseManager:
                 raw_title = event.title
 
                 if source_url:
-                    existing = self._db.find_existing_raw_event(source_type, source_url, raw_title)
-                    if existing:
+                    key = (source_type, source_url, raw_title)
+                    if key in pending_keys or self._db.find_existing_raw_event(*key):
                         skipped += 1
                         continue
+                    pending_keys.add(key)
 
                 raw_data = {
                     "source_event_id": event.event_id,
@@ -46,12 +48,26 @@ class DatabaseManager:
                     "metadata": event.model_dump(mode="json"),
                 }
 
-                self._db.add_raw_event(source_type, raw_data)
-                saved += 1
+                pending.append((source_type, raw_data))
             except Exception as e:
                 self.logger.error("Failed to save event '%s': %s", getattr(event, "title", "unknown"), e)
                 skipped += 1
 
+        saved = 0
+        if pending:
+            try:
+                saved = len(self._db.add_raw_events_bulk(pending))
+            except Exception as e:
+                # One bad row fails the whole batch; retry row by row so the rest are kept
+                self.logger.warning("Bulk save of %s events failed (%s), saving individually", len(pending), e)
+                for source_type, raw_data in pending:
+                    try:
+                        self._db.add_raw_event(source_type, raw_data)
+                        saved += 1
+                    except Exception as row_error:
+                        self.logger.error("Failed to save event '%s': %s", raw_data.get("title", "unknown"), row_error)
+                        skipped += 1
+
         self.logger.info(
             "Saved %s events to database (skipped %s duplicates) at %s",
             saved,
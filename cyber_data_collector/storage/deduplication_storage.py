@@ -10,14 +10,16 @@ This module handles all database operations for the new deduplication system:
 
 from __future__ import annotations
 
+import hashlib
 import logging
+import math
+import os
 import sqlite3
 import threading
 import uuid
 from dataclasses import dataclass
 from typing import List, Dict, Optional, Tuple, Any
 from datetime import datetime
-import json
 
 from ..processing.deduplication_v2 import DeduplicationResult, MergeGroup, ValidationError
 # Import the simplified CyberEvent from deduplication_v2
@@ -26,6 +28,39 @@ from ..utils.validation import llm_validate_records_affected
 
 logger = logging.getLogger(__name__)
 
+# Batches at or above this size run the pre-store duplicate pass through a
+# Bloom filter first, so the exact key set only has to hold the (rare) keys
+# the filter flags as possibly seen, not every title in the batch.
+BLOOM_PRECHECK_MIN_EVENTS = 1_000_000
+BLOOM_PRECHECK_ERROR_RATE = 1e-4
+
+
+class _BloomFilter:
+    """Fixed-size Bloom filter over string keys (no false negatives)."""
+
+    def __init__(self, capacity: int, error_rate: float):
+        capacity = max(capacity, 1)
+        self.num_bits = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self._bits = bytearray((self.num_bits + 7) // 8)
+
+    def _positions(self, key: str):
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % self.num_bits
+
+    def add(self, key: str) -> bool:
+        """Add *key*; return True if it was possibly present already."""
+        seen = True
+        for pos in self._positions(key):
+            byte, mask = pos >> 3, 1 << (pos & 7)
+            if not self._bits[byte] & mask:
+                seen = False
+                self._bits[byte] |= mask
+        return seen
+
 
 @dataclass(frozen=True)
 class StorageResult:
@@ -241,6 +276,10 @@ class DeduplicationStorage:
     def _remove_duplicate_events(self, events: List[CyberEvent]) -> tuple:
         """Remove duplicate events (same title+date), keeping first occurrence.
 
+        Very large batches (``BLOOM_PRECHECK_MIN_EVENTS`` and up) are first
+        screened with a Bloom filter; only keys it flags as possibly repeated
+        are tracked exactly, so results are identical to the plain set path.
+
         Returns:
             tuple: (unique_events, skipped_duplicates) where skipped_duplicates is a list of dicts
         """
@@ -248,8 +287,22 @@ class DeduplicationStorage:
         skipped_duplicates = []
         seen_combinations = set()
 
+        def dedup_key(event: CyberEvent) -> tuple:
+            return (event.title.lower().strip(), event.event_date)
+
+        candidates = None
+        if len(events) >= BLOOM_PRECHECK_MIN_EVENTS:
+            bloom = _BloomFilter(len(events), BLOOM_PRECHECK_ERROR_RATE)
+            candidates = {
+                key for key in map(dedup_key, events)
+                if bloom.add(f"{key[0]}\x1f{key[1]}")
+            }
+
         for event in events:
-            key = (event.title.lower().strip(), event.event_date)
+            key = dedup_key(event)
+            if candidates is not None and key not in candidates:
+                unique_events.append(event)
+                continue
             if key in seen_combinations:
                 skipped_duplicates.append({
                     "title": event.title,
@@ -273,8 +326,12 @@ class DeduplicationStorage:
             ``deduplicated_event_id`` foreign key resolves to a real
             DeduplicatedEvents row.
         """
-        stored_count = 0
         dedup_id_by_event: Dict[str, str] = {}
+        # One timestamp per batch: every row in a storage pass shares it, and
+        # it saves a clock read + datetime allocation per column per row.
+        now = datetime.now()
+        perplexity_api_key = os.getenv('PERPLEXITY_API_KEY')
+        event_rows = []
 
         for event in events:
             # Generate unique deduplicated event ID
@@ -282,13 +339,12 @@ class DeduplicationStorage:
             dedup_id_by_event[event.event_id] = deduplicated_event_id
             
             # Validate records_affected with LLM fallback for uncertain cases
-            import os
             validated_records, _ = llm_validate_records_affected(
                 event.records_affected,
                 event.title,
                 org_name=event.victim_organization_name,
                 description=event.description or event.summary,
-                perplexity_api_key=os.getenv('PERPLEXITY_API_KEY'),
+                perplexity_api_key=perplexity_api_key,
             )
             if validated_records != event.records_affected and event.records_affected is not None:
                 # INFO: validator-side adjustment during persistence. Same
@@ -299,69 +355,49 @@ class DeduplicationStorage:
                     f"{validated_records if validated_records else 'NULL'} for: {event.title[:60]}"
                 )
 
-            # Prepare event data (match DeduplicatedEvents schema)
-            event_data = {
-                'deduplicated_event_id': deduplicated_event_id,
-                'master_enriched_event_id': event.event_id,  # Link back to source event
-                'title': event.title,
-                'summary': event.summary,
-                'event_date': event.event_date,
-                'event_type': event.event_type,
-                'severity': event.severity,
-                'records_affected': validated_records,  # Use validated value
-                'victim_organization_name': event.victim_organization_name if hasattr(event, 'victim_organization_name') else None,
-                'victim_organization_industry': event.victim_organization_industry if hasattr(event, 'victim_organization_industry') else None,
-                'is_australian_event': True,  # All events are Australian
-                'is_specific_event': True,  # Deduplicated events are specific
-                'confidence_score': event.confidence if hasattr(event, 'confidence') else 0.5,
-                'status': 'Active',
-                'created_at': datetime.now(),
-                'updated_at': datetime.now()
-            }
-
-            # Insert event
-            cursor.execute("""
-                INSERT INTO DeduplicatedEvents (
-                    deduplicated_event_id, master_enriched_event_id, title, summary,
-                    event_date, event_type, severity, records_affected,
-                    victim_organization_name, victim_organization_industry,
-                    is_australian_event, is_specific_event, confidence_score,
-                    status, created_at, updated_at
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                event_data['deduplicated_event_id'],
-                event_data['master_enriched_event_id'],
-                event_data['title'],
-                event_data['summary'],
-                event_data['event_date'],
-                event_data['event_type'],
-                event_data['severity'],
-                event_data['records_affected'],
-                event_data['victim_organization_name'],
-                event_data['victim_organization_industry'],
-                event_data['is_australian_event'],
-                event_data['is_specific_event'],
-                event_data['confidence_score'],
-                event_data['status'],
-                event_data['created_at'],
-                event_data['updated_at']
+            # Row in DeduplicatedEvents column order (see INSERT below)
+            event_rows.append((
+                deduplicated_event_id,
+                event.event_id,  # master_enriched_event_id: link back to source event
+                event.title,
+                event.summary,
+                event.event_date,
+                event.event_type,
+                event.severity,
+                validated_records,  # Use validated value
+                event.victim_organization_name if hasattr(event, 'victim_organization_name') else None,
+                event.victim_organization_industry if hasattr(event, 'victim_organization_industry') else None,
+                True,  # is_australian_event: all events are Australian
+                True,  # is_specific_event: deduplicated events are specific
+                event.confidence if hasattr(event, 'confidence') else 0.5,
+                'Active',
+                now,
+                now,
             ))
 
-            # Record the master's own lineage and provenance.
-            #
-            # Previously neither was written here: singleton events got no
-            # EventDeduplicationMap row at all and merge groups omitted their
-            # master, so only 384 of 1,034 events had traceable lineage and
-            # DeduplicatedEventSources was completely empty. Because dedup ids
-            # are regenerated on every rebuild, that provenance could not be
-            # recovered afterwards without this backfill-equivalent step.
-            self._store_master_lineage(
-                cursor, deduplicated_event_id, event.event_id
-            )
-
-            stored_count += 1
+        # One executemany per table instead of a statement per row; all of it
+        # sits inside the caller's single transaction.
+        cursor.executemany("""
+            INSERT INTO DeduplicatedEvents (
+                deduplicated_event_id, master_enriched_event_id, title, summary,
+                event_date, event_type, severity, records_affected,
+                victim_organization_name, victim_organization_industry,
+                is_australian_event, is_specific_event, confidence_score,
+                status, created_at, updated_at
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, event_rows)
+
+        # Record each master's own lineage and provenance.
+        #
+        # Previously neither was written here: singleton events got no
+        # EventDeduplicationMap row at all and merge groups omitted their
+        # master, so only 384 of 1,034 events had traceable lineage and
+        # DeduplicatedEventSources was completely empty. Because dedup ids
+        # are regenerated on every rebuild, that provenance could not be
+        # recovered afterwards without this backfill-equivalent step.
+        self._store_master_lineage(cursor, dedup_id_by_event, now)
 
-        return stored_count, dedup_id_by_event
+        return len(event_rows), dedup_id_by_event
 
     def _provenance_columns_available(self, cursor: sqlite3.Cursor) -> bool:
         """Whether RawEvents carries the columns needed to record provenance.
@@ -382,48 +418,55 @@ class DeduplicationStorage:
         return self._provenance_ok
 
     def _store_master_lineage(
-        self, cursor: sqlite3.Cursor, deduplicated_event_id: str,
-        master_enriched_event_id: str,
+        self, cursor: sqlite3.Cursor, dedup_id_by_event: Dict[str, str],
+        now: datetime,
     ) -> None:
-        """Write the master lineage row plus its source provenance."""
-        raw_event_id = self._resolve_raw_event_id(cursor, master_enriched_event_id)
-        if raw_event_id is None:
-            self.logger.debug(
-                "No RawEvents row for master %s; lineage row skipped",
-                master_enriched_event_id,
-            )
-            return
+        """Write master lineage rows plus their source provenance."""
+        raw_ids = self._resolve_raw_event_ids(cursor, list(dedup_id_by_event))
+        map_rows = []
+        source_pairs = []
+        for master_enriched_event_id, deduplicated_event_id in dedup_id_by_event.items():
+            raw_event_id = raw_ids.get(master_enriched_event_id)
+            if raw_event_id is None:
+                self.logger.debug(
+                    "No RawEvents row for master %s; lineage row skipped",
+                    master_enriched_event_id,
+                )
+                continue
+            map_rows.append((str(uuid.uuid4()), raw_event_id, master_enriched_event_id,
+                             deduplicated_event_id))
+            source_pairs.append((deduplicated_event_id, raw_event_id))
 
-        cursor.execute("""
+        cursor.executemany("""
             INSERT OR IGNORE INTO EventDeduplicationMap (
                 map_id, raw_event_id, enriched_event_id, deduplicated_event_id,
                 contribution_type, similarity_score, data_source_weight
             ) VALUES (?, ?, ?, ?, 'master', 1.0, 1.0)
-        """, (str(uuid.uuid4()), raw_event_id, master_enriched_event_id,
-              deduplicated_event_id))
+        """, map_rows)
 
-        self._store_source_row(cursor, deduplicated_event_id, raw_event_id)
+        self._store_source_rows(cursor, source_pairs, now)
 
-    def _store_source_row(
-        self, cursor: sqlite3.Cursor, deduplicated_event_id: str, raw_event_id: str
+    def _store_source_rows(
+        self, cursor: sqlite3.Cursor, pairs: List[Tuple[str, str]], now: datetime,
     ) -> None:
-        """Record one contributing source URL for a deduplicated event."""
-        if not self._provenance_columns_available(cursor):
+        """Record the contributing source URL for each (dedup id, raw id) pair.
+
+        The RawEvents lookup happens inside the INSERT ... SELECT, so a batch
+        is one executemany; raw events without a source URL insert nothing.
+        """
+        if not pairs or not self._provenance_columns_available(cursor):
             return
-        row = cursor.execute(
-            "SELECT source_url, source_type, discovered_at, "
-            "substr(COALESCE(raw_description, raw_content, ''), 1, 400) "
-            "FROM RawEvents WHERE raw_event_id = ?",
-            (raw_event_id,),
-        ).fetchone()
-        if row and row[0]:
-            cursor.execute("""
-                INSERT OR IGNORE INTO DeduplicatedEventSources (
-                    deduplicated_event_id, source_url, source_type,
-                    credibility_score, content_snippet, discovered_at
-                ) VALUES (?, ?, ?, ?, ?, ?)
-            """, (deduplicated_event_id, row[0], row[1], None, row[3],
-                  row[2] or datetime.now()))
+        cursor.executemany("""
+            INSERT OR IGNORE INTO DeduplicatedEventSources (
+                deduplicated_event_id, source_url, source_type,
+                credibility_score, content_snippet, discovered_at
+            )
+            SELECT ?, source_url, source_type, NULL,
+                   substr(COALESCE(raw_description, raw_content, ''), 1, 400),
+                   COALESCE(NULLIF(discovered_at, ''), ?)
+            FROM RawEvents
+            WHERE raw_event_id = ? AND source_url IS NOT NULL AND source_url != ''
+        """, [(dedup_id, now, raw_id) for dedup_id, raw_id in pairs])
 
     def _store_merge_groups(
         self,
@@ -441,7 +484,19 @@ class DeduplicationStorage:
                 Used so lineage rows reference an existing DeduplicatedEvents
                 row and satisfy the foreign key constraint.
         """
-        stored_count = 0
+        now = datetime.now()
+        cluster_rows = []
+        map_rows = []
+        source_pairs = []
+
+        # CyberEvent.event_id is an EnrichedEvents.enriched_event_id.
+        # EventDeduplicationMap.raw_event_id has a FK to RawEvents, so
+        # we must resolve the real raw_event_id rather than store the
+        # enriched id there (which caused FOREIGN KEY constraint failed).
+        raw_ids = self._resolve_raw_event_ids(cursor, [
+            merged_event.event_id
+            for group in merge_groups for merged_event in group.merged_events
+        ])
 
         for group in merge_groups:
             # Skip groups with no merges (single events)
@@ -461,17 +516,10 @@ class DeduplicationStorage:
                 continue
 
             # Create cluster record (match actual schema)
-            cluster_id = str(uuid.uuid4())
             cluster_size = len(group.merged_events) + 1  # Include master event
             avg_similarity = sum(group.similarity_scores.values()) / len(group.similarity_scores) if group.similarity_scores else 1.0
-
-            cursor.execute("""
-                INSERT INTO DeduplicationClusters (
-                    cluster_id, deduplicated_event_id, cluster_size,
-                    average_similarity, deduplication_timestamp, algorithm_version
-                ) VALUES (?, ?, ?, ?, ?, ?)
-            """, (
-                cluster_id,
+            cluster_rows.append((
+                str(uuid.uuid4()),
                 dedup_event_id,
                 cluster_size,
                 avg_similarity,
@@ -481,11 +529,7 @@ class DeduplicationStorage:
 
             # Create mapping records for each merged event
             for merged_event in group.merged_events:
-                # CyberEvent.event_id is an EnrichedEvents.enriched_event_id.
-                # EventDeduplicationMap.raw_event_id has a FK to RawEvents, so
-                # we must resolve the real raw_event_id rather than store the
-                # enriched id there (which caused FOREIGN KEY constraint failed).
-                raw_event_id = self._resolve_raw_event_id(cursor, merged_event.event_id)
+                raw_event_id = raw_ids.get(merged_event.event_id)
                 if raw_event_id is None:
                     self.logger.warning(
                         "Skipping lineage row: no RawEvents row found for enriched "
@@ -494,32 +538,36 @@ class DeduplicationStorage:
                     )
                     continue
 
-                similarity_score = group.similarity_scores.get(merged_event.event_id, 0.0)
-                map_id = str(uuid.uuid4())
-
-                cursor.execute("""
-                    INSERT OR IGNORE INTO EventDeduplicationMap (
-                        map_id, raw_event_id, enriched_event_id, deduplicated_event_id,
-                        contribution_type, similarity_score, data_source_weight
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    map_id,
+                map_rows.append((
+                    str(uuid.uuid4()),
                     raw_event_id,  # Real RawEvents.raw_event_id (FK target)
                     merged_event.event_id,  # EnrichedEvents.enriched_event_id (FK target)
                     dedup_event_id,  # DeduplicatedEvents.deduplicated_event_id (FK target)
                     'merged',  # This is a merged duplicate
-                    similarity_score,
+                    group.similarity_scores.get(merged_event.event_id, 0.0),
                     1.0  # Default weight
                 ))
 
                 # Each merged member contributes its own source URL; without
                 # this the multi-source corroboration a merge represents is
                 # invisible downstream.
-                self._store_source_row(cursor, dedup_event_id, raw_event_id)
-
-            stored_count += 1
+                source_pairs.append((dedup_event_id, raw_event_id))
+
+        cursor.executemany("""
+            INSERT INTO DeduplicationClusters (
+                cluster_id, deduplicated_event_id, cluster_size,
+                average_similarity, deduplication_timestamp, algorithm_version
+            ) VALUES (?, ?, ?, ?, ?, ?)
+        """, cluster_rows)
+        cursor.executemany("""
+            INSERT OR IGNORE INTO EventDeduplicationMap (
+                map_id, raw_event_id, enriched_event_id, deduplicated_event_id,
+                contribution_type, similarity_score, data_source_weight
+            ) VALUES (?, ?, ?, ?, ?, ?, ?)
+        """, map_rows)
+        self._store_source_rows(cursor, source_pairs, now)
 
-        return stored_count
+        return len(cluster_rows)
 
     def _refresh_source_counts(self, cursor: sqlite3.Cursor) -> int:
         """Set total_data_sources from real membership for every event.
@@ -554,28 +602,39 @@ class DeduplicationStorage:
         """)
         return cursor.rowcount
 
-    def _resolve_raw_event_id(
-        self, cursor: sqlite3.Cursor, enriched_event_id: str
-    ) -> Optional[str]:
-        """Resolve an enriched_event_id to its source RawEvents.raw_event_id.
+    # Stay well under SQLite's bound-parameter limit (999 on older builds).
+    _RESOLVE_CHUNK_SIZE = 500
+
+    def _resolve_raw_event_ids(
+        self, cursor: sqlite3.Cursor, enriched_event_ids: List[str]
+    ) -> Dict[str, str]:
+        """Resolve enriched_event_ids to their source RawEvents.raw_event_id.
 
-        Returns None if the EnrichedEvents row (or its raw event) cannot be
-        found, so callers can skip the lineage row instead of violating the
-        foreign key.
+        Looks ids up in chunked ``IN (...)`` queries rather than one SELECT
+        per event. Ids with no EnrichedEvents row are absent from the result,
+        so callers can skip the lineage row instead of violating the foreign
+        key.
         """
+        resolved: Dict[str, str] = {}
+        ids = list(dict.fromkeys(enriched_event_ids))
         try:
-            cursor.execute(
-                "SELECT raw_event_id FROM EnrichedEvents WHERE enriched_event_id = ?",
-                (enriched_event_id,),
-            )
-            row = cursor.fetchone()
-            return row[0] if row else None
+            for start in range(0, len(ids), self._RESOLVE_CHUNK_SIZE):
+                chunk = ids[start:start + self._RESOLVE_CHUNK_SIZE]
+                cursor.execute(
+                    "SELECT enriched_event_id, raw_event_id FROM EnrichedEvents "
+                    f"WHERE enriched_event_id IN ({','.join('?' * len(chunk))})",
+                    chunk,
+                )
+                resolved.update(
+                    (enriched_id, raw_id) for enriched_id, raw_id in cursor.fetchall()
+                    if raw_id is not None
+                )
         except sqlite3.Error as exc:
             self.logger.warning(
-                "Failed to resolve raw_event_id for enriched event %s: %s",
-                enriched_event_id, exc,
+                "Failed to resolve raw_event_ids for %d enriched events: %s",
+                len(ids), exc,
             )
-            return None
+        return resolved
     
     def validate_storage_integrity(self) -> List[ValidationError]:
         """Check database for duplicate deduplicated_event_ids and other integrity issues"""
@@ -637,37 +696,31 @@ class DeduplicationStorage:
                 context={"master_enriched_event_id": master_id, "count": count}
             ))
         
-        # Check for orphaned mapping records (only if table exists)
-        if 'EventDeduplicationMap' in existing_tables:
-            cursor.execute("""
-                SELECT COUNT(*) FROM EventDeduplicationMap edm
-                LEFT JOIN DeduplicatedEvents de ON edm.deduplicated_event_id = de.deduplicated_event_id
-                WHERE de.deduplicated_event_id IS NULL
-            """)
-            orphaned_mappings = cursor.fetchone()[0]
-
-            if orphaned_mappings > 0:
-                errors.append(ValidationError(
-                    error_type="ORPHANED_MAPPINGS",
-                    message=f"Found {orphaned_mappings} orphaned mapping records",
-                    context={"orphaned_count": orphaned_mappings}
-                ))
-        
-        # Check for orphaned cluster records (only if table exists)
-        if 'DeduplicationClusters' in existing_tables:
-            cursor.execute("""
-                SELECT COUNT(*) FROM DeduplicationClusters dc
-                LEFT JOIN DeduplicatedEvents de ON dc.deduplicated_event_id = de.deduplicated_event_id
-                WHERE de.deduplicated_event_id IS NULL
-            """)
-            orphaned_clusters = cursor.fetchone()[0]
-
-            if orphaned_clusters > 0:
-                errors.append(ValidationError(
-                    error_type="ORPHANED_CLUSTERS",
-                    message=f"Found {orphaned_clusters} orphaned cluster records",
-                    context={"orphaned_count": orphaned_clusters}
-                ))
+        # Orphaned lineage/cluster rows, counted in one anti-join statement
+        # (only for the tables that exist).
+        orphan_checks = [
+            (table, error_type, label)
+            for table, error_type, label in (
+                ('EventDeduplicationMap', 'ORPHANED_MAPPINGS', 'mapping'),
+                ('DeduplicationClusters', 'ORPHANED_CLUSTERS', 'cluster'),
+            )
+            if table in existing_tables
+        ]
+        if orphan_checks:
+            cursor.execute("SELECT " + ", ".join(
+                f"""(SELECT COUNT(*) FROM {table} t
+                     WHERE NOT EXISTS (
+                         SELECT 1 FROM DeduplicatedEvents de
+                         WHERE de.deduplicated_event_id = t.deduplicated_event_id))"""
+                for table, _, _ in orphan_checks
+            ))
+            for (_, error_type, label), orphaned in zip(orphan_checks, cursor.fetchone()):
+                if orphaned > 0:
+                    errors.append(ValidationError(
+                        error_type=error_type,
+                        message=f"Found {orphaned} orphaned {label} records",
+                        context={"orphaned_count": orphaned}
+                    ))
         
         self.logger.info(f"Storage integrity check: {len(errors)} issues found")
         return errors
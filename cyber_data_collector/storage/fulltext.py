@@ -0,0 +1,129 @@
+"""Full-text index over raw event titles and descriptions.
+
+``RawEvents_fts`` is a contentless FTS5 table: it stores only the token
+index, never the text. FTS5 rows need an integer key, and RawEvents is keyed
+on a TEXT ``raw_event_id``, so ``RawEventsFtsKeys`` gives every raw event an
+INTEGER PRIMARY KEY of its own. Unlike RawEvents' implicit rowid, that key is
+a declared column and survives VACUUM, so the index never has to be rebuilt
+to stay in step with the table it covers.
+
+Triggers on RawEvents keep both tables current, so every writer, including
+other tools sharing the database, maintains the index. Searches join back
+through the key table::
+
+    SELECT k.raw_event_id FROM RawEvents_fts f
+    JOIN RawEventsFtsKeys k ON k.fts_rowid = f.rowid
+    WHERE RawEvents_fts MATCH 'australia*'
+
+``migrate`` creates all of this and indexes existing rows. It is idempotent,
+and replaces the earlier external-content table that was keyed on the
+implicit rowid.
+"""
+
+from __future__ import annotations
+
+import logging
+import sqlite3
+from pathlib import Path
+from typing import Union
+
+logger = logging.getLogger(__name__)
+
+FTS_TABLE = "RawEvents_fts"
+KEY_TABLE = "RawEventsFtsKeys"
+
+# Clears any earlier build, including the rowid-keyed external-content version
+_DROP = """
+    DROP TRIGGER IF EXISTS RawEvents_fts_ai;
+    DROP TRIGGER IF EXISTS RawEvents_fts_ad;
+    DROP TRIGGER IF EXISTS RawEvents_fts_au;
+    DROP TABLE IF EXISTS RawEvents_fts;
+    DROP TABLE IF EXISTS RawEventsFtsKeys;
+"""
+
+_DDL = """
+    CREATE TABLE IF NOT EXISTS RawEventsFtsKeys (
+        fts_rowid INTEGER PRIMARY KEY,
+        raw_event_id TEXT NOT NULL UNIQUE
+    );
+    CREATE VIRTUAL TABLE IF NOT EXISTS RawEvents_fts USING fts5(
+        raw_title, raw_description,
+        content='',
+        tokenize='unicode61 remove_diacritics 2'
+    );
+    CREATE TRIGGER IF NOT EXISTS RawEvents_fts_ai AFTER INSERT ON RawEvents BEGIN
+        INSERT INTO RawEventsFtsKeys(raw_event_id) VALUES (new.raw_event_id);
+        INSERT INTO RawEvents_fts(rowid, raw_title, raw_description)
+        SELECT fts_rowid, new.raw_title, new.raw_description
+        FROM RawEventsFtsKeys WHERE raw_event_id = new.raw_event_id;
+    END;
+    CREATE TRIGGER IF NOT EXISTS RawEvents_fts_ad AFTER DELETE ON RawEvents BEGIN
+        -- A contentless table can only forget a row given the values it indexed
+        INSERT INTO RawEvents_fts(RawEvents_fts, rowid, raw_title, raw_description)
+        SELECT 'delete', fts_rowid, old.raw_title, old.raw_description
+        FROM RawEventsFtsKeys WHERE raw_event_id = old.raw_event_id;
+        DELETE FROM RawEventsFtsKeys WHERE raw_event_id = old.raw_event_id;
+    END;
+    CREATE TRIGGER IF NOT EXISTS RawEvents_fts_au
+    AFTER UPDATE OF raw_title, raw_description ON RawEvents BEGIN
+        INSERT INTO RawEvents_fts(RawEvents_fts, rowid, raw_title, raw_description)
+        SELECT 'delete', fts_rowid, old.raw_title, old.raw_description
+        FROM RawEventsFtsKeys WHERE raw_event_id = old.raw_event_id;
+        INSERT INTO RawEvents_fts(rowid, raw_title, raw_description)
+        SELECT fts_rowid, new.raw_title, new.raw_description
+        FROM RawEventsFtsKeys WHERE raw_event_id = new.raw_event_id;
+    END;
+"""
+
+# Contentless tables cannot 'rebuild'; existing rows are indexed explicitly
+_BACKFILL = """
+    INSERT INTO RawEventsFtsKeys(raw_event_id) SELECT raw_event_id FROM RawEvents;
+    INSERT INTO RawEvents_fts(rowid, raw_title, raw_description)
+    SELECT k.fts_rowid, r.raw_title, r.raw_description
+    FROM RawEvents r JOIN RawEventsFtsKeys k ON k.raw_event_id = r.raw_event_id;
+"""
+
+
+def _tables(conn: sqlite3.Connection) -> set:
+    return {r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+
+
+def is_installed(conn: sqlite3.Connection) -> bool:
+    """Whether ``migrate`` has been applied to this database."""
+    return {FTS_TABLE, KEY_TABLE} <= _tables(conn)
+
+
+def migrate(db: Union[str, Path, sqlite3.Connection]) -> bool:
+    """Create the full-text index and index existing raw events. Safe to run repeatedly.
+
+    Args:
+        db: Database path or an open connection. When a path is given the
+            connection is opened and closed here.
+
+    Returns:
+        False if RawEvents does not exist yet or this SQLite build has no
+        FTS5; callers then fall back to LIKE scans.
+    """
+    owns_connection = not isinstance(db, sqlite3.Connection)
+    conn = sqlite3.connect(str(db)) if owns_connection else db
+
+    try:
+        tables = _tables(conn)
+        if "RawEvents" not in tables:
+            return False
+        if {FTS_TABLE, KEY_TABLE} <= tables:
+            return True
+
+        # executescript commits first, so the rebuild runs as one transaction of its own
+        conn.executescript("BEGIN IMMEDIATE;" + _DROP + _DDL + _BACKFILL + "COMMIT;")
+        logger.info("Full-text index built over %d raw event(s)",
+                    conn.execute("SELECT COUNT(*) FROM RawEventsFtsKeys").fetchone()[0])
+        return True
+    except sqlite3.Error as e:
+        if conn.in_transaction:
+            conn.rollback()
+        logger.warning("Full-text index unavailable, using LIKE scans: %s", e)
+        return False
+    finally:
+        if owns_connection:
+            conn.close()
@@ -33,6 +33,15 @@ class ConfigManagerTests(unittest.TestCase):
         config = manager.load()
         self.assertEqual(config["DATABASE_PATH"], "custom/path.db")
 
+    def test_load_is_cached_and_read_only(self):
+        manager = ConfigManager(self.env_path)
+        config = manager.load()
+        os.environ["DATABASE_URL"] = "sqlite:///changed/after/load.db"
+        self.assertIs(manager.load(), config)
+        self.assertEqual(manager.get("DATABASE_PATH"), "instance/cyber_events.db")
+        with self.assertRaises(TypeError):
+            config["DATABASE_PATH"] = "other.db"
+
 
 if __name__ == "__main__":
     unittest.main()
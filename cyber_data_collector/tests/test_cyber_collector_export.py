@@ -0,0 +1,36 @@
+"""The JSON export keeps json.dumps(indent=2, default=str) formatting."""
+
+from __future__ import annotations
+
+import json
+import logging
+from datetime import datetime, timezone
+
+from cyber_data_collector.cyber_collector import CyberDataCollector
+
+
+class _Event:
+    def __init__(self, payload: dict):
+        self.payload = payload
+
+    def model_dump(self) -> dict:
+        return self.payload
+
+
+def test_export_events_json_matches_baseline_format(tmp_path):
+    payload = {
+        "title": "Zürich clinic breach",
+        "event_date": datetime(2024, 1, 2, 3, 4, 5, tzinfo=timezone.utc),
+        "confidence": float("nan"),
+        "records": 1e16,
+    }
+    collector = CyberDataCollector.__new__(CyberDataCollector)
+    collector.collected_events = [_Event(payload)]
+    collector.logger = logging.getLogger("test.export")
+    path = tmp_path / "events.json"
+
+    assert collector.export_events(str(path), "json")
+
+    text = path.read_text(encoding="utf-8")
+    assert text == json.dumps([payload], indent=2, default=str)
+    assert '"2024-01-02 03:04:05+00:00"' in text and "NaN" in text and "\\u00fc" in text
@@ -0,0 +1,688 @@
+"""CyberEventDataV2 against a minimal V2 schema."""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+from datetime import date, datetime
+
+import pytest
+
+from cyber_data_collector.models.events import ConfidenceScore, CyberEvent, CyberEventType, EventSeverity
+from cyber_data_collector.storage import cyber_event_data_v2
+from cyber_data_collector.storage import fulltext as fulltext_index
+from cyber_data_collector.storage.cyber_event_data_v2 import CyberEventDataV2
+from cyber_data_collector.storage.database import DatabaseManager
+from cyber_data_collector.utils import validation
+
+V2_SCHEMA = """
+CREATE TABLE RawEvents (
+    raw_event_id TEXT PRIMARY KEY,
+    source_type TEXT, source_event_id TEXT, raw_title TEXT, raw_description TEXT,
+    raw_content TEXT, event_date DATE, source_url TEXT, source_metadata TEXT,
+    discovered_at TEXT, is_processed BOOLEAN DEFAULT FALSE,
+    processing_attempted_at TEXT, processing_error TEXT
+);
+CREATE TABLE EnrichedEvents (
+    enriched_event_id TEXT PRIMARY KEY,
+    raw_event_id TEXT REFERENCES RawEvents(raw_event_id),
+    title TEXT, description TEXT, summary TEXT, event_type TEXT, severity TEXT,
+    event_date DATE, records_affected BIGINT,
+    is_australian_event BOOLEAN, is_specific_event BOOLEAN,
+    confidence_score REAL, australian_relevance_score REAL,
+    status TEXT DEFAULT 'Active', created_at TEXT, updated_at TEXT
+);
+CREATE TABLE EntitiesV2 (
+    entity_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    entity_name TEXT UNIQUE NOT NULL, entity_type TEXT,
+    is_australian BOOLEAN, confidence_score REAL, industry TEXT, created_at TEXT
+);
+CREATE TABLE EnrichedEventEntities (
+    enriched_event_id TEXT REFERENCES EnrichedEvents(enriched_event_id),
+    entity_id INTEGER REFERENCES EntitiesV2(entity_id),
+    relationship_type TEXT, confidence_score REAL,
+    PRIMARY KEY (enriched_event_id, entity_id)
+);
+CREATE TABLE ProcessingLog (
+    log_id TEXT PRIMARY KEY, raw_event_id TEXT, processing_stage TEXT, status TEXT,
+    result_data TEXT, error_message TEXT, processing_time_ms INTEGER, created_at TEXT
+);
+CREATE TABLE MonthProcessed (
+    year INTEGER, month INTEGER, is_processed BOOLEAN, processed_at TEXT,
+    total_raw_events INTEGER, total_enriched_events INTEGER, processing_notes TEXT,
+    PRIMARY KEY (year, month)
+);
+"""
+
+
+@pytest.fixture
+def db(tmp_path):
+    path = tmp_path / "cyber_events.db"
+    conn = sqlite3.connect(path)
+    conn.executescript(V2_SCHEMA)
+    conn.close()
+    with CyberEventDataV2(path) as data:
+        yield data
+
+
+def test_connection_uses_wal_with_relaxed_sync(db):
+    pragma = lambda name: db.connection.execute(f"PRAGMA {name}").fetchone()[0]
+
+    assert pragma("journal_mode") == "wal"
+    assert pragma("synchronous") == 1  # NORMAL
+    assert pragma("temp_store") == 2  # MEMORY
+    assert pragma("cache_size") == -65536
+    assert pragma("mmap_size") == 268435456
+    assert pragma("wal_autocheckpoint") == 1000
+
+
+def test_unprocessed_queries_use_partial_index(db):
+    plan = db.connection.execute(
+        "EXPLAIN QUERY PLAN SELECT * FROM RawEvents WHERE is_processed = FALSE "
+        "AND (discovered_at, raw_event_id) > ('2024-01-01', 'x') ORDER BY discovered_at, raw_event_id LIMIT 10"
+    ).fetchall()
+    details = " | ".join(row[-1] for row in plan)
+
+    assert "idx_raw_events_unprocessed_seek ((discovered_at,raw_event_id)>(?,?))" in details
+    assert "TEMP B-TREE" not in details
+
+
+def test_unprocessed_by_source_uses_work_queue_index(db):
+    plan = db.connection.execute(
+        "EXPLAIN QUERY PLAN SELECT raw_event_id FROM RawEvents WHERE is_processed = FALSE "
+        "AND source_type = 'GDELT' ORDER BY discovered_at, raw_event_id LIMIT 10"
+    ).fetchall()
+    details = " | ".join(row[-1] for row in plan)
+
+    assert "USING INDEX idx_raw_events_work_queue (source_type=?)" in details
+    assert "TEMP B-TREE" not in details
+
+
+def test_unprocessed_raw_events_page_by_keyset(db):
+    db.add_raw_events_bulk([("GDELT", {"title": f"Event {i}"}) for i in range(5)])
+    db.add_raw_event("RSS", {"title": "Later"})
+
+    pages, after = [], None
+    while True:
+        page = db.get_unprocessed_raw_events(limit=2, after=after)
+        if not page:
+            break
+        pages.append([event["raw_title"] for event in page])
+        after = (page[-1]["discovered_at"], page[-1]["raw_event_id"])
+
+    assert sorted(title for page in pages for title in page) == ["Event 0", "Event 1", "Event 2",
+                                                                 "Event 3", "Event 4", "Later"]
+    assert [len(page) for page in pages] == [2, 2, 2]
+    assert pages[-1][-1] == "Later"
+
+
+def test_find_existing_raw_event_seeks_by_url(db):
+    raw_id = db.add_raw_event("Perplexity", {"title": "Breach", "source_url": "https://a.example/x"})
+
+    assert db.find_existing_raw_event("Perplexity", "https://a.example/x", "Breach") == raw_id
+    plan = db.connection.execute(
+        "EXPLAIN QUERY PLAN SELECT raw_event_id FROM RawEvents "
+        "WHERE source_type = ? AND source_url = ? AND raw_title = ?", ("a", "b", "c"),
+    ).fetchall()
+    assert any("idx_raw_events_lookup (source_type=? AND source_url=? AND raw_title=?)" in row[-1] for row in plan)
+
+    plan = db.connection.execute(
+        "EXPLAIN QUERY PLAN SELECT source_url FROM RawEvents WHERE source_type = ? AND source_url IS NOT NULL",
+        ("a",),
+    ).fetchall()
+    assert any("COVERING INDEX idx_raw_events_lookup" in row[-1] for row in plan)
+
+
+def test_active_enriched_listing_seeks_the_composite_index(db):
+    plan = db.connection.execute(
+        "EXPLAIN QUERY PLAN SELECT * FROM EnrichedEvents WHERE status = 'Active' "
+        "AND is_australian_event = TRUE AND is_specific_event = TRUE "
+        "ORDER BY event_date DESC, created_at DESC LIMIT 10"
+    ).fetchall()
+
+    assert any("idx_enriched_events_active" in row[-1] for row in plan)
+
+
+def test_add_raw_events_bulk_inserts_in_one_transaction(db):
+    events = [("GDELT", {"title": f"Event {i}", "source_url": f"https://e.example/{i}"}) for i in range(3)]
+
+    ids = db.add_raw_events_bulk(events)
+
+    rows = db.connection.execute("SELECT raw_event_id, raw_title FROM RawEvents").fetchall()
+    assert {row["raw_event_id"]: row["raw_title"] for row in rows} == dict(zip(ids, ["Event 0", "Event 1", "Event 2"]))
+    assert db.find_existing_raw_event("GDELT", "https://e.example/1", "Event 1") == ids[1]
+    assert db.connection.execute("SELECT COUNT(DISTINCT discovered_at) FROM RawEvents").fetchone()[0] == 1
+
+
+@pytest.mark.parametrize("use_returning", [True, False])
+def test_enriched_event_links_entities_once_per_name(db, monkeypatch, use_returning):
+    if use_returning and not cyber_event_data_v2.SQLITE_SUPPORTS_RETURNING:
+        pytest.skip("SQLite too old for RETURNING")
+    monkeypatch.setattr(cyber_event_data_v2, "SQLITE_SUPPORTS_RETURNING", use_returning)
+    raw_id = db.add_raw_event("GDELT", {"title": "Optus breach"})
+    db.create_enriched_event(raw_id, {"title": "Other", "entities": [{"name": "Optus", "type": "telco"}]})
+    db.connection.execute("UPDATE EnrichedEvents SET status = 'Superseded'")
+
+    enriched_id = db.create_enriched_event(raw_id, {
+        "title": "Optus breach",
+        "entities": [
+            {"name": "Optus", "type": "ignored", "relationship_type": "affected"},
+            {"name": "Optus", "relationship_type": "duplicate"},
+            {"name": "OAIC", "type": "regulator", "relationship_type": "investigator"},
+            {"type": "nameless"},
+        ],
+    })
+
+    links = db.connection.execute(
+        "SELECT e.entity_name, e.entity_type, l.relationship_type FROM EnrichedEventEntities l "
+        "JOIN EntitiesV2 e USING (entity_id) WHERE l.enriched_event_id = ? ORDER BY e.entity_name",
+        (enriched_id,),
+    ).fetchall()
+    assert [tuple(row) for row in links] == [
+        ("OAIC", "regulator", "investigator"),
+        ("Optus", "telco", "affected"),
+    ]
+    assert db.connection.execute("SELECT COUNT(*) FROM EntitiesV2").fetchone()[0] == 2
+
+
+@pytest.mark.parametrize("use_returning", [True, False])
+def test_entity_linking_upserts_in_chunks(db, monkeypatch, use_returning):
+    if use_returning and not cyber_event_data_v2.SQLITE_SUPPORTS_RETURNING:
+        pytest.skip("SQLite too old for RETURNING")
+    monkeypatch.setattr(cyber_event_data_v2, "SQLITE_SUPPORTS_RETURNING", use_returning)
+    db.connection.executemany("INSERT INTO EntitiesV2 (entity_name) VALUES (?)",
+                              [(f"Org {i}",) for i in range(0, 450, 3)])
+    db.connection.commit()
+
+    statements = []
+    db.connection.set_trace_callback(statements.append)
+    enriched_id = db.create_enriched_event(db.add_raw_event("GDELT", {"title": "Many"}), {
+        "title": "Many", "entities": [{"name": f"Org {i}"} for i in range(450)],
+    })
+    db.connection.set_trace_callback(None)
+
+    if use_returning:
+        # 450 names at five parameters each fit in three upserts
+        assert len([sql for sql in statements if "EntitiesV2" in sql]) == 3
+    linked = db.connection.execute(
+        "SELECT COUNT(DISTINCT l.entity_id) FROM EnrichedEventEntities l "
+        "JOIN EntitiesV2 e USING (entity_id) WHERE l.enriched_event_id = ?", (enriched_id,),
+    ).fetchone()[0]
+    assert linked == 450
+    assert db.connection.execute("SELECT COUNT(*) FROM EntitiesV2").fetchone()[0] == 450
+
+
+def test_enriched_full_view_joins_source_and_entities(db):
+    raw_id = db.add_raw_event("RSS", {"title": "Optus breach", "source_url": "https://n.com.au/1"})
+    linked = db.create_enriched_event(raw_id, {
+        "title": "Optus breach",
+        "entities": [{"name": "Optus", "relationship_type": "affected"}, {"name": "OAIC"}],
+    })
+    bare = db.create_enriched_event(db.add_raw_event("GDELT", {"title": "Quiet"}), {"title": "Quiet"})
+
+    rows = db.connection.execute(
+        "SELECT enriched_event_id, source_type, source_url, entity_name FROM v_enriched_full "
+        "ORDER BY source_type, entity_name"
+    ).fetchall()
+
+    assert [tuple(row) for row in rows] == [
+        (bare, "GDELT", None, None),
+        (linked, "RSS", "https://n.com.au/1", "OAIC"),
+        (linked, "RSS", "https://n.com.au/1", "Optus"),
+    ]
+
+
+def test_entity_name_lookup_seeks_the_unique_index(db):
+    plan = db.connection.execute(
+        "EXPLAIN QUERY PLAN SELECT entity_id FROM EntitiesV2 WHERE entity_name = ?", ("Optus",)
+    ).fetchall()
+
+    assert "COVERING INDEX sqlite_autoindex_EntitiesV2_1 (entity_name=?)" in plan[0][-1]
+
+
+def test_entity_ids_are_cached_until_another_connection_commits(db, tmp_path):
+    def enrich(title):
+        raw_id = db.add_raw_event("GDELT", {"title": title})
+        return db.create_enriched_event(raw_id, {"title": title, "entities": [{"name": "Optus"}]})
+
+    with pytest.raises(RuntimeError):
+        with db.transaction():
+            enrich("Rolled back")
+            raise RuntimeError("abort")
+    assert db._entity_ids == {}
+
+    enrich("First")
+    assert "Optus" in db._entity_ids
+
+    statements = []
+    db.connection.set_trace_callback(statements.append)
+    enrich("Second")
+    db.connection.set_trace_callback(None)
+    assert not [sql for sql in statements if "EntitiesV2" in sql]
+
+    other = sqlite3.connect(tmp_path / "cyber_events.db")
+    other.execute("DELETE FROM EnrichedEventEntities")
+    other.execute("DELETE FROM EntitiesV2")
+    other.commit()
+    other.close()
+
+    third_id = enrich("Third")
+    linked = db.connection.execute(
+        "SELECT e.entity_name FROM EnrichedEventEntities l JOIN EntitiesV2 e USING (entity_id) "
+        "WHERE l.enriched_event_id = ?", (third_id,)
+    ).fetchall()
+    assert [row[0] for row in linked] == ["Optus"]
+
+
+def test_metadata_and_results_are_stored_as_json_text(db):
+    raw_id = db.add_raw_event("GDELT", {
+        "title": "Breach",
+        "metadata": {"seen": datetime(2024, 5, 1, 9, 30), "tags": {"ransomware"}, 7: "int key"},
+    })
+    db.log_processing_attempt(raw_id, "llm_analysis", "success", {"day": date(2024, 5, 2)})
+
+    metadata, metadata_type = db.connection.execute(
+        "SELECT source_metadata, typeof(source_metadata) FROM RawEvents"
+    ).fetchone()
+    result, result_type = db.connection.execute(
+        "SELECT result_data, typeof(result_data) FROM ProcessingLog"
+    ).fetchone()
+
+    assert (metadata_type, result_type) == ("text", "text")
+    assert json.loads(metadata) == {"seen": "2024-05-01T09:30:00", "tags": ["ransomware"], "7": "int key"}
+    assert json.loads(result) == {"day": "2024-05-02"}
+
+
+
+def test_plain_metadata_and_results_skip_json_dumps(db, monkeypatch):
+    pytest.importorskip("orjson")
+
+    def json_dumps(*args, **kwargs):
+        raise AssertionError("expected the orjson path")
+
+    monkeypatch.setattr(validation.json, "dumps", json_dumps)
+    raw_id = db.add_raw_event("GDELT", {"title": "Breach", "metadata": {"tone": -4.5, "tags": ["a"]}})
+    db.log_processing_attempt(raw_id, "llm_analysis", "success", {"ok": True})
+    monkeypatch.undo()
+
+    stored = db.connection.execute(
+        "SELECT source_metadata, result_data FROM RawEvents JOIN ProcessingLog USING (raw_event_id)"
+    ).fetchone()
+    assert tuple(stored) == ('{"tone":-4.5,"tags":["a"]}', '{"ok":true}')
+
+def test_find_raw_events_by_metadata_filters_inside_sqlite(db):
+    db.add_raw_event("GDELT", {"title": "Tagged", "metadata": {"tone": -4.5, "source.name": "abc", "au": True}})
+    db.add_raw_event("GDELT", {"title": "Other", "metadata": {"tone": 2.0}})
+    broken = db.add_raw_event("GDELT", {"title": "Broken"})
+    db.connection.execute("UPDATE RawEvents SET source_metadata = '{not json' WHERE raw_event_id = ?", (broken,))
+    db.connection.commit()
+
+    def titles(key, value):
+        return [event["raw_title"] for event in db.find_raw_events_by_metadata(key, value)]
+
+    assert titles("tone", -4.5) == ["Tagged"]
+    assert titles("source.name", "abc") == ["Tagged"]
+    assert titles("au", True) == ["Tagged"]
+    assert titles("tone", 99) == []
+
+
+def test_reads_use_pooled_read_only_connections(db):
+    raw_id = db.add_raw_event("GDELT", {"title": "Breach", "source_url": "https://a.example/x"})
+
+    # A write transaction open in another thread must not block readers
+    held, release = threading.Event(), threading.Event()
+
+    def hold_writer():
+        with db.transaction():
+            held.set()
+            release.wait(5)
+
+    writer = threading.Thread(target=hold_writer)
+    writer.start()
+    held.wait(5)
+    try:
+        assert db.find_existing_raw_event("GDELT", "https://a.example/x", "Breach") == raw_id
+        assert db.get_processing_queue_status()["unprocessed_total"] == 1
+        assert db.get_summary_statistics()["raw_events_total"] == 1
+    finally:
+        release.set()
+        writer.join()
+
+    with db._reader() as conn:
+        with pytest.raises(sqlite3.OperationalError):
+            conn.execute("DELETE FROM RawEvents")
+    assert db._readers.qsize() == 1
+
+
+def test_summary_statistics_are_cached_until_a_write(db, tmp_path, monkeypatch):
+    db.add_raw_event("GDELT", {"title": "First"})
+    assert db.get_summary_statistics()["raw_events_total"] == 1
+
+    calls = []
+    compute = db._compute_summary_statistics
+    monkeypatch.setattr(db, "_compute_summary_statistics", lambda: calls.append(1) or compute())
+
+    db.get_summary_statistics()["raw_events_by_source"]["GDELT"] = 99  # callers get a copy
+    assert db.get_summary_statistics()["raw_events_by_source"] == {"GDELT": 1}
+    assert calls == []
+
+    db.add_raw_event("GDELT", {"title": "Second"})
+    assert db.get_summary_statistics()["raw_events_total"] == 2
+
+    # A commit from another connection also invalidates the cache
+    other = sqlite3.connect(tmp_path / "cyber_events.db")
+    other.execute("INSERT INTO RawEvents (raw_event_id, source_type) VALUES ('x', 'GDELT')")
+    other.commit()
+    other.close()
+    assert db.get_summary_statistics()["raw_events_total"] == 3
+    assert len(calls) == 2
+
+
+def test_summary_statistics_inside_a_rolled_back_transaction_are_not_cached(db):
+    with pytest.raises(RuntimeError):
+        with db.transaction():
+            db.add_raw_event("GDELT", {"title": "Rolled back"})
+            assert db.get_summary_statistics()["raw_events_total"] == 1
+            raise RuntimeError("abort")
+
+    assert db.get_summary_statistics()["raw_events_total"] == 0
+
+
+def test_processing_queue_status_counts_each_stage(db):
+    db.add_raw_event("GDELT", {"title": "No URL"})
+    fresh = db.add_raw_event("GDELT", {"title": "Fresh", "source_url": "https://a.example/1"})
+    scraped = db.add_raw_event("GDELT", {"title": "Scraped", "source_url": "https://a.example/2"})
+    analyzed = db.add_raw_event("GDELT", {"title": "Analyzed", "source_url": "https://a.example/3"})
+    done = db.add_raw_event("GDELT", {"title": "Done", "source_url": "https://a.example/4"})
+    db.log_processing_attempt(fresh, "url_scraping", "failed")
+    for raw_id in (scraped, analyzed, done):
+        db.log_processing_attempt(raw_id, "url_scraping", "success")
+    db.log_processing_attempt(analyzed, "llm_analysis", "success")
+    db.mark_raw_event_processed(done)
+
+    assert db.get_processing_queue_status() == {
+        "unprocessed_total": 4,
+        "needs_scraping": 1,
+        "needs_analysis": 1,
+        "ready_for_enrichment": 1,
+    }
+
+
+def test_raw_events_for_processing_skips_analyzed_events(db):
+    analyzed = db.add_raw_event("GDELT", {"title": "Australian bank breach", "source_url": "https://a.com.au/1"})
+    retried = db.add_raw_event("GDELT", {"title": "Australian council breach", "source_url": "https://b.gov.au/2"})
+    db.add_raw_event("GDELT", {"title": "Australian breach without a URL"})
+    for _ in range(2):
+        db.log_processing_attempt(analyzed, "llm_analysis", "success")
+        db.log_processing_attempt(retried, "llm_analysis", "failed")
+
+    events = db.get_raw_events_for_processing()
+
+    assert [event["raw_event_id"] for event in events] == [retried]
+    assert "processing_error" not in events[0] and events[0]["source_url"] == "https://b.gov.au/2"
+
+
+def test_list_queries_return_plain_dicts(db):
+    db.add_raw_event("GDELT", {"title": "Breach", "source_url": "https://a.example/x"})
+    db.mark_month_as_processed(2024, 3, total_raw_events=5)
+
+    events = db.get_unprocessed_raw_events()
+    by_year = db.get_month_processing_stats()["by_year"]
+
+    assert type(events[0]) is dict and events[0]["raw_title"] == "Breach"
+    assert by_year == [{"year": 2024, "processed_months": 1, "total_raw": 5, "total_enriched": 0}]
+
+
+def test_iter_queries_stream_in_batches_and_release_the_reader(db, monkeypatch):
+    monkeypatch.setattr(cyber_event_data_v2, "FETCH_BATCH_SIZE", 2)
+    db.add_raw_events_bulk([("GDELT", {"title": f"Breach {i}"}) for i in range(5)])
+
+    events = db.iter_unprocessed_raw_events()
+    assert next(events)["raw_title"].startswith("Breach")
+    assert db._readers.qsize() == 0  # checked out while the generator is live
+    events.close()
+    assert db._readers.qsize() == 1
+
+    assert sorted(e["raw_title"] for e in db.iter_unprocessed_raw_events()) == [f"Breach {i}" for i in range(5)]
+    assert db.get_unprocessed_raw_events(limit=3) == list(db.iter_unprocessed_raw_events(limit=3))
+
+
+def test_opening_analyzes_a_database_without_statistics(tmp_path):
+    path = tmp_path / "cyber_events.db"
+    conn = sqlite3.connect(path)
+    conn.executescript(V2_SCHEMA)
+    conn.executemany(
+        "INSERT INTO RawEvents (raw_event_id, source_type, is_processed) VALUES (?, 'GDELT', TRUE)",
+        [(str(i),) for i in range(20)],
+    )
+    conn.commit()
+    conn.close()
+
+    with CyberEventDataV2(path) as data:
+        stats = data.connection.execute("SELECT idx FROM sqlite_stat1 WHERE tbl = 'RawEvents'").fetchall()
+
+    assert "idx_raw_events_lookup" in {row["idx"] for row in stats}
+
+
+def test_analyze_refreshes_statistics_after_a_backfill(db):
+    db.add_raw_events_bulk([("GDELT", {"title": f"Event {i}"}) for i in range(30)])
+
+    db.analyze()
+
+    stat = db.connection.execute(
+        "SELECT stat FROM sqlite_stat1 WHERE idx = 'idx_raw_events_lookup'"
+    ).fetchone()
+    assert stat["stat"].split()[0] == "30"
+
+
+def test_summary_statistics_and_known_urls(db):
+    raw_id = db.add_raw_event("GDELT", {"title": "A", "source_url": "https://a.example/1"})
+    db.add_raw_event("GDELT", {"title": "B", "source_url": "https://a.example/2"})
+    db.add_raw_event("Perplexity", {"title": "C"})
+    db.create_enriched_event(raw_id, {"title": "A", "event_type": "Data Breach", "entities": [{"name": "Optus"}]})
+    db.log_processing_attempt(raw_id, "llm_analysis", "success")
+    db.create_enriched_event(db.add_raw_event("GDELT", {"title": "D"}),
+                             {"title": "D", "is_specific_event": True})
+
+    stats = db.get_summary_statistics()
+
+    assert db.get_known_source_urls("GDELT") == {"https://a.example/1", "https://a.example/2"}
+    assert stats["raw_events_by_source"] == {"GDELT": 3, "Perplexity": 1}
+    assert (stats["raw_events_total"], stats["raw_events_processed"]) == (4, 0)
+    assert stats["events_by_type"] == {"Data Breach": 1}
+    assert (stats["enriched_events_total"], stats["enriched_events_specific"]) == (2, 1)
+    assert (stats["entities_total"], stats["entities_australian"]) == (1, 0)
+    assert stats["processing_stats"] == {"llm_analysis": {"success": 1}}
+
+
+def test_mark_raw_events_processed_updates_a_batch(db):
+    kept, filtered, _ = db.add_raw_events_bulk(
+        [("GDELT", {"title": title}) for title in ("Kept", "Filtered", "Pending")]
+    )
+
+    assert db.mark_raw_events_processed([kept, filtered], {filtered: "Filtered out"}) == 2
+    assert db.mark_raw_events_processed([]) == 0
+
+    rows = db.connection.execute(
+        "SELECT raw_title, is_processed, processing_error FROM RawEvents ORDER BY raw_title"
+    ).fetchall()
+    assert [tuple(row) for row in rows] == [
+        ("Filtered", 1, "Filtered out"),
+        ("Kept", 1, None),
+        ("Pending", 0, None),
+    ]
+
+
+def test_transaction_commits_once_and_rolls_back_on_error(db, monkeypatch):
+    raw_ids = db.add_raw_events_bulk([("GDELT", {"title": f"Event {i}"}) for i in range(3)])
+    commits = []
+    real_connection = db._conn
+
+    class CountingConnection:
+        def __getattr__(self, name):
+            return getattr(real_connection, name)
+
+        def commit(self):
+            commits.append(1)
+            real_connection.commit()
+
+    monkeypatch.setattr(db, "_conn", CountingConnection())
+
+    with db.transaction():
+        for raw_id in raw_ids:
+            db.mark_raw_event_processed(raw_id)
+            db.log_processing_attempt(raw_id, "llm_analysis", "success")
+    assert len(commits) == 1
+
+    with pytest.raises(RuntimeError):
+        with db.transaction():
+            db.mark_month_as_processed(2024, 1)
+            raise RuntimeError("abort")
+
+    assert not db.is_month_processed(2024, 1)
+    assert db.get_processing_queue_status()["unprocessed_total"] == 0
+
+
+def test_swallowed_write_error_rolls_the_transaction_back(db):
+    raw_id = db.add_raw_event("GDELT", {"title": "Breach"})
+    db.connection.execute(
+        "CREATE TRIGGER no_months BEFORE INSERT ON MonthProcessed BEGIN SELECT RAISE(ABORT, 'boom'); END"
+    )
+    db.connection.commit()
+
+    with pytest.raises(sqlite3.DatabaseError):
+        with db.transaction():
+            db.log_processing_attempt(raw_id, "llm_analysis", "success")
+            assert db.mark_month_as_processed(2024, 1) is False
+
+    assert db.connection.execute("SELECT COUNT(*) FROM ProcessingLog").fetchone()[0] == 0
+
+    db.log_processing_attempt(raw_id, "llm_analysis", "success")
+    assert db.connection.execute("SELECT COUNT(*) FROM ProcessingLog").fetchone()[0] == 1
+
+
+def test_reads_inside_a_transaction_see_its_uncommitted_writes(db):
+    seen_elsewhere = []
+
+    with db.transaction():
+        raw_id = db.add_raw_event("GDELT", {"title": "Breach", "source_url": "https://a.example/x"})
+        assert db.find_existing_raw_event("GDELT", "https://a.example/x", "Breach") == raw_id
+
+        reader = threading.Thread(target=lambda: seen_elsewhere.append(
+            db.find_existing_raw_event("GDELT", "https://a.example/x", "Breach")
+        ))
+        reader.start()
+        reader.join()
+
+    assert seen_elsewhere == [None]
+    assert db.find_existing_raw_event("GDELT", "https://a.example/x", "Breach") == raw_id
+
+
+@pytest.mark.parametrize("fulltext", [True, False])
+def test_australian_filter_matches_text_and_domains(tmp_path, fulltext):
+    path = tmp_path / "cyber_events.db"
+    conn = sqlite3.connect(path)
+    conn.executescript(V2_SCHEMA)
+    # Stored before the full-text index exists, so it must be picked up by the migration
+    conn.execute(
+        "INSERT INTO RawEvents (raw_event_id, raw_title, source_url, is_processed, discovered_at) "
+        "VALUES ('old', 'Breach hits Australians', 'https://news.example/a', FALSE, '2024-01-01')"
+    )
+    conn.commit()
+    conn.close()
+    if fulltext:
+        assert fulltext_index.migrate(path)
+
+    with CyberEventDataV2(path) as db:
+        assert db._fulltext == fulltext
+        db.add_raw_event("GDELT", {"title": "Austria bank outage", "source_url": "https://x.example/1"})
+        db.add_raw_event("GDELT", {"title": "Breach", "description": "An AUSTRALIAN insurer",
+                                   "source_url": "https://x.example/2"})
+        db.add_raw_event("GDELT", {"title": "Hospital breach", "source_url": "https://health.gov.au/3"})
+        db.add_raw_event("GDELT", {"title": "Regional page", "source_url": "https://x.example/au/5"})
+        db.add_raw_event("GDELT", {"title": "Bare TLD", "source_url": "https://news.au/6"})
+        renamed = db.add_raw_event("GDELT", {"title": "Ransomware", "source_url": "https://x.example/4"})
+        db.connection.execute(
+            "UPDATE RawEvents SET raw_title = 'Ransomware in Australia' WHERE raw_event_id = ?", (renamed,)
+        )
+        db.connection.commit()
+
+        titles = [event["raw_title"] for event in db.get_raw_events_for_processing()]
+
+    assert titles == [
+        "Breach hits Australians", "Breach", "Hospital breach", "Regional page", "Ransomware in Australia",
+    ]
+
+
+
+def test_fulltext_migration_replaces_the_rowid_keyed_index_and_survives_vacuum(tmp_path):
+    path = tmp_path / "cyber_events.db"
+    conn = sqlite3.connect(path)
+    conn.executescript(V2_SCHEMA)
+    # The earlier layout, keyed on RawEvents' implicit rowid
+    conn.executescript("""
+        CREATE VIRTUAL TABLE RawEvents_fts USING fts5(
+            raw_title, raw_description, content='RawEvents', content_rowid='rowid');
+        CREATE TRIGGER RawEvents_fts_ai AFTER INSERT ON RawEvents BEGIN
+            INSERT INTO RawEvents_fts(rowid, raw_title, raw_description)
+            VALUES (new.rowid, new.raw_title, new.raw_description);
+        END;
+    """)
+    conn.executemany(
+        "INSERT INTO RawEvents (raw_event_id, raw_title, is_processed) VALUES (?, ?, FALSE)",
+        [(f"id-{i}", f"Australian breach {i}" if i % 2 else f"Breach {i}") for i in range(6)],
+    )
+    conn.commit()
+
+    assert fulltext_index.migrate(conn)
+    assert fulltext_index.migrate(conn)  # idempotent
+    conn.execute("DELETE FROM RawEvents WHERE raw_event_id IN ('id-0', 'id-1')")
+    conn.commit()
+    conn.execute("VACUUM")
+
+    matched = {row[0] for row in conn.execute(
+        "SELECT k.raw_event_id FROM RawEvents_fts f JOIN RawEventsFtsKeys k ON k.fts_rowid = f.rowid "
+        "WHERE RawEvents_fts MATCH 'australia*'"
+    )}
+    conn.close()
+
+    assert matched == {"id-3", "id-5"}
+
+def test_unprocessed_months_excludes_processed_in_range(db):
+    db.mark_month_as_processed(2023, 12)
+    db.mark_month_as_processed(2024, 2)
+    db.mark_month_as_processed(2025, 1)  # outside the range
+    db.connection.execute("INSERT INTO MonthProcessed (year, month, is_processed) VALUES (2024, 1, FALSE)")
+    db.connection.commit()
+
+    months = db.get_unprocessed_months(2023, 11, 2024, 3)
+
+    assert months == [(2023, 11), (2024, 1), (2024, 3)]
+
+
+def test_database_manager_keeps_the_good_rows_when_one_row_fails(tmp_path):
+    path = tmp_path / "cyber_events.db"
+    conn = sqlite3.connect(path)
+    conn.executescript(V2_SCHEMA)
+    conn.execute(
+        "CREATE TRIGGER reject_bad BEFORE INSERT ON RawEvents WHEN NEW.raw_title = 'bad' "
+        "BEGIN SELECT RAISE(ABORT, 'bad row'); END"
+    )
+    conn.close()
+
+    def event(title):
+        return CyberEvent(
+            title=title, description=title, event_type=CyberEventType.DATA_BREACH,
+            severity=EventSeverity.HIGH, australian_relevance=True,
+            confidence=ConfidenceScore(
+                overall=0.5, source_reliability=0.5, data_completeness=0.5,
+                temporal_accuracy=0.5, geographic_accuracy=0.5,
+            ),
+        )
+
+    with DatabaseManager(f"sqlite:///{path}") as manager:
+        manager.save_events([event("first"), event("bad"), event("second")])
+        titles = {row["raw_title"] for row in manager._db.get_unprocessed_raw_events()}
+
+    assert titles == {"first", "second"}
@@ -248,6 +248,44 @@ def test_backfill_is_idempotent(conn):
         "SELECT COUNT(*) FROM DeduplicatedEventSources").fetchone()[0] == 1
 
 
+def test_backfill_inserts_in_sql_with_uuid_map_ids(conn):
+    for key in "abc":
+        _add_event(conn, key, f"Acme breach {key}", f"https://x/{key}")
+
+    report = run_backfill(conn)
+
+    assert (report["master_rows_added"], report["source_rows_added"]) == (3, 3)
+    assert report["events_without_lineage"] == 0
+    map_ids = [row[0] for row in conn.execute("SELECT map_id FROM EventDeduplicationMap")]
+    assert len(set(map_ids)) == 3
+    assert all(uuid.UUID(map_id).version == 4 and str(uuid.UUID(map_id)) == map_id for map_id in map_ids)
+
+
+def test_backfill_links_entities_with_roles(conn):
+    _, enr_id, dedup_id = _add_event(conn, "a", "Acme breach", "https://x/1")
+    conn.executemany(
+        "INSERT INTO EnrichedEventEntities VALUES (?,?,?,?)",
+        [(enr_id, 1, "victim", 0.9), (enr_id, 2, None, None)],
+    )
+
+    report = run_backfill(conn)
+
+    assert report["entity_links_added"] == 2
+    links = conn.execute(
+        "SELECT entity_id, relationship_type, confidence_score, source_count "
+        "FROM DeduplicatedEventEntities WHERE deduplicated_event_id = ? ORDER BY entity_id",
+        (dedup_id,)).fetchall()
+    assert [tuple(row) for row in links] == [(1, "victim", 0.9, 1), (2, "affected", 0.5, 1)]
+
+
+def test_backfill_refreshes_planner_statistics(conn):
+    _add_event(conn, "a", "Acme breach", "https://x/1")
+    run_backfill(conn)
+
+    analyzed = {row[0] for row in conn.execute("SELECT DISTINCT tbl FROM sqlite_stat1")}
+    assert {"EventDeduplicationMap", "DeduplicatedEventSources"} <= analyzed
+
+
 def test_backfill_dry_run_changes_nothing(conn):
     _add_event(conn, "a", "Acme breach", "https://x/1")
     run_backfill(conn, dry_run=True)
@@ -13,8 +13,8 @@ This module tests all aspects of the new deduplication system:
 
 import pytest
 import sqlite3
-import tempfile
-import os
+import sys
+import uuid
 from datetime import datetime, date, timedelta
 from typing import List, Dict, Any
 
@@ -26,6 +26,11 @@ from cyber_data_collector.storage.deduplication_storage import DeduplicationStor
 from cyber_data_collector.processing.deduplication_v2 import CyberEvent
 
 
+def _memory_db_uri() -> str:
+    """URI of a fresh named in-memory database that several connections can share."""
+    return f"file:test_{uuid.uuid4().hex}?mode=memory&cache=shared"
+
+
 class TestDeduplicationValidator:
     """Test the DeduplicationValidator class"""
     
@@ -52,6 +57,7 @@ class TestDeduplicationValidator:
         assert len(errors) == 1
         assert errors[0].error_type == "DUPLICATE_EVENT_IDS"
         assert "1" in errors[0].context["duplicate_ids"]
+        assert errors[0].context["duplicate_ids"] == ["1", "1"]
     
     def test_validate_inputs_missing_titles(self):
         """Test validation with missing titles"""
@@ -150,6 +156,66 @@ class TestSimilarityCalculator:
         similarity = calculator._title_similarity(event1, event2)
         assert similarity >= 0.8
     
+    def test_title_similarity_pure_python_fallback(self, monkeypatch):
+        """Without RapidFuzz or Numba the bit-parallel fallback gives the same contract."""
+        from cyber_data_collector.processing import deduplication_v2
+
+        monkeypatch.setattr(deduplication_v2, "_Indel", None)
+        monkeypatch.setattr(deduplication_v2._edit_distance, "lcs_length", None)
+        calculator = SimilarityCalculator()
+
+        event1 = CyberEvent(event_id="1", title="Optus Data Breach", event_date=date.today())
+        event2 = CyberEvent(event_id="2", title="Optus Data Breach Incident", event_date=date.today())
+
+        assert calculator._title_similarity(event1, event2) >= 0.8
+        assert deduplication_v2._sequence_ratio("abcd", "abcf") == pytest.approx(0.75)
+
+    @pytest.mark.parametrize("a,b,expected", [
+        ("abcd", "abcf", 0.75),
+        ("", "", 1.0),
+        ("Optus", "", 0.0),
+        ("Medibank hack", "Medibank data hack", 26 / 31),
+        ("Café breach", "Cafe breach", 20 / 22),
+    ])
+    def test_lcs_kernel_fallback(self, monkeypatch, a, b, expected):
+        """The single-row LCS kernel reproduces the Indel ratio."""
+        from cyber_data_collector.processing import _edit_distance, deduplication_v2
+
+        monkeypatch.setattr(deduplication_v2, "_Indel", None)
+        monkeypatch.setattr(_edit_distance, "lcs_length", _edit_distance._lcs_length_py)
+
+        assert deduplication_v2._sequence_ratio(a, b) == pytest.approx(expected)
+        assert _edit_distance.indel_similarity_bitparallel(a, b) == pytest.approx(expected)
+
+    def test_bitparallel_lcs_matches_dp_beyond_word_size(self):
+        """Bit-parallel LCS agrees with the DP kernel on titles longer than 64 chars."""
+        import random
+
+        from cyber_data_collector.processing import _edit_distance
+
+        rng = random.Random(7)
+        for _ in range(50):
+            a = "".join(rng.choice("abcde ") for _ in range(rng.randint(0, 150)))
+            b = "".join(rng.choice("abcde ") for _ in range(rng.randint(0, 150)))
+            assert _edit_distance.lcs_length_bitparallel(a, b) == _edit_distance._lcs_length_py(
+                _edit_distance.encode(a), _edit_distance.encode(b))
+
+    def test_title_similarity_skips_ratio_when_length_bound_cannot_win(self, monkeypatch):
+        """Very different lengths short-circuit the sequence match."""
+        from cyber_data_collector.processing import deduplication_v2
+
+        def fail(a, b):
+            raise AssertionError("sequence ratio should have been skipped")
+
+        monkeypatch.setattr(deduplication_v2, "_sequence_ratio", fail)
+        calculator = SimilarityCalculator()
+
+        event1 = CyberEvent(event_id="1", title="Optus", event_date=date.today())
+        event2 = CyberEvent(event_id="2", title="Optus data breach hits millions of customers",
+                            event_date=date.today())
+
+        assert calculator._title_similarity(event1, event2) == 0.8
+
     def test_entity_similarity_common_entities(self):
         """Test entity similarity with common entities"""
         calculator = SimilarityCalculator()
@@ -161,6 +227,34 @@ class TestSimilarityCalculator:
         # Should have some similarity due to "Optus"
         assert similarity > 0.0
     
+    @pytest.mark.parametrize("text, expected", [
+        ("  Optus:  Data_Breach!\t2023 ", "optus data_breach 2023"),
+        ("Medibank - ransomware (update)", "medibank  ransomware update"),
+        ("Café ‘breach’ — Ticketmaster", "café breach  ticketmaster"),
+    ])
+    def test_normalize_text(self, text, expected):
+        """ASCII and non-ASCII titles normalise identically to the regex form."""
+        assert SimilarityCalculator()._normalize_text(text) == expected
+
+    def test_title_normalisation_follows_title_edits(self):
+        """Cached normalisation is keyed on the text, so edited titles are re-read."""
+        calculator = SimilarityCalculator()
+        event1 = CyberEvent(event_id="1", title="Optus: Data Breach!", event_date=date.today())
+        event2 = CyberEvent(event_id="2", title="optus data  breach", event_date=date.today())
+
+        assert calculator._title_similarity(event1, event2) == 1.0
+
+        event2.title = "Medibank ransomware"
+        assert calculator._title_similarity(event1, event2) < 0.5
+
+    def test_extract_entities_drops_incident_stopwords(self):
+        """Entity tokens keep the capitalised phrase and its non-generic words."""
+        calculator = SimilarityCalculator()
+        event = CyberEvent(event_id="1", title="Optus Data Breach hits Telstra", event_date=date.today())
+
+        assert set(calculator._extract_entities(event)) == {"Optus Data Breach", "Optus", "Telstra"}
+        assert calculator._extract_entities(CyberEvent(event_id="2", title="")) == []
+
     def test_temporal_similarity_same_date(self):
         """Test temporal similarity with same date"""
         calculator = SimilarityCalculator()
@@ -209,6 +303,19 @@ class TestSimilarityCalculator:
         assert 0.0 <= similarity.temporal_similarity <= 1.0
         assert similarity.reasoning is not None
 
+    @pytest.mark.skipif(sys.version_info < (3, 10), reason="dataclass slots need Python 3.10")
+    def test_similarity_score_and_event_are_slotted(self):
+        """Per-pair score objects and events carry no instance __dict__."""
+        calculator = SimilarityCalculator()
+        event1 = CyberEvent(event_id="1", title="Optus breach", event_date=date.today())
+        event2 = CyberEvent(event_id="2", title="Optus hack", event_date=date.today())
+
+        similarity = calculator.calculate_similarity(event1, event2)
+
+        assert not hasattr(similarity, "__dict__")
+        assert not hasattr(event1, "__dict__")
+        event1.title = "Optus data breach"  # events stay mutable
+
 
 class TestLLMArbiter:
     """Test the LLMArbiter class"""
@@ -238,6 +345,52 @@ class TestLLMArbiter:
         assert decision.confidence == 0.5
         assert "No LLM API key" in decision.reasoning
     
+    def test_decide_similarity_batch_uses_one_request_per_batch(self, monkeypatch):
+        """Uncertain pairs share one LLM call; confident ones never reach it."""
+        import json
+
+        arbiter = LLMArbiter(api_key="test-key", batch_size=10)
+        prompts = []
+
+        def fake_call_llm(prompt, max_tokens=200):
+            prompts.append(prompt)
+            return json.dumps({"decisions": [
+                {"pair": 2, "is_similar": False, "confidence": 0.7, "reasoning": "different"},
+                {"pair": 1, "is_similar": True, "confidence": 0.9, "reasoning": "same"},
+            ]})
+
+        monkeypatch.setattr(arbiter, "_call_llm", fake_call_llm)
+        events = [CyberEvent(event_id=str(n), title=f"Event {n}", event_date=date.today())
+                  for n in range(4)]
+
+        decisions = arbiter.decide_similarity_batch([
+            (events[0], events[1], 0.5),
+            (events[0], events[2], 0.9),
+            (events[0], events[3], 0.4),
+        ])
+
+        assert len(prompts) == 1
+        assert "Pair 2:" in prompts[0] and "Pair 3:" not in prompts[0]
+        assert [d.is_similar for d in decisions] == [True, True, False]
+        assert decisions[0].reasoning == "same"
+        assert decisions[2].original_score == 0.4
+
+    def test_decide_similarity_batch_falls_back_on_incomplete_response(self, monkeypatch):
+        """A response missing any pair falls back to the algorithmic scores."""
+        import json
+
+        arbiter = LLMArbiter(api_key="test-key")
+        monkeypatch.setattr(arbiter, "_call_llm", lambda prompt, max_tokens=200: json.dumps(
+            [{"is_similar": True, "confidence": 0.9, "reasoning": "same"}]
+        ))
+        event1 = CyberEvent(event_id="1", title="Event 1", event_date=date.today())
+        event2 = CyberEvent(event_id="2", title="Event 2", event_date=date.today())
+
+        decisions = arbiter.decide_similarity_batch([(event1, event2, 0.6), (event2, event1, 0.4)])
+
+        assert [d.is_similar for d in decisions] == [True, False]
+        assert all("LLM failed" in d.reasoning for d in decisions)
+
     def test_format_prompt(self):
         """Test prompt formatting"""
         arbiter = LLMArbiter()
@@ -307,6 +460,30 @@ class TestDeduplicationEngine:
         assert len(result.merge_groups) == 1
         assert result.merge_groups[0].confidence > 0.0
     
+    def test_exact_duplicates_skip_pairwise_rules(self, monkeypatch):
+        """Same title and date merge from the bucket, without the pair checks."""
+        engine = DeduplicationEngine(similarity_threshold=0.9)
+        compared = []
+        original_same_entity = engine._same_entity
+
+        def spy_same_entity(event1, event2):
+            compared.append((event1.event_id, event2.event_id))
+            return original_same_entity(event1, event2)
+
+        monkeypatch.setattr(engine, "_same_entity", spy_same_entity)
+
+        events = [
+            CyberEvent(event_id="1", title="Data Breach ", event_date=date(2023, 1, 1)),
+            CyberEvent(event_id="2", title="Different Event", event_date=date(2023, 1, 2)),
+            CyberEvent(event_id="3", title="data breach", event_date=date(2023, 1, 1)),
+        ]
+
+        result = engine.deduplicate(events)
+
+        assert len(result.unique_events) == 2
+        assert result.merge_groups[0].merged_events[0].event_id == "3"
+        assert ("1", "3") not in compared
+
     def test_deduplicate_similar_events(self):
         """Test deduplication with similar events"""
         engine = DeduplicationEngine(similarity_threshold=0.7)
@@ -353,7 +530,149 @@ class TestDeduplicationEngine:
         # Should not merge any events
         assert len(result.unique_events) == 3
         assert len(result.merge_groups) == 0
-    
+
+    def test_deduplicate_with_blocking(self, monkeypatch):
+        """Blocked events are only compared when they share a key."""
+        from cyber_data_collector.processing import deduplication_v2
+
+        monkeypatch.setattr(deduplication_v2, "BLOCKING_MIN_EVENTS", 1)
+        engine = DeduplicationEngine(
+            similarity_threshold=0.7,
+            block_key_fn=deduplication_v2.title_token_block_keys,
+        )
+        compared = []
+        original_same_entity = engine._same_entity
+
+        def spy_same_entity(event1, event2):
+            compared.append((event1.event_id, event2.event_id))
+            return original_same_entity(event1, event2)
+
+        monkeypatch.setattr(engine, "_same_entity", spy_same_entity)
+
+        events = [
+            CyberEvent(event_id="1", title="Optus Data Breach", event_date=date(2023, 1, 1)),
+            CyberEvent(event_id="2", title="Medibank Ransomware Attack", event_date=date(2023, 1, 2),
+                       victim_organization_name="Medibank Private Limited"),
+            CyberEvent(event_id="3", title="Optus Security Incident", event_date=date(2023, 1, 2)),
+            CyberEvent(event_id="4", title="Health insurer extortion", event_date=date(2023, 1, 2),
+                       victim_organization_name="Medibank Private"),
+        ]
+
+        result = engine.deduplicate(events)
+
+        assert sorted(compared) == [("1", "3"), ("2", "4")]
+        assert len(result.unique_events) == 2
+        assert len(result.merge_groups) == 2
+
+    def test_uncertain_pairs_reach_arbiter_in_one_batch(self, monkeypatch):
+        """Each anchor's uncertain candidates go to the arbiter together."""
+        from cyber_data_collector.processing.deduplication_v2 import ArbiterDecision
+
+        class StubArbiter:
+            def __init__(self):
+                self.batches = []
+
+            def decide_similarity_batch(self, pairs):
+                self.batches.append([(e1.event_id, e2.event_id) for e1, e2, _ in pairs])
+                return [ArbiterDecision(e2.event_id == "2", 0.9, "stub", score)
+                        for _, e2, score in pairs]
+
+        arbiter = StubArbiter()
+        engine = DeduplicationEngine(similarity_threshold=0.75, llm_arbiter=arbiter)
+        uncertain = SimilarityScore(0.5, 0.5, 0.5, 0.5, 0.5, 0.5, "uncertain")
+        monkeypatch.setattr(engine.similarity_calculator, "calculate_similarity",
+                            lambda e1, e2: uncertain)
+
+        events = [
+            CyberEvent(event_id="1", title="breach exposes customers", event_date=date(2023, 1, 1)),
+            CyberEvent(event_id="2", title="breach hits customers", event_date=date(2023, 2, 1)),
+            CyberEvent(event_id="3", title="breach customers notified", event_date=date(2023, 3, 1)),
+        ]
+
+        result = engine.deduplicate(events)
+
+        assert arbiter.batches[0] == [("1", "2"), ("1", "3")]
+        assert len(result.unique_events) == 2  # 1+2 merged, 3 rejected by the arbiter
+
+    def test_parallel_scoring_matches_serial(self, monkeypatch):
+        """Scoring candidates on a thread pool yields the same groups in the same order."""
+        from cyber_data_collector.processing import deduplication_v2
+
+        monkeypatch.setattr(deduplication_v2, "PARALLEL_MIN_EVENTS", 1)
+        orgs = ["Optus", "Medibank", "Latitude", "Canva", "Dymocks"]
+        events = [
+            CyberEvent(event_id=str(n), title=f"{orgs[n % 5]} data breach report {n % 3}",
+                       event_date=date(2023, 1, 1) + timedelta(days=n * 40))
+            for n in range(30)
+        ]
+
+        def grouping(n_workers):
+            result = DeduplicationEngine(n_workers=n_workers).deduplicate(events)
+            return [
+                (g.master_event.event_id, [e.event_id for e in g.merged_events])
+                for g in result.merge_groups
+            ]
+
+        serial = grouping(1)
+        assert serial
+        assert grouping(4) == serial
+        assert DeduplicationEngine().n_workers == 1  # the pool is opt-in
+
+    @pytest.mark.parametrize("gap_days, expected_unique", [(30, 1), (120, 2)])
+    def test_description_rule_respects_date_window(self, gap_days, expected_unique):
+        """RULE 3 merges on description only within 90 days."""
+        engine = DeduplicationEngine()
+        description = "Attackers accessed the customer database and stole identity documents"
+        events = [
+            CyberEvent(event_id="1", title="Retailer reports intrusion", description=description,
+                       event_date=date(2023, 1, 1)),
+            CyberEvent(event_id="2", title="Cyber criminals claim stolen records", description=description,
+                       event_date=date(2023, 1, 1) + timedelta(days=gap_days)),
+        ]
+
+        result = engine.deduplicate(events)
+
+        assert len(result.unique_events) == expected_unique
+
+    def test_similarity_memoised_within_run(self, monkeypatch):
+        """A pair is scored once per run regardless of argument order."""
+        engine = DeduplicationEngine()
+        calls = []
+        original = engine.similarity_calculator.calculate_similarity
+
+        def counting(event1, event2):
+            calls.append((event1.event_id, event2.event_id))
+            return original(event1, event2)
+
+        monkeypatch.setattr(engine.similarity_calculator, "calculate_similarity", counting)
+        event1 = CyberEvent(event_id="a", title="Optus Data Breach", event_date=date(2023, 1, 1))
+        event2 = CyberEvent(event_id="b", title="Optus Security Incident", event_date=date(2023, 1, 2))
+
+        engine._similarity_cache = {}
+        first = engine._calculate_event_similarity(event1, event2)
+        second = engine._calculate_event_similarity(event2, event1)
+        assert first is second
+        assert len(calls) == 1
+
+        engine.deduplicate([event1, event2])
+        assert engine._similarity_cache is None
+
+    def test_minhash_lsh_block_keys(self):
+        """Near-duplicate texts share an LSH band; unrelated texts do not."""
+        from cyber_data_collector.processing.deduplication_v2 import minhash_lsh_block_keys
+
+        block_keys = minhash_lsh_block_keys(threshold=0.5)
+        optus_a = CyberEvent(event_id="1", title="Optus data breach exposes 9.8 million customers",
+                             summary="Optus confirmed a cyberattack exposing customer records")
+        optus_b = CyberEvent(event_id="2", title="Optus data breach exposes 10 million customers",
+                             summary="Optus confirmed a cyber attack exposing customer records")
+        medibank = CyberEvent(event_id="3", title="Medibank ransomware extortion",
+                              summary="Hackers demand ransom from health insurer")
+
+        assert set(block_keys(optus_a)) & set(block_keys(optus_b))
+        assert not set(block_keys(optus_a)) & set(block_keys(medibank))
+        assert block_keys(CyberEvent(event_id="4", title="")) == []
+
     def test_select_master_event(self):
         """Test master event selection logic"""
         engine = DeduplicationEngine()
@@ -379,6 +698,13 @@ class TestDeduplicationEngine:
         # Should select the event with more complete data
         assert master.event_id == "2"
     
+    def test_select_master_event_tie_keeps_first(self):
+        """Equally complete events resolve to the earliest in the group."""
+        engine = DeduplicationEngine()
+        events = [CyberEvent(event_id=str(n), title=f"Event {n}", severity="High") for n in range(3)]
+
+        assert engine._select_master_event(events).event_id == "0"
+    
     def test_merge_event_data(self):
         """Test merging data from multiple events"""
         engine = DeduplicationEngine()
@@ -418,11 +744,11 @@ class TestDeduplicationStorage:
     @pytest.fixture
     def temp_db(self):
         """Create a temporary database for testing"""
-        with tempfile.NamedTemporaryFile(suffix='.db', delete=False) as f:
-            db_path = f.name
-        
+        db_path = _memory_db_uri()
+        keeper = sqlite3.connect(db_path, uri=True)  # holds the shared in-memory DB open
+
         # Create database with required tables
-        conn = sqlite3.connect(db_path)
+        conn = sqlite3.connect(db_path, uri=True)
         cursor = conn.cursor()
         
         # Create DeduplicatedEvents table
@@ -479,11 +805,11 @@ class TestDeduplicationStorage:
         yield db_path
         
         # Cleanup
-        os.unlink(db_path)
+        keeper.close()
     
     def test_clear_existing_deduplications(self, temp_db):
         """Test clearing existing deduplications"""
-        conn = sqlite3.connect(temp_db)
+        conn = sqlite3.connect(temp_db, uri=True)
         storage = DeduplicationStorage(conn)
         
         # Add some test data
@@ -507,7 +833,7 @@ class TestDeduplicationStorage:
     
     def test_validate_storage_integrity_no_issues(self, temp_db):
         """Test storage integrity validation with no issues"""
-        conn = sqlite3.connect(temp_db)
+        conn = sqlite3.connect(temp_db, uri=True)
         storage = DeduplicationStorage(conn)
         
         errors = storage.validate_storage_integrity()
@@ -523,7 +849,7 @@ class TestDeduplicationStorage:
         Identity keys on master_enriched_event_id, which is assigned once and
         never rewritten - not on the title, which is mutable display metadata.
         """
-        conn = sqlite3.connect(temp_db)
+        conn = sqlite3.connect(temp_db, uri=True)
         storage = DeduplicationStorage(conn)
 
         cursor = conn.cursor()
@@ -545,6 +871,36 @@ class TestDeduplicationStorage:
         assert any(error.error_type == "DUPLICATE_EVENT" for error in errors)
         conn.close()
 
+    def test_validate_storage_integrity_orphaned_rows(self, temp_db):
+        """Map and cluster rows pointing at missing events are both reported."""
+        conn = sqlite3.connect(temp_db, uri=True)
+        storage = DeduplicationStorage(conn)
+
+        cursor = conn.cursor()
+        cursor.execute(
+            "INSERT INTO DeduplicatedEvents (deduplicated_event_id, master_enriched_event_id, title) "
+            "VALUES ('id1', 'master1', 'Kept')"
+        )
+        cursor.execute(
+            "INSERT INTO EventDeduplicationMap (map_id, deduplicated_event_id) VALUES ('m1', 'id1')"
+        )
+        cursor.execute(
+            "INSERT INTO EventDeduplicationMap (map_id, deduplicated_event_id) VALUES ('m2', 'gone')"
+        )
+        for cluster_id in ('c1', 'c2'):
+            cursor.execute(
+                "INSERT INTO DeduplicationClusters (cluster_id, deduplicated_event_id, "
+                "deduplication_timestamp) VALUES (?, 'gone', '2023-01-01')",
+                (cluster_id,),
+            )
+        conn.commit()
+
+        errors = {e.error_type: e for e in storage.validate_storage_integrity()}
+
+        assert errors["ORPHANED_MAPPINGS"].context["orphaned_count"] == 1
+        assert errors["ORPHANED_CLUSTERS"].context["orphaned_count"] == 2
+        conn.close()
+
     def test_shared_title_and_date_is_not_a_duplicate(self, temp_db):
         """Distinct incidents may share a title and date.
 
@@ -552,7 +908,7 @@ class TestDeduplicationStorage:
         alarms on placeholder titles ("Untitled Event") and made titles
         impossible to correct.
         """
-        conn = sqlite3.connect(temp_db)
+        conn = sqlite3.connect(temp_db, uri=True)
         storage = DeduplicationStorage(conn)
 
         cursor = conn.cursor()
@@ -571,9 +927,32 @@ class TestDeduplicationStorage:
         assert not any(error.error_type == "DUPLICATE_EVENT" for error in errors)
         conn.close()
     
+    def test_remove_duplicate_events_bloom_precheck_matches_exact(self, temp_db, monkeypatch):
+        """The Bloom pre-check path must skip exactly what the set path skips."""
+        from cyber_data_collector.storage import deduplication_storage
+
+        conn = sqlite3.connect(temp_db, uri=True)
+        storage = DeduplicationStorage(conn)
+        events = [
+            CyberEvent(event_id=f"e{i}", title=title, event_date=date(2024, 1, day))
+            for i, (title, day) in enumerate([
+                ("Optus breach", 1), ("OPTUS breach ", 1), ("Optus breach", 2),
+                ("Medibank hack", 3), ("Medibank hack", 3), ("Medibank hack", 3),
+            ])
+        ]
+
+        expected = storage._remove_duplicate_events(events)
+        monkeypatch.setattr(deduplication_storage, "BLOOM_PRECHECK_MIN_EVENTS", 1)
+        unique, skipped = storage._remove_duplicate_events(events)
+
+        assert [e.event_id for e in unique] == ["e0", "e2", "e3"]
+        assert [e.event_id for e in unique] == [e.event_id for e in expected[0]]
+        assert skipped == expected[1]
+        conn.close()
+
     def test_get_deduplication_statistics(self, temp_db):
         """Test getting deduplication statistics"""
-        conn = sqlite3.connect(temp_db)
+        conn = sqlite3.connect(temp_db, uri=True)
         storage = DeduplicationStorage(conn)
         
         # Add some test data
@@ -609,11 +988,11 @@ class TestIntegration:
     @pytest.fixture
     def temp_db(self):
         """Create a temporary database for testing"""
-        with tempfile.NamedTemporaryFile(suffix='.db', delete=False) as f:
-            db_path = f.name
-        
+        db_path = _memory_db_uri()
+        keeper = sqlite3.connect(db_path, uri=True)  # holds the shared in-memory DB open
+
         # Create database with required tables
-        conn = sqlite3.connect(db_path)
+        conn = sqlite3.connect(db_path, uri=True)
         cursor = conn.cursor()
         
         # Create DeduplicatedEvents table
@@ -670,11 +1049,11 @@ class TestIntegration:
         yield db_path
         
         # Cleanup
-        os.unlink(db_path)
+        keeper.close()
     
     def test_end_to_end_deduplication(self, temp_db):
         """Test complete end-to-end deduplication process"""
-        conn = sqlite3.connect(temp_db)
+        conn = sqlite3.connect(temp_db, uri=True)
         storage = DeduplicationStorage(conn)
         
         # Create test events with duplicates
@@ -733,7 +1112,7 @@ class TestIntegration:
     
     def test_idempotency(self, temp_db):
         """Test that running deduplication multiple times produces same result"""
-        conn = sqlite3.connect(temp_db)
+        conn = sqlite3.connect(temp_db, uri=True)
         storage = DeduplicationStorage(conn)
         
         events = [
@@ -899,10 +1278,10 @@ class TestForeignKeyEnforcedStorage:
 
     @pytest.fixture
     def fk_db(self):
-        fd, db_path = tempfile.mkstemp(suffix=".db")
-        os.close(fd)
+        db_path = _memory_db_uri()
+        keeper = sqlite3.connect(db_path, uri=True)  # holds the shared in-memory DB open
 
-        conn = sqlite3.connect(db_path)
+        conn = sqlite3.connect(db_path, uri=True)
         cursor = conn.cursor()
 
         cursor.execute("""
@@ -994,10 +1373,10 @@ class TestForeignKeyEnforcedStorage:
         conn.close()
 
         yield db_path
-        os.unlink(db_path)
+        keeper.close()
 
     def test_store_with_merge_group_under_fk_enforcement(self, fk_db):
-        conn = sqlite3.connect(fk_db)
+        conn = sqlite3.connect(fk_db, uri=True)
         conn.execute("PRAGMA foreign_keys = ON;")  # mirror the live pipeline connection
         storage = DeduplicationStorage(conn)
 
@@ -1062,6 +1441,54 @@ class TestForeignKeyEnforcedStorage:
 
         conn.close()
 
+    def test_store_records_source_provenance_in_batch(self, fk_db):
+        """Every member with a source URL gets a DeduplicatedEventSources row."""
+        conn = sqlite3.connect(fk_db, uri=True)
+        conn.execute("PRAGMA foreign_keys = ON;")
+        for column in ("source_url TEXT", "discovered_at TIMESTAMP",
+                       "raw_description TEXT", "raw_content TEXT"):
+            conn.execute(f"ALTER TABLE RawEvents ADD COLUMN {column}")
+        conn.execute("""
+            CREATE TABLE DeduplicatedEventSources (
+                deduplicated_event_id TEXT NOT NULL,
+                source_url TEXT NOT NULL,
+                source_type TEXT,
+                credibility_score REAL,
+                content_snippet TEXT,
+                discovered_at TIMESTAMP,
+                UNIQUE(deduplicated_event_id, source_url)
+            )
+        """)
+        conn.execute("UPDATE RawEvents SET source_url = 'https://a.example/1', "
+                     "raw_description = 'first report' WHERE raw_event_id = 'raw-1'")
+        conn.execute("UPDATE RawEvents SET source_url = 'https://b.example/2' "
+                     "WHERE raw_event_id = 'raw-2'")
+        conn.commit()
+        storage = DeduplicationStorage(conn)
+
+        events = [
+            CyberEvent(event_id="enr-1", title="Optus Data Breach", event_date=date(2023, 1, 1)),
+            CyberEvent(event_id="enr-2", title="Optus Data Breach Incident", event_date=date(2023, 1, 2)),
+            CyberEvent(event_id="enr-3", title="Telstra Network Outage", event_date=date(2023, 1, 3)),
+        ]
+        result = DeduplicationEngine(similarity_threshold=0.7).deduplicate(events)
+        storage.store_deduplication_result(result)
+
+        rows = conn.execute("""
+            SELECT de.master_enriched_event_id, s.source_url, s.content_snippet, s.discovered_at
+            FROM DeduplicatedEventSources s
+            JOIN DeduplicatedEvents de USING (deduplicated_event_id)
+            ORDER BY s.source_url
+        """).fetchall()
+
+        # raw-3 has no URL, so Telstra contributes no source row; both Optus
+        # URLs land on the one merged event.
+        assert [r[1] for r in rows] == ["https://a.example/1", "https://b.example/2"]
+        assert len({r[0] for r in rows}) == 1
+        assert rows[0][2] == "first report"
+        assert all(r[3] for r in rows)
+        conn.close()
+
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -8,9 +8,12 @@ fuses two organisations' incident histories.
 
 from __future__ import annotations
 
+import sqlite3
+
 import pytest
 
 from cyber_data_collector.dedup.entity_merge import (
+    canonical_groups,
     distinctive_core,
     initialism,
     is_acronym_of,
@@ -118,3 +121,19 @@ def test_preferred_name_keeps_genuine_acronyms():
     """"ANZ" is not shouting; it is the organisation's name."""
     usage = {"ANZ": 12, "anz": 1}
     assert preferred_name(list(usage), usage) == "ANZ"
+
+
+def test_canonical_groups_chain_through_shared_core():
+    """"Genea Fertility" and "Genea IVF" meet only through "Genea"."""
+    conn = sqlite3.connect(":memory:")
+    conn.executescript("""
+        CREATE TABLE EntitiesV2 (entity_id INTEGER PRIMARY KEY, entity_name TEXT, entity_kind TEXT);
+        CREATE TABLE EnrichedEventEntities (enriched_event_id TEXT, entity_id INTEGER);
+    """)
+    names = ["Genea Fertility", "Genea IVF", "Genea", "Qantas", "Qantas Airways", "Optus"]
+    conn.executemany("INSERT INTO EntitiesV2 (entity_name) VALUES (?)", [(n,) for n in names])
+    conn.executemany("INSERT INTO EnrichedEventEntities VALUES ('e', ?)", [(3,), (3,), (4,), (4,)])
+
+    groups = {keep: sorted(drop) for keep, drop in canonical_groups(conn)}
+
+    assert groups == {"Genea": ["Genea Fertility", "Genea IVF"], "Qantas": ["Qantas Airways"]}
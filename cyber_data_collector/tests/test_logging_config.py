@@ -0,0 +1,50 @@
+"""setup_logging routes console and file output through a queue listener."""
+
+from __future__ import annotations
+
+import io
+import logging
+import threading
+from logging.handlers import QueueHandler
+
+import pytest
+
+from cyber_data_collector.utils import logging_config
+from cyber_data_collector.utils.logging_config import setup_logging
+
+
+@pytest.fixture
+def isolated_root():
+    """Restore the root logger and drop the module's listener afterwards."""
+    root = logging.getLogger()
+    saved_handlers, saved_level = list(root.handlers), root.level
+    root.handlers = []
+    saved_listener = logging_config._listener
+    logging_config._listener = None
+    yield root
+    logging_config._stop_listener()
+    for handler in logging_config._listener.handlers if logging_config._listener else ():
+        handler.close()
+    logging_config._listener = saved_listener
+    root.handlers, root.level = saved_handlers, saved_level
+
+
+def test_records_reach_stream_and_file_via_queue(isolated_root, tmp_path):
+    log_file = tmp_path / "logs" / "run.log"
+    console = io.StringIO()
+    # pytest's capture handler counts as a console handler and would suppress ours
+    isolated_root.handlers = []
+
+    setup_logging(str(log_file), stream_handler=logging.StreamHandler(console))
+    setup_logging(str(log_file))  # second call must not add duplicates
+
+    assert sum(isinstance(h, QueueHandler) for h in isolated_root.handlers) == 1
+    assert len(logging_config._listener.handlers) == 2
+
+    worker = threading.Thread(target=lambda: logging.getLogger("test.worker").warning("from %s", "worker"))
+    worker.start()
+    worker.join()
+    logging_config._stop_listener()
+
+    assert "WARNING - from worker" in console.getvalue()
+    assert "test.worker - WARNING - from worker" in log_file.read_text(encoding="utf-8")
@@ -0,0 +1,206 @@
+"""PDF text extraction from bytes, files and batches of URLs."""
+
+from __future__ import annotations
+
+import asyncio
+
+import httpx
+import pytest
+
+from cyber_data_collector.utils import pdf_extractor
+from cyber_data_collector.utils.pdf_extractor import PDFExtractor
+
+
+def _make_pdf(pages: list[str]) -> bytes:
+    """A minimal text-layer PDF with one line of Helvetica per page."""
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        None,  # page tree, filled in once the page object numbers are known
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    page_ids = []
+    for text in pages:
+        stream = f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET".encode()
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % (len(objects))
+        )
+        page_ids.append(len(objects))
+    kids = b" ".join(b"%d 0 R" % i for i in page_ids)
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, len(page_ids))
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return bytes(out)
+
+
+class _FakeResponse:
+    def __init__(self, body: bytes, status_code: int = 200, headers: dict | None = None):
+        self.content = body
+        self.status_code = status_code
+        self.headers = {"content-type": "application/pdf", **(headers or {})}
+
+    def raise_for_status(self) -> None:
+        pass
+
+    def iter_content(self, chunk_size: int):
+        yield self.content
+
+
+class _FakeSession:
+    """Serves one large PDF; ranged requests get ``prefix`` back with ``range_status``."""
+
+    def __init__(self, full: bytes, prefix: bytes, range_status: int = 206):
+        self.full, self.prefix, self.range_status = full, prefix, range_status
+        self.ranges = []
+
+    def get(self, url, headers=None, **kwargs):
+        self.ranges.append((headers or {}).get("Range"))
+        if headers and "Range" in headers:
+            content_range = {"Content-Range": f"bytes 0-{len(self.prefix) - 1}/5000000"}
+            return _FakeResponse(self.prefix, status_code=self.range_status, headers=content_range)
+        return _FakeResponse(self.full)
+
+    def close(self) -> None:
+        pass
+
+
+PAGE_TEXT = "Notifiable data breach report for the quarter covering Australian entities"
+
+
+@pytest.fixture
+def extractor():
+    with PDFExtractor() as pdf_extractor:
+        yield pdf_extractor
+
+
+@pytest.mark.parametrize("url,expected", [
+    ("https://www.qld.gov.au/file.PDF", True),
+    ("https://example.com/pdf/annual-report", True),
+    ("https://example.com/get?ContentType=application/pdf", True),
+    ("https://example.com/document?filetype=pdf", True),
+    ("https://example.com/article.html", False),
+    ("https://example.com/file.pdf.html", False),
+])
+def test_is_pdf_url(extractor, url, expected):
+    assert extractor.is_pdf_url(url) is expected
+
+
+def test_extract_from_bytes_reads_every_page(extractor):
+    result = extractor.extract_from_bytes(_make_pdf([PAGE_TEXT, PAGE_TEXT]))
+
+    assert result["success"]
+    assert result["pages"] == 2
+    assert result["text"].count("Notifiable data breach") == 2
+
+
+def test_extract_from_urls_async_keeps_input_order(extractor):
+    pdf = _make_pdf([PAGE_TEXT, PAGE_TEXT])
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/missing.pdf":
+            return httpx.Response(404)
+        if request.url.path == "/page.html":
+            return httpx.Response(200, headers={"content-type": "text/html"}, content=b"<html></html>")
+        return httpx.Response(200, headers={"content-type": "application/pdf"}, content=pdf)
+
+    urls = [
+        "https://example.com/report.pdf",
+        "https://example.com/missing.pdf",
+        "https://example.com/page.html",
+    ]
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            return await extractor.extract_from_urls_async(urls, client=client)
+
+    results = asyncio.run(run())
+
+    assert [r["success"] for r in results] == [True, False, False]
+    assert "Failed to download PDF" in results[1]["error"]
+    assert "does not appear to be a PDF" in results[2]["error"]
+
+
+def test_extract_many_matches_serial_extraction(extractor, tmp_path):
+    paths = []
+    for index in range(3):
+        path = tmp_path / f"report_{index}.pdf"
+        path.write_bytes(_make_pdf([PAGE_TEXT] * (index + 2)))
+        paths.append(str(path))
+    paths.append(str(tmp_path / "absent.pdf"))
+
+    results = extractor.extract_many(paths, max_workers=2)
+
+    assert [r["pages"] for r in results] == [2, 3, 4, 0]
+    assert results == [extractor.extract_from_file(path) for path in paths]
+
+
+def test_max_chars_stops_reading_further_pages(extractor):
+    pdf = _make_pdf([PAGE_TEXT] * 5)
+
+    full = extractor.extract_from_bytes(pdf)
+    partial = extractor.extract_from_bytes(pdf, max_chars=2 * len(PAGE_TEXT))
+
+    assert (full["pages"], full["pages_processed"]) == (5, 5)
+    assert (partial["pages"], partial["pages_processed"]) == (5, 2)
+    assert partial["text"].count("Notifiable data breach") == 2
+
+
+def test_batch_apis_forward_max_chars(extractor, tmp_path):
+    pdf = _make_pdf([PAGE_TEXT] * 5)
+    paths = []
+    for index in range(2):
+        path = tmp_path / f"report_{index}.pdf"
+        path.write_bytes(pdf)
+        paths.append(str(path))
+
+    async def run():
+        transport = httpx.MockTransport(
+            lambda request: httpx.Response(200, headers={"content-type": "application/pdf"}, content=pdf)
+        )
+        async with httpx.AsyncClient(transport=transport) as client:
+            return await extractor.extract_from_urls_async(
+                ["https://example.com/report.pdf"], client=client, max_chars=2 * len(PAGE_TEXT)
+            )
+
+    from_files = extractor.extract_many(paths, max_workers=2, max_chars=2 * len(PAGE_TEXT))
+    from_urls = asyncio.run(run())
+
+    assert [r["pages_processed"] for r in from_files + from_urls] == [2, 2, 2]
+
+
+def test_large_pdf_is_read_from_a_ranged_prefix(extractor, monkeypatch):
+    monkeypatch.setattr(pdf_extractor, "_PYMUPDF_AVAILABLE", True)
+    pdf = _make_pdf([PAGE_TEXT] * 3)
+    extractor.session = _FakeSession(full=pdf, prefix=pdf)
+
+    result = extractor.extract_from_url("https://example.com/annual-report.pdf", max_chars=2 * len(PAGE_TEXT))
+
+    assert result["success"] and result["partial"]
+    assert result["pages_processed"] == 2
+    assert extractor.session.ranges == ["bytes=0-2097151"]
+
+
+@pytest.mark.parametrize("prefix,range_status", [
+    (b"%PDF-1.4\n", 206),                      # unparseable prefix
+    (_make_pdf([PAGE_TEXT] * 3), 206),         # parsed, but under the character budget
+    (b"", 416),                                # server refused the range
+])
+def test_prefix_falls_back_to_full_download(extractor, monkeypatch, prefix, range_status):
+    monkeypatch.setattr(pdf_extractor, "_PYMUPDF_AVAILABLE", True)
+    pdf = _make_pdf([PAGE_TEXT] * 3)
+    extractor.session = _FakeSession(full=pdf, prefix=prefix, range_status=range_status)
+
+    result = extractor.extract_from_url("https://example.com/annual-report.pdf")
+
+    assert result["success"] and "partial" not in result
+    assert result["pages_processed"] == 3
+    assert extractor.session.ranges == ["bytes=0-2097151", None]
@@ -0,0 +1,108 @@
+"""Sliding-window behaviour of RateLimiter."""
+
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from cyber_data_collector.utils import rate_limiter as rate_limiter_module
+from cyber_data_collector.utils.rate_limiter import RateLimiter
+
+
+class FakeClock:
+    """Monotonic clock that only moves when the limiter sleeps."""
+
+    def __init__(self) -> None:
+        self.now = 1000.0
+        self.sleeps: list[float] = []
+
+    def time(self) -> float:
+        return self.now
+
+    async def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    # Replace the module's references only, leaving the real event loop alone
+    monkeypatch.setattr(rate_limiter_module, "asyncio", SimpleNamespace(
+        sleep=fake.sleep, Lock=asyncio.Lock, get_running_loop=lambda: fake,
+    ))
+    return fake
+
+
+@pytest.mark.asyncio
+async def test_per_second_limit_spaces_requests(clock):
+    limiter = RateLimiter()
+    limiter.set_limit("svc", per_minute=100, per_second=2)
+
+    await limiter.wait("svc")
+    clock.now += 0.25
+    await limiter.wait("svc")
+    await limiter.wait("svc")
+
+    # Sleeps only until the older of the two requests in the window expires
+    assert clock.sleeps == [pytest.approx(0.75)]
+    assert len(limiter.request_history["svc"]) == 3
+
+
+@pytest.mark.asyncio
+async def test_fractional_per_second_limit_waits_for_latest_request(clock):
+    limiter = RateLimiter()
+    limiter.set_limit("svc", per_minute=100, per_second=0.5)
+
+    await limiter.wait("svc")
+    clock.now += 0.4
+    await limiter.wait("svc")
+
+    assert clock.sleeps == [pytest.approx(0.6)]
+
+
+@pytest.mark.asyncio
+async def test_expired_requests_leave_the_minute_window(clock):
+    limiter = RateLimiter()
+    limiter.set_limit("svc", per_minute=2, per_second=10)
+
+    await limiter.wait("svc")
+    await limiter.wait("svc")
+    clock.now += 61
+    await limiter.wait("svc")
+
+    assert clock.sleeps == []
+    assert list(limiter.request_history["svc"]) == [clock.now]
+
+
+@pytest.mark.asyncio
+async def test_unknown_service_is_not_limited(clock):
+    limiter = RateLimiter()
+
+    for _ in range(5):
+        await limiter.wait("unlisted")
+
+    assert clock.sleeps == []
+
+
+@pytest.mark.asyncio
+async def test_history_is_bounded_for_unlimited_services(clock):
+    limiter = RateLimiter()
+
+    for _ in range(rate_limiter_module.MIN_HISTORY_LENGTH + 10):
+        await limiter.wait("unlisted")
+
+    assert len(limiter.request_history["unlisted"]) == rate_limiter_module.MIN_HISTORY_LENGTH
+
+
+@pytest.mark.asyncio
+async def test_raising_the_limit_keeps_history(clock):
+    limiter = RateLimiter()
+    await limiter.wait("openai")
+
+    limiter.set_limit("openai", per_minute=500)
+
+    assert limiter.request_history["openai"].maxlen == 500
+    assert list(limiter.request_history["openai"]) == [clock.now]
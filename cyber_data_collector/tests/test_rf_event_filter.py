@@ -0,0 +1,66 @@
+"""Batch scoring in RfEventFilter matches the per-event path."""
+
+from __future__ import annotations
+
+import shutil
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip("sklearn")
+
+from cyber_data_collector.filtering.rf_event_filter import RfEventFilter
+
+
+MODEL_DIR = Path(__file__).resolve().parents[2] / "machine_learning_filter"
+
+
+@pytest.fixture(scope="module")
+def rf_filter(tmp_path_factory):
+    if not (MODEL_DIR / "random_forest_filter.pkl").exists():
+        pytest.skip("trained filter models not present")
+    # A copy, because loading re-pickles models saved by another sklearn version
+    model_dir = tmp_path_factory.mktemp("models")
+    for path in MODEL_DIR.glob("*.pkl"):
+        shutil.copy(path, model_dir)
+    return RfEventFilter(str(model_dir))
+
+
+def test_predict_batch_matches_should_keep_event(rf_filter):
+    events = pd.DataFrame({
+        "source_type": ["GDELT", "Perplexity", "RSS"],
+        "raw_title": ["Medibank ransomware attack exposes customer data", "Cricket results", None],
+        "raw_description": ["Hackers stole health records", "", "Council outage"],
+        "raw_content": ["", "Australia won by six wickets", ""],
+        "source_url": ["https://news.com.au/medibank-breach", "https://sport.example/cricket", None],
+    })
+
+    probs = rf_filter.predict_batch(events)
+
+    expected = [
+        rf_filter.should_keep_event(row.source_type, row.raw_title or "", row.raw_description,
+                                    row.raw_content, row.source_url or "").confidence_score
+        for row in events.itertuples()
+    ]
+    assert probs.shape == (3, 2)
+    np.testing.assert_allclose(probs[:, 1], expected)
+    assert rf_filter.predict_batch(events.iloc[:0]).shape == (0, 2)
+
+
+def test_predict_batch_scores_the_training_set_like_should_keep_event(rf_filter):
+    training = MODEL_DIR / "event_training_data.csv"
+    if not training.exists():
+        pytest.skip("training data not present")
+    events = pd.read_csv(training, encoding="utf-8-sig").dropna(subset=["filter_keep"])
+
+    probs = rf_filter.predict_batch(events)
+
+    expected = [
+        rf_filter.should_keep_event(row.source_type, row.raw_title, row.raw_description,
+                                    row.raw_content, row.source_url).confidence_score
+        for row in events.fillna("").itertuples()  # should_keep_event takes strings, not NaN
+    ]
+    assert probs.shape == (len(events), 2)
+    np.testing.assert_allclose(probs[:, 1], expected)
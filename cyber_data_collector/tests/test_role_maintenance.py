@@ -8,6 +8,7 @@ pipeline has several (merge, split, consolidate, legacy review, backfill).
 """
 from __future__ import annotations
 
+import hashlib
 import sqlite3
 
 import pytest
@@ -21,6 +22,7 @@ from cyber_data_collector.dedup.role_maintenance import (
     mark_classified,
     member_signature,
     signature_for_members,
+    signature_matches,
     stale_event_ids,
     staleness_report,
 )
@@ -114,6 +116,25 @@ def test_signature_ignores_blank_ids():
     assert signature_for_members(["a", None, ""]) == signature_for_members(["a"])
 
 
+def test_legacy_sha256_signatures_still_match():
+    """Signatures stored before the BLAKE2b switch do not all turn stale."""
+    legacy = hashlib.sha256(b"a|b").hexdigest()[:32]
+
+    assert signature_matches(legacy, ["b", "a"])
+    assert not signature_matches(legacy, ["a", "b", "c"])
+    assert signature_matches(signature_for_members(["a", "b"]), ["b", "a"])
+
+
+def test_stored_legacy_signature_counts_as_current(conn):
+    ded, _ = _add_event(conn, "a")
+    members = [r[0] for r in conn.execute(
+        "SELECT enriched_event_id FROM EventDeduplicationMap WHERE deduplicated_event_id = ?", (ded,)
+    )]
+    mark_classified(conn, ded, signature=hashlib.sha256("|".join(sorted(members)).encode()).hexdigest()[:32])
+
+    assert ded not in stale_event_ids(conn)
+
+
 # --------------------------------------------------------------------------
 # Staleness
 # --------------------------------------------------------------------------
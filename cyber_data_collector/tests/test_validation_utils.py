@@ -1,11 +1,16 @@
 from __future__ import annotations
 
+import json
+import uuid
+from datetime import date, datetime
+
 import pytest
 
 import cyber_data_collector.utils.validation as _val_module
 from cyber_data_collector.utils.validation import (
     safe_json_dumps,
     validate_and_correct_enrichment_data,
+    validate_and_correct_enrichment_data_inplace,
     validate_enrichment_data_for_storage,
     validate_records_affected,
 )
@@ -29,6 +34,76 @@ def test_validate_records_affected_honors_org_thresholds() -> None:
     assert validate_records_affected(900_000_000, event_title="Google incident") == 900_000_000
 
 
+def test_validate_records_affected_skips_org_lookup_below_small_org_cap(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    def fail(*texts: str) -> int:
+        raise AssertionError("organisation lookup should be skipped")
+
+    monkeypatch.setattr(_val_module._ORG_INDEX, "tags_in", fail)
+
+    assert validate_records_affected(20_000_000, event_title="Small Local Org") == 20_000_000
+
+
+@pytest.mark.parametrize("value,org_tags,expected", [
+    (25_000_000, 0, _val_module._TIER_OVER_SMALL_ORG_MAX),
+    (25_000_000, _val_module.ORG_GOVERNMENT, _val_module._TIER_OK),
+    (35_000_000, _val_module.ORG_MAJOR_AU, _val_module._TIER_OVER_LARGE_AU_ORG_MAX),
+    (35_000_000, _val_module.ORG_MAJOR_AU | _val_module.ORG_INTERNATIONAL, _val_module._TIER_OK),
+    (2_000_000_000, _val_module.ORG_INTERNATIONAL, _val_module._TIER_OVER_MAX_RECORDS),
+])
+def test_records_tier_check(value: int, org_tags: int, expected: int) -> None:
+    assert _val_module._records_tier_check(value, org_tags) == expected
+
+
+@pytest.mark.parametrize("use_automaton", [True, False])
+def test_keyword_index_picks_up_runtime_additions(
+    monkeypatch: pytest.MonkeyPatch, use_automaton: bool
+) -> None:
+    if not use_automaton:
+        monkeypatch.setattr(_val_module, "ahocorasick", None)
+    au, gov = _val_module.ORG_MAJOR_AU, _val_module.ORG_GOVERNMENT
+    index = _val_module._OrgKeywordIndex({au: frozenset({"telstra"}), gov: frozenset({"department of"})})
+
+    assert index.tags_in("optus outage", "telstra corporation") == au
+    assert index.tags_in("telstra and the department of home affairs") == au | gov
+    assert index.tags_in("regional council", "") == 0
+
+    index.add("regional council", gov)
+    assert index.tags_in("regional council") == gov
+
+    index.add("st. george", au)
+    assert index.tags_in("st. george bank customers") == au
+    assert index.tags_in("stx george") == 0
+
+
+def test_keyword_index_memoises_scans_until_a_keyword_is_added() -> None:
+    au = _val_module.ORG_MAJOR_AU
+    index = _val_module._OrgKeywordIndex({au: frozenset({"telstra"})})
+
+    assert index.tags_in("optus breach", "") == 0
+    assert index.tags_in("optus breach", "") == 0
+    assert index._cached_scan.cache_info().hits == 1
+
+    index.add("optus", au)
+    assert index.tags_in("optus breach", "") == au
+    assert index._cached_scan.cache_info().misses == 1
+
+
+def test_validate_records_affected_batch_matches_scalar() -> None:
+    values = [None, 10, 500, 20_000_000, 25_000_000, 25_000_000, 35_000_000, 50_000_000, 2_000_000_000]
+    titles = [
+        "Event", "Event", "Event", "Local clinic breach", "Local clinic breach",
+        "Telstra breach", "Optus breach", "Ticketmaster breach", "Facebook scrape",
+    ]
+    victims = ["", "", "", "", "", "", "", "University of Melbourne", ""]
+
+    result = _val_module.validate_records_affected_batch(values, titles, victims)
+
+    expected = [validate_records_affected(v, t, o) for v, t, o in zip(values, titles, victims)]
+    assert result.tolist() == [-1 if e is None else e for e in expected]
+
+
 def test_validate_and_correct_enrichment_data_validates_input_type() -> None:
     with pytest.raises(TypeError):
         validate_and_correct_enrichment_data("not-a-dict")  # type: ignore[arg-type]
@@ -40,6 +115,16 @@ def test_validate_and_correct_enrichment_data_updates_records_affected() -> None
     assert result["records_affected"] is None
 
 
+def test_validate_and_correct_enrichment_data_copies_but_inplace_mutates() -> None:
+    payload = {"records_affected": 25, "severity": "high"}
+
+    copied = validate_and_correct_enrichment_data(payload, event_title="Example Event")
+    assert copied is not payload and payload["records_affected"] == 25
+
+    assert validate_and_correct_enrichment_data_inplace(payload, event_title="Example Event") is payload
+    assert payload == {"records_affected": None, "severity": "high"}
+
+
 def test_validate_enrichment_data_rejects_event_when_perplexity_says_not_cyber(
     monkeypatch: pytest.MonkeyPatch,
 ) -> None:
@@ -118,6 +203,44 @@ def test_validate_enrichment_data_preserves_event_when_perplexity_confirms_cyber
     assert result["is_specific_event"] is True
 
 
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_safe_json_dumps_round_trips_with_either_backend(
+    monkeypatch: pytest.MonkeyPatch, use_orjson: bool
+) -> None:
+    if use_orjson and _val_module.orjson is None:
+        pytest.skip("orjson not installed")
+    if not use_orjson:
+        monkeypatch.setattr(_val_module, "orjson", None)
+
+    payload = {"victim": "Qantas", 1: [2 ** 70, 3.5], "when": date(2024, 1, 2)}
+    result = json.loads(safe_json_dumps(payload, "payload", default=str))
+
+    assert result == {"victim": "Qantas", "1": [2 ** 70, 3.5], "when": "2024-01-02"}
+    with pytest.raises(TypeError):
+        safe_json_dumps({"tags": {"a"}}, "bad payload")
+
+
+@pytest.mark.parametrize("kwargs", [{}, {"indent": 2}, {"indent": 2, "sort_keys": True}, {"default": str},
+                                    {"indent": 2, "default": str}, {"separators": (",", ":")},
+                                    {"indent": 2, "ensure_ascii": False}])
+def test_safe_json_dumps_output_is_identical_to_json_dumps(kwargs) -> None:
+    payloads = [
+        {"title": "Zürich breach", "records": [1, 2.5, None, True], "nested": {"b": "x", "a": []}},
+        {"score": float("nan"), "big": 1e16, "tiny": 1e-7},
+        {"when": datetime(2024, 1, 2, 3, 4, 5), "id": uuid.UUID(int=7)},
+        ["plain", "ascii", {"ok": 1, "share": 0.5}],
+        "del\x7f",
+    ]
+    for payload in payloads:
+        try:
+            expected = json.dumps(payload, **kwargs)
+        except TypeError:
+            with pytest.raises(TypeError):
+                safe_json_dumps(payload, "payload", **kwargs)
+            continue
+        assert safe_json_dumps(payload, "payload", **kwargs) == expected
+
+
 def test_safe_json_dumps_validates_context_and_serialization() -> None:
     assert safe_json_dumps({"ok": True}, "test payload") == '{"ok": true}'
 
@@ -126,3 +249,19 @@ def test_safe_json_dumps_validates_context_and_serialization() -> None:
 
     with pytest.raises(TypeError):
         safe_json_dumps({"ok": True}, context=123)  # type: ignore[arg-type]
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_safe_json_dumps_honours_sort_keys_with_either_backend(
+    monkeypatch: pytest.MonkeyPatch, use_orjson: bool
+) -> None:
+    if use_orjson and _val_module.orjson is None:
+        pytest.skip("orjson not installed")
+    if not use_orjson:
+        monkeypatch.setattr(_val_module, "orjson", None)
+
+    payload = {"victim": "Tāmaki Health", "affected": 500}
+    result = safe_json_dumps(payload, "payload", sort_keys=True)
+
+    assert json.loads(result) == payload
+    assert result.index('"affected"') < result.index('"victim"')
@@ -1,9 +1,11 @@
 from __future__ import annotations
 
+import functools
 import logging
 import os
 from pathlib import Path
-from typing import Dict, Optional, Union
+from types import MappingProxyType
+from typing import Dict, Mapping, Optional, Union
 from urllib.parse import urlparse
 
 from dotenv import load_dotenv
@@ -17,13 +19,22 @@ class ConfigManager:
     def __init__(self, env_path: Union[str, os.PathLike] = ".env") -> None:
         self.env_path = Path(env_path)
         self._config: Dict[str, Optional[str]] = {}
+        self._view: Mapping[str, Optional[str]] = MappingProxyType(self._config)
+        self._loaded = False
 
-    def load(self) -> Dict[str, Optional[str]]:
-        """Load environment configuration from the provided .env file."""
+    def load(self) -> Mapping[str, Optional[str]]:
+        """Load environment configuration from the provided .env file.
+
+        The .env file and environment are read once per manager; later calls
+        return the same read-only view.
+        """
+
+        if self._loaded:
+            return self._view
 
         load_dotenv(dotenv_path=self.env_path, override=False)
         database_url = os.getenv("DATABASE_URL", "sqlite:///instance/cyber_events.db")
-        self._config = {
+        self._config.update({
             "GDELT_PROJECT_ID": os.getenv("GDELT_PROJECT_ID"),
             "GOOGLE_CLOUD_PROJECT": os.getenv("GOOGLE_CLOUD_PROJECT"),
             "GOOGLE_APPLICATION_CREDENTIALS": os.getenv("GOOGLE_APPLICATION_CREDENTIALS"),
@@ -33,23 +44,25 @@ class ConfigManager:
             "OPENAI_API_KEY": os.getenv("OPENAI_API_KEY"),
             "DATABASE_URL": database_url,
             "DATABASE_PATH": self._resolve_database_path(database_url),
-        }
+        })
+        self._loaded = True
 
         if not self._config.get("OPENAI_API_KEY"):
             logger.warning("Required configuration key OPENAI_API_KEY is not set")
         if not self._config.get("PERPLEXITY_API_KEY"):
             logger.info("Recommended configuration key PERPLEXITY_API_KEY is not set")
 
-        return self._config.copy()
+        return self._view
 
     def get(self, key: str, default: Optional[str] = None) -> Optional[str]:
         """Retrieve a configuration value with an optional default."""
 
-        if not self._config:
+        if not self._loaded:
             self.load()
         return self._config.get(key, default)
 
     @staticmethod
+    @functools.lru_cache(maxsize=None)
     def _resolve_database_path(database_url: Optional[str]) -> str:
         """Resolve a filesystem path from a database URL or path string."""
 
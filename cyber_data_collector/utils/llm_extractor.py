@@ -9,6 +9,8 @@ import instructor
 import openai
 from pydantic import BaseModel, Field
 
+logger = logging.getLogger(__name__)
+
 # Initialize the OpenAI client for instructor
 # This will use the OPENAI_API_KEY environment variable
 client = instructor.patch(openai.OpenAI())
@@ -35,7 +37,7 @@ def extract_event_details_with_llm(text_content: str, model: str = "gpt-4o-mini"
         A Pydantic object containing the extracted details, or None if extraction fails.
     """
     if not text_content or not text_content.strip():
-        print("Text content is empty, skipping LLM extraction.")
+        logger.info("Text content is empty, skipping LLM extraction.")
         return None
 
     # Truncate content to fit within model context window, leaving room for prompt and response
@@ -61,8 +63,7 @@ def extract_event_details_with_llm(text_content: str, model: str = "gpt-4o-mini"
     )
 
     try:
-        logger = logging.getLogger(__name__)
-        logger.debug(f"Calling LLM ({model}) for analysis...")
+        logger.debug("Calling LLM (%s) for analysis...", model)
         details = client.chat.completions.create(
             model=model,
             response_model=ExtractedEventDetails,
@@ -75,6 +76,6 @@ def extract_event_details_with_llm(text_content: str, model: str = "gpt-4o-mini"
         )
         logger.debug("LLM analysis successful.")
         return details
-    except Exception as e:
-        print(f"LLM extraction failed: {e}")
+    except Exception:
+        logger.exception("LLM extraction failed")
         return None
@@ -1,9 +1,12 @@
 from __future__ import annotations
 
+import atexit
 import logging
+import queue
 import sys
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
 
 try:
     from tqdm import tqdm as _tqdm
@@ -31,6 +34,74 @@ class TqdmStreamHandler(logging.StreamHandler):
             self.handleError(record)
 
 
+# Log file writes are batched in a 64 KB buffer and flushed whenever the
+# listener has drained the queue, rather than once per record.
+_FILE_BUFFER_SIZE = 64 * 1024
+
+
+class BufferedFileHandler(logging.FileHandler):
+    """File handler that leaves flushing to the queue listener."""
+
+    def _open(self):
+        return open(
+            self.baseFilename,
+            self.mode,
+            buffering=_FILE_BUFFER_SIZE,
+            encoding=self.encoding,
+            errors=getattr(self, "errors", None),
+        )
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            if self.stream is None:
+                self.stream = self._open()
+            self.stream.write(self.format(record) + self.terminator)
+        except Exception:
+            self.handleError(record)
+
+
+class _FlushingQueueListener(QueueListener):
+    """Queue listener that flushes its handlers each time the queue runs dry."""
+
+    def handle(self, record: logging.LogRecord) -> None:
+        super().handle(record)
+        if self.queue.empty():
+            for handler in self.handlers:
+                handler.flush()
+
+
+_listener: Optional[_FlushingQueueListener] = None
+
+
+def _stop_listener() -> None:
+    """Drain queued records and flush the real handlers (registered atexit)."""
+    if _listener is not None and _listener._thread is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            try:
+                handler.flush()
+            except (OSError, ValueError):  # stream already closed at shutdown
+                pass
+
+
+def _attach_to_listener(root_logger: logging.Logger, handlers: List[logging.Handler]) -> None:
+    """Route ``handlers`` through the shared queue listener.
+
+    The root logger only holds a QueueHandler, so a log call from any thread
+    is an enqueue; the stream and file writes happen on the listener thread.
+    """
+    global _listener
+    if _listener is None:
+        log_queue: queue.SimpleQueue = queue.SimpleQueue()
+        _listener = _FlushingQueueListener(log_queue, *handlers, respect_handler_level=True)
+        root_logger.addHandler(QueueHandler(log_queue))
+        atexit.register(_stop_listener)
+    else:
+        _stop_listener()
+        _listener.handlers = _listener.handlers + tuple(handlers)
+    _listener.start()
+
+
 def setup_logging(
     log_file: Optional[str] = None,
     level: int = logging.INFO,
@@ -42,20 +113,25 @@ def setup_logging(
     StreamHandler via ``logging.basicConfig()``.  Rather than bailing out when
     handlers are already present, this function checks for each handler type
     individually so the FileHandler is always registered when requested.
+
+    The handlers added here sit behind a QueueHandler/QueueListener pair, so
+    logging from worker threads never blocks on console or file I/O.
     """
     formatter = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
     root_logger = logging.getLogger()
     root_logger.setLevel(level)
+    existing = list(root_logger.handlers) + list(_listener.handlers if _listener else ())
+    new_handlers: List[logging.Handler] = []
 
     # Add a stream handler only when none exists yet (avoids duplicate console output).
     has_stream = any(
         isinstance(h, logging.StreamHandler) and not isinstance(h, logging.FileHandler)
-        for h in root_logger.handlers
+        for h in existing
     )
     if not has_stream:
         sh = stream_handler or TqdmStreamHandler(sys.stderr)
         sh.setFormatter(formatter)
-        root_logger.addHandler(sh)
+        new_handlers.append(sh)
 
     # Always add the file handler when requested, unless one for the same path
     # is already registered (guards against being called twice with the same file).
@@ -65,9 +141,12 @@ def setup_logging(
         has_file = any(
             isinstance(h, logging.FileHandler)
             and str(Path(h.baseFilename).resolve()) == target
-            for h in root_logger.handlers
+            for h in existing
         )
         if not has_file:
-            fh = logging.FileHandler(log_file, encoding="utf-8")
+            fh = BufferedFileHandler(log_file, encoding="utf-8")
             fh.setFormatter(formatter)
-            root_logger.addHandler(fh)
+            new_handlers.append(fh)
+
+    if new_handlers:
+        _attach_to_listener(root_logger, new_handlers)
@@ -1,9 +1,13 @@
 from __future__ import annotations
 
 import asyncio
-import time
-from collections import defaultdict
-from typing import DefaultDict, Dict, List, Optional
+import math
+from collections import deque
+from typing import Deque, Dict, Optional
+
+# Floor on the per-service history length, which also bounds services with
+# no configured limit
+MIN_HISTORY_LENGTH = 120
 
 
 class RateLimiter:
@@ -21,13 +25,29 @@ class RateLimiter:
             "oaic_detail": {"per_minute": 30, "per_second": 1},
             "openai": {"per_minute": 200, "per_second": 5},
         }
-        self.request_history: DefaultDict[str, List[float]] = defaultdict(list)
+        # Event-loop clock timestamps of requests in the last minute, oldest first
+        self.request_history: Dict[str, Deque[float]] = {}
+        # Created on first use so each lock binds to the loop that awaits it
         self._locks: Dict[str, asyncio.Lock] = {}
 
     def _get_lock(self, service: str) -> asyncio.Lock:
-        if service not in self._locks:
-            self._locks[service] = asyncio.Lock()
-        return self._locks[service]
+        lock = self._locks.get(service)
+        if lock is None:
+            lock = self._locks[service] = asyncio.Lock()
+        return lock
+
+    def _get_history(self, service: str) -> Deque[float]:
+        """Request history for ``service``, bounded to what the limits can inspect.
+
+        The per-minute check never lets more than ``per_minute`` entries
+        accumulate, so a deque of that length loses nothing.
+        """
+        history = self.request_history.get(service)
+        if history is None:
+            limit = self.limits.get(service, {})
+            maxlen = max(math.ceil(limit.get("per_minute", 0)), MIN_HISTORY_LENGTH)
+            history = self.request_history[service] = deque(maxlen=maxlen)
+        return history
 
     def set_limit(self, service: str, per_minute: Optional[float] = None, per_second: Optional[float] = None) -> None:
         limit = self.limits.setdefault(service, {"per_minute": 60, "per_second": 1})
@@ -35,16 +55,23 @@ class RateLimiter:
             limit["per_minute"] = per_minute
         if per_second is not None:
             limit["per_second"] = per_second
+        # Re-bound the history for the new limit, keeping its entries
+        history = self.request_history.pop(service, None)
+        if history is not None:
+            self._get_history(service).extend(history)
 
     async def wait(self, service: str) -> None:
         """Wait for rate limit before making a request."""
         lock = self._get_lock(service)
+        loop = asyncio.get_running_loop()
         async with lock:
             while True:
-                now = time.time()
-                history = self.request_history[service]
-                # Clean old entries
-                history[:] = [req_time for req_time in history if now - req_time < 60]
+                now = loop.time()
+                history = self._get_history(service)
+                # Clean old entries: the deque is time-ordered, so expired
+                # requests are always at the head
+                while history and now - history[0] >= 60:
+                    history.popleft()
 
                 limit = self.limits.get(service)
                 if not limit:
@@ -58,11 +85,23 @@ class RateLimiter:
                         await asyncio.sleep(sleep_time)
                         continue
 
-                # Check per-second limit
-                recent_requests = [req_time for req_time in history if now - req_time < 1]
-                if len(recent_requests) >= limit["per_second"]:
-                    await asyncio.sleep(1)
+                # Check per-second limit, counting back from the newest request.
+                # The window reopens when the ceil(per_second)-th newest request
+                # turns one second old, so sleep exactly until then.
+                if self._count_recent(history, now) >= limit["per_second"]:
+                    blocking = history[-max(1, math.ceil(limit["per_second"]))]
+                    await asyncio.sleep(max(blocking + 1 - now, 0))
                     continue
 
                 history.append(now)
                 return
+
+    @staticmethod
+    def _count_recent(history: Deque[float], now: float) -> int:
+        """Number of requests in the last second, scanning only that tail."""
+        count = 0
+        for req_time in reversed(history):
+            if now - req_time >= 1:
+                break
+            count += 1
+        return count
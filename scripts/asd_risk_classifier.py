@@ -204,7 +204,7 @@ class ASDRiskClassifier:
 
         # Prompt-level cache: hash(prompt+model+temperature) -> classification result
         # Ensures identical reruns skip the API call entirely
-        self._prompt_cache: Dict[str, Dict[str, Any]] = {}
+        self._prompt_cache: Dict[bytes, Dict[str, Any]] = {}
         self._temperature = 0.3  # Default temperature for cache key
     
     def close(self):
@@ -396,10 +396,17 @@ Return your response as a JSON object with this exact structure:
         
         return prompt
     
-    def _prompt_cache_key(self, prompt: str) -> str:
-        """Generate a cache key from prompt + model + temperature."""
-        raw = f"{self.model}|{self._temperature}|{prompt}"
-        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+    def _prompt_cache_key(self, prompt: str) -> bytes:
+        """Generate a cache key from prompt + model + temperature.
+
+        The cache lives only in memory, so the raw 32-byte digest is used
+        rather than its 64-character hex form. The prompt, which runs to
+        several kilobytes, is fed to the hash separately instead of being
+        copied into a concatenated string first; the digest is the same.
+        """
+        digest = hashlib.sha256(f"{self.model}|{self._temperature}|".encode("utf-8"))
+        digest.update(prompt.encode("utf-8"))
+        return digest.digest()
 
     def classify_event(self, event: Dict[str, Any], force_reclassify: bool = False) -> Optional[Dict[str, Any]]:
         """Classify a single event using ChatGPT. Thread-safe."""
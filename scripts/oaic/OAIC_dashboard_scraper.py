@@ -50,6 +50,9 @@ logger = logging.getLogger(__name__)
 
 QUARANTINE_DIR = Path("instance/oaic_debug")
 
+# Deletes every non-alphanumeric ASCII character in one C-level pass
+_ASCII_NON_ALNUM_TABLE = str.maketrans('', '', ''.join(c for c in map(chr, range(128)) if not c.isalnum()))
+
 
 # Run-summary infra (log-capture + end-of-run replay) is shared with
 # pipeline.py / run_full_pipeline.py so all three entry points present
@@ -621,6 +624,8 @@ class OAICDashboardController:
         ``"Jul - Dec 2025"``, ``"jul-dec 2025"`` and ``"Jul-Dec  2025"`` all
         compare equal.
         """
+        if s.isascii():
+            return s.translate(_ASCII_NON_ALNUM_TABLE).lower()
         return ''.join(c.lower() for c in s if c.isalnum())
 
     @staticmethod
@@ -58,8 +58,14 @@ PAGES = [
 ]
 
 
+_ASCII_NON_ALNUM_TABLE = str.maketrans('', '', ''.join(c for c in map(chr, range(128)) if not c.isalnum()))
+
+
 def _norm(s: str) -> str:
-    return ''.join(c.lower() for c in (s or '') if c.isalnum())
+    s = s or ''
+    if s.isascii():
+        return s.translate(_ASCII_NON_ALNUM_TABLE).lower()
+    return ''.join(c.lower() for c in s if c.isalnum())
 
 
 # ---- Per-page prompts (mirror what's in OAIC_dashboard_scraper.py) ---------